@@ -5,6 +5,7 @@ import datetime
 
 # Configuration
 BLOG_DIR = r"c:\Users\OlgaKorniichuk\Documents\antiGravity Projects\Facebok AI.corelogic\blog"
+PROJECT_DIR = os.path.dirname(BLOG_DIR)
 
 def run_command(command, cwd=BLOG_DIR):
     """Runs a shell command in the specified directory."""
@@ -37,47 +38,18 @@ def main():
         print(f"❌ Error: Blog directory not found: {BLOG_DIR}")
         sys.exit(1)
 
-    # 0. Auto-Bump CSS Version (Cache Busting)
-    print("\n🔄 Checking CSS version in HTML files...")
-    import re
-    
-    html_files_count = 0
-    updated_files_count = 0
-    
-    # Regex to find style.css?v=NUMBER
-    css_version_pattern = re.compile(r'(href=["\']css/style\.css\?v=)(\d+)(["\'])')
-
-    for root, dirs, files in os.walk(BLOG_DIR):
-        for file in files:
-            if file.endswith(".html"):
-                html_files_count += 1
-                filepath = os.path.join(root, file)
-                
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Search for current version
-                    match = css_version_pattern.search(content)
-                    if match:
-                        current_ver = int(match.group(2))
-                        new_ver = current_ver + 1
-                        
-                        # Replace with new version
-                        new_content = css_version_pattern.sub(f'\g<1>{new_ver}\g<3>', content)
-                        
-                        if content != new_content:
-                            with open(filepath, 'w', encoding='utf-8') as f:
-                                f.write(new_content)
-                            print(f"   ✨ Bumped CSS version to v{new_ver} in {file}")
-                            updated_files_count += 1
-                except Exception as e:
-                    print(f"   ⚠️ Warning: Could not process {file}: {e}")
-
-    if updated_files_count > 0:
-        print(f"   ✅ Updated {updated_files_count} HTML files (Cache Busting Applied).")
-    else:
-        print(f"   ℹ️ No HTML files needed CSS version update (or pattern not found).")
+    # 0. Cache Busting + optional pre-compression (news_bot/static_build.py)
+    # Pages get ?v=<content hash> for their CSS/JS; only pages that reference a
+    # changed asset are rewritten, so unchanged pages stay out of the commit.
+    print("\n🔖 Running static build step...")
+    build_cmd = [sys.executable, "-m", "news_bot.static_build", "--blog-dir", BLOG_DIR]
+    if "--compress" in sys.argv:
+        build_cmd.append("--compress")
+    build = subprocess.run(build_cmd, cwd=PROJECT_DIR, capture_output=True, text=True, encoding='utf-8')
+    print(build.stdout)
+    if build.returncode != 0:
+        print(f"❌ Static build failed:\n{build.stderr}")
+        sys.exit(1)
 
 
     # 1. Check Status
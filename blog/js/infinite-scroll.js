@@ -0,0 +1,79 @@
+// Infinite scroll for listing pages.
+// Cards for older posts live in JSON shards (feed/<name>-<k>.json) written by
+// generate_categories.py; the page tells us which shard comes next.
+document.addEventListener('DOMContentLoaded', () => {
+    const feed = document.getElementById('news-feed');
+    if (!feed || !feed.dataset.feed || !('IntersectionObserver' in window)) {
+        return;
+    }
+
+    const name = feed.dataset.feed;
+    let nextShard = parseInt(feed.dataset.nextShard || '0', 10);
+    let loading = false;
+
+    const escapeHtml = (text) => String(text)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+
+    const renderCard = (post) => {
+        const article = document.createElement('article');
+        article.className = 'article-card';
+        article.innerHTML = `
+            <div class="card-image-placeholder">
+                <img src="${escapeHtml(post.image)}" alt="" loading="lazy" decoding="async">
+                <span class="category-pill">${escapeHtml(post.category)}</span>
+            </div>
+            <div class="card-content">
+                <h2><a href="${escapeHtml(post.path)}">${post.title}</a></h2>
+                <p class="article-snippet">${post.snippet}</p>
+                <div class="card-meta">
+                    <span class="date">${escapeHtml(post.date)}</span>
+                    <a href="${escapeHtml(post.path)}" class="read-more-btn"></a>
+                </div>
+            </div>`;
+        return article;
+    };
+
+    const sentinel = document.createElement('div');
+    sentinel.className = 'feed-sentinel';
+    feed.after(sentinel);
+
+    const observer = new IntersectionObserver(async (entries) => {
+        if (!entries[0].isIntersecting || loading) {
+            return;
+        }
+        if (nextShard < 1) {
+            observer.disconnect();
+            return;
+        }
+
+        loading = true;
+        try {
+            const response = await fetch(`feed/${name}-${nextShard}.json`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const posts = await response.json();
+            posts.forEach(post => feed.appendChild(renderCard(post)));
+            nextShard -= 1;
+            document.dispatchEvent(new CustomEvent('feed:loaded', { detail: { count: posts.length } }));
+
+            // Everything is on the page now - pagination links are redundant
+            if (nextShard < 1) {
+                const pagination = document.querySelector('.pagination');
+                if (pagination) {
+                    pagination.style.display = 'none';
+                }
+            }
+        } catch (err) {
+            console.warn('Infinite scroll stopped:', err);
+            observer.disconnect();
+        } finally {
+            loading = false;
+        }
+    }, { rootMargin: '600px 0px' });
+
+    observer.observe(sentinel);
+});
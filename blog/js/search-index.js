@@ -0,0 +1,81 @@
+// Client for the static search index in search/ (built by news_bot/search_index.py).
+// Term shards are fetched lazily by first character and cached for the session.
+(() => {
+    const BASE = 'search/';
+    const STOPWORDS = new Set([
+        'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from', 'has', 'have',
+        'how', 'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was',
+        'what', 'when', 'why', 'will', 'with', 'you', 'your', 'their', 'they', 'we', 'our'
+    ]);
+
+    const cache = {};
+    const fetchJson = (name) => {
+        if (!cache[name]) {
+            cache[name] = fetch(BASE + name).then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                return response.json();
+            });
+        }
+        return cache[name];
+    };
+
+    // Must match news_bot/search_index.py tokenize()
+    const tokenize = (text) => (text.toLowerCase().match(/[a-z0-9]+/g) || [])
+        .filter(token => token.length > 1 && !STOPWORDS.has(token));
+
+    const shardKey = (term) => /[0-9]/.test(term[0]) ? '0' : term[0];
+
+    // Scores for one query token; the last token also matches as a prefix
+    const scoreToken = async (token, prefix, manifest) => {
+        const key = shardKey(token);
+        const scores = new Map();
+        if (!manifest.shards.includes(key)) {
+            return scores;
+        }
+        const terms = await fetchJson(`terms-${key}.json`);
+        for (const [term, postings] of Object.entries(terms)) {
+            if (term !== token && !(prefix && term.startsWith(token))) {
+                continue;
+            }
+            for (let i = 0; i < postings.length; i += 2) {
+                scores.set(postings[i], (scores.get(postings[i]) || 0) + postings[i + 1]);
+            }
+        }
+        return scores;
+    };
+
+    const query = async (text, limit = 10) => {
+        const tokens = tokenize(text);
+        if (!tokens.length) {
+            return [];
+        }
+        const [manifest, docs] = await Promise.all([fetchJson('manifest.json'), fetchJson('docs.json')]);
+        const perToken = await Promise.all(
+            tokens.map((token, i) => scoreToken(token, i === tokens.length - 1, manifest))
+        );
+
+        // Every token must match (AND); scores add up
+        let combined = perToken[0];
+        for (const scores of perToken.slice(1)) {
+            const next = new Map();
+            combined.forEach((score, doc) => {
+                if (scores.has(doc)) {
+                    next.set(doc, score + scores.get(doc));
+                }
+            });
+            combined = next;
+        }
+
+        return [...combined.entries()]
+            .sort((a, b) => b[1] - a[1] || b[0] - a[0])
+            .slice(0, limit)
+            .map(([doc, score]) => {
+                const [title, path, date, category, image] = docs[doc];
+                return { title, path, date, category, image, score };
+            });
+    };
+
+    window.SiteSearch = { query, tokenize };
+})();
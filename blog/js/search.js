@@ -1,13 +1,14 @@
 document.addEventListener('DOMContentLoaded', () => {
     const searchInput = document.querySelector('.search-wrapper input');
-    const articles = document.querySelectorAll('.article-card');
 
     if (searchInput) {
         console.log("Search initialized");
-        searchInput.addEventListener('input', (e) => {
-            const searchTerm = e.target.value.toLowerCase().trim();
 
-            articles.forEach(article => {
+        const applyFilter = () => {
+            const searchTerm = searchInput.value.toLowerCase().trim();
+
+            // Query on every pass: infinite scroll appends cards after load
+            document.querySelectorAll('.article-card').forEach(article => {
                 const title = article.querySelector('h2') ? article.querySelector('h2').textContent.toLowerCase() : '';
                 const snippet = article.querySelector('.article-snippet') ? article.querySelector('.article-snippet').textContent.toLowerCase() : '';
                 const category = article.querySelector('.category-pill') ? article.querySelector('.category-pill').textContent.toLowerCase() : '';
@@ -18,7 +19,41 @@ document.addEventListener('DOMContentLoaded', () => {
                     article.style.display = 'none';
                 }
             });
-        });
+        };
+
+        searchInput.addEventListener('input', applyFilter);
+        document.addEventListener('feed:loaded', applyFilter);
+
+        // Site-wide results from the static index (covers posts not on this page)
+        if (window.SiteSearch) {
+            const panel = document.createElement('div');
+            panel.className = 'search-results';
+            panel.hidden = true;
+            searchInput.parentElement.appendChild(panel);
+
+            let latest = 0;
+            searchInput.addEventListener('input', async () => {
+                const term = searchInput.value.trim();
+                const ticket = ++latest;
+                if (term.length < 2) {
+                    panel.hidden = true;
+                    return;
+                }
+                try {
+                    const results = await window.SiteSearch.query(term, 8);
+                    if (ticket !== latest) {
+                        return; // A newer keystroke already answered
+                    }
+                    panel.innerHTML = results.length
+                        ? results.map(r => `<a href="${r.path}"><span class="result-title">${r.title}</span><span class="result-meta">${r.category} &middot; ${r.date}</span></a>`).join('')
+                        : '<span class="result-empty">No matches</span>';
+                    panel.hidden = false;
+                } catch (err) {
+                    console.warn('Search index unavailable:', err);
+                    panel.hidden = true;
+                }
+            });
+        }
     } else {
         console.warn("Search input not found");
     }
@@ -0,0 +1,141 @@
+"""
+Blog Article Parser
+Turns blog HTML into a small cached document model for reels and prompts
+"""
+
+from functools import lru_cache
+import re
+
+# Numbers worth quoting on screen: money, percentages, multipliers, durations
+NUMBER_PATTERN = re.compile(
+    r"[$£€]\s?\d[\d,]*(?:\.\d+)?\s?(?:[kKmMbB]|million|billion)?"
+    r"|\d[\d,]*(?:\.\d+)?\s?(?:%|percent|x\b|seconds?|hours?|minutes?|days?|weeks?|months?|years?|million|billion)"
+)
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+# Page chrome that never carries article content
+SKIP_TAGS = ["script", "style", "nav", "header", "footer", "noscript"]
+
+
+class BlogDocument:
+    """
+    Parsed view of a blog post.
+
+    Attributes:
+        headings (list): h2/h3 text in document order
+        bullets (list): list item text
+        paragraphs (list): paragraph text
+        tldr (str): Key takeaways from the .quick-summary block (if present)
+        facts (list): Sentences that contain a concrete number
+    """
+
+    def __init__(self, headings, bullets, paragraphs, tldr=""):
+        self.headings = headings
+        self.bullets = bullets
+        self.paragraphs = paragraphs
+        self.tldr = tldr
+        self.facts = self._collect_facts()
+
+    def sentences(self):
+        """All bullet and paragraph sentences, in document order, de-duplicated."""
+        seen = set()
+        result = []
+        for block in self.bullets + self.paragraphs:
+            for sentence in SENTENCE_SPLIT.split(block):
+                sentence = sentence.strip()
+                if len(sentence) > 15 and sentence not in seen:
+                    seen.add(sentence)
+                    result.append(sentence)
+        return result
+
+    def _collect_facts(self):
+        return [s for s in self.sentences() if NUMBER_PATTERN.search(s)]
+
+    def find_sentences(self, words, limit=3):
+        """Sentences containing any of the given (lowercase) words, facts first."""
+        matches = [s for s in self.sentences() if any(w in s.lower() for w in words)]
+        matches.sort(key=lambda s: 0 if NUMBER_PATTERN.search(s) else 1)
+        return matches[:limit]
+
+    def numbers(self):
+        """Distinct numeric tokens (e.g. '$40,000', '73%') in document order."""
+        seen = []
+        for fact in self.facts:
+            for match in NUMBER_PATTERN.findall(fact):
+                match = match.strip()
+                if match not in seen:
+                    seen.append(match)
+        return seen
+
+    def to_fact_sheet(self, max_facts=8, max_bullets=8):
+        """
+        Compact plain-text summary for LLM prompts.
+
+        Returns:
+            str: TL;DR, section headings, key facts and bullets, one per line
+        """
+        lines = []
+        if self.tldr:
+            lines.append(f"TL;DR: {self.tldr}")
+        if self.headings:
+            lines.append("Sections:")
+            lines.extend(f"- {h}" for h in self.headings)
+        if self.facts:
+            lines.append("Key facts:")
+            lines.extend(f"- {f}" for f in self.facts[:max_facts])
+        bullets = [b for b in self.bullets if b not in self.facts]
+        if bullets:
+            lines.append("Points:")
+            lines.extend(f"- {b}" for b in bullets[:max_bullets])
+        if not lines and self.paragraphs:
+            # Nothing structured to pull out - fall back to the opening text
+            lines.append(" ".join(self.paragraphs)[:1200])
+        return "\n".join(lines)
+
+
+def _clean(text):
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=64)
+def parse_blog_html(blog_html):
+    """
+    Parse blog HTML (a full post page or just the article body) once.
+
+    Results are cached per HTML string, so the reel extractors and the
+    script prompt share a single parse.
+
+    Returns:
+        BlogDocument
+    """
+    from bs4 import BeautifulSoup  # Deferred: bs4 costs ~60ms to import
+
+    soup = BeautifulSoup(blog_html or "", "html.parser")
+
+    tldr = ""
+    summary = soup.select_one(".quick-summary")
+    if summary:
+        label = summary.find("strong")
+        if label:
+            label.extract()
+        tldr = _clean(summary.get_text(" "))
+        summary.decompose()
+
+    for tag in soup(SKIP_TAGS):
+        tag.decompose()
+    for bio in soup.select(".author-bio"):
+        bio.decompose()
+
+    body = soup.select_one(".article-body") or soup
+
+    headings = [_clean(h.get_text(" ")) for h in body.find_all(["h2", "h3"])]
+    bullets = [_clean(li.get_text(" ")) for li in body.find_all("li")]
+    paragraphs = [_clean(p.get_text(" ")) for p in body.find_all("p")]
+
+    return BlogDocument(
+        headings=[h for h in headings if h],
+        bullets=[b for b in bullets if b],
+        paragraphs=[p for p in paragraphs if p],
+        tldr=tldr
+    )
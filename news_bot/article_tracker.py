@@ -8,9 +8,16 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+# Scored runs kept in the scores file (oldest dropped first)
+MAX_SCORE_RUNS = 500
+
 class ArticleTracker:
-    def __init__(self, tracking_file="blog/processed_articles.json"):
+    def __init__(self, tracking_file="blog/processed_articles.json", scores_file="news_bot/article_scores.json"):
         self.tracking_file = tracking_file
+        # Candidate pool of every scoring run (published or not, LLM-scored or
+        # dropped by the pre-ranker); used to evaluate the local pre-ranker
+        # (scripts/eval_viral_ranker.py)
+        self.scores_file = scores_file
         self._ensure_file_exists()
     
     def _ensure_file_exists(self):
@@ -61,7 +68,7 @@ class ArticleTracker:
                 - blog_path: Path to generated blog
                 - image_path: Path to viral image
                 - reel_path: Path to viral reel
-                - facebook_post_id: FB post ID
+                - facebook_photo_id: FB post ID
         """
         data = self._load_data()
         
@@ -74,6 +81,76 @@ class ArticleTracker:
         
         print(f"[OK] Tracked: {metadata.get('title', article_url)}")
     
+    def update_blog_entry(self, blog_filename, updates):
+        """
+        Merge updates into the entry whose blog_path is this blog file
+        
+        Args:
+            blog_filename: File name of the post (e.g. '2026-01-01-slug.html')
+            updates: Dict of metadata keys to set
+            
+        Returns:
+            bool: True if an entry was found and updated
+        """
+        data = self._load_data()
+        for metadata in data.values():
+            if os.path.basename(metadata.get('blog_path', '')) == blog_filename:
+                metadata.update(updates)
+                self._save_data(data)
+                return True
+        return False
+    
+    def load_scores(self):
+        """
+        Recorded scoring runs: run -> {'mode', 'scored_date', 'articles'}, where
+        articles is article_url -> {title, summary, score, local_score, status, position}
+        """
+        try:
+            with open(self.scores_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"[WARN] Error loading scores: {e}")
+            return {}
+        if "runs" in data:
+            return data["runs"]
+        # Older files were keyed by article URL alone (scored articles only)
+        runs = {}
+        for article_url, entry in data.items():
+            run = runs.setdefault(entry.get('run') or 'legacy', {'mode': {}, 'scored_date': entry.get('scored_date'), 'articles': {}})
+            run['articles'][article_url] = dict(entry, status='scored', position=len(run['articles']))
+        return runs
+    
+    def record_scores(self, scores, run=None, mode=None):
+        """
+        Record one run's candidate pool (kept apart from the processed list,
+        since scoring an article doesn't mean it was published). Runs are
+        stored separately, so re-scoring an article later never overwrites
+        the run it first competed in.
+        
+        Args:
+            scores: Dict of article_url -> {'title', 'summary', 'score', 'local_score', 'status', 'position'}
+            run: Identifier grouping the articles that competed in one run
+            mode: Dict of the settings the run used (pre-rank N/window, early stop, budget)
+        """
+        if not scores:
+            return
+        runs = self.load_scores()
+        scored_date = datetime.now().isoformat()
+        run = run or scored_date
+        while run in runs:
+            run += "+"  # Two runs in the same second
+        runs[run] = {'mode': mode or {}, 'scored_date': scored_date, 'articles': scores}
+        for old in sorted(runs, key=lambda r: runs[r].get('scored_date') or "")[:-MAX_SCORE_RUNS]:
+            del runs[old]
+        try:
+            os.makedirs(os.path.dirname(self.scores_file) or ".", exist_ok=True)
+            with open(self.scores_file, 'w', encoding='utf-8') as f:
+                json.dump({"runs": runs}, f, indent=1, ensure_ascii=False)
+        except Exception as e:
+            print(f"[ERROR] Error saving scores: {e}")
+    
     def get_processed_count(self):
         """Get total number of processed articles"""
         data = self._load_data()
@@ -0,0 +1,225 @@
+"""
+Blog Image Asset Pipeline
+Resized, re-encoded variants (card thumbnails, hero/og) with a content-hash manifest
+"""
+
+import hashlib
+import json
+import os
+import uuid
+
+# Variants written under <assets>/variants/: name -> (width, height)
+# Cards are 16:9 to match .card-image-placeholder; hero and og:image share 1200x630.
+# Every card size gets a WebP; only the largest also gets a JPEG fallback,
+# which keeps the committed variants smaller than the sources.
+CARD_SIZES = {"card-480": (480, 270), "card-800": (800, 450)}
+FALLBACK_VARIANT = "card-800"
+HERO_SIZE = (1200, 630)
+
+JPEG_QUALITY = 82
+WEBP_QUALITY = 78
+
+# Sources we never resize (branding, icons)
+SKIP_NAMES = ("logo", "icon")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+MANIFEST_NAME = "manifest.json"
+
+# Loaded manifests, keyed by variants directory
+_manifests = {}
+
+
+def file_hash(path):
+    """sha256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_rgb(source_path):
+    """Open an image upright and in RGB. PIL is only imported here, when there is work to do."""
+    from PIL import Image, ImageOps
+    with Image.open(source_path) as img:
+        return ImageOps.exif_transpose(img).convert("RGB")
+
+
+def _fit(img, size):
+    """Center-crop and resize to exactly size."""
+    from PIL import Image, ImageOps
+    return ImageOps.fit(img, size, Image.Resampling.LANCZOS)
+
+
+def _save_atomic(img, path, **options):
+    """Save via a temp file so readers never see a half-written image."""
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        img.save(tmp_path, **options)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def save_jpeg(img, path, quality=JPEG_QUALITY):
+    _save_atomic(img, path, format="JPEG", quality=quality, optimize=True, progressive=True)
+
+
+def save_webp(img, path, quality=WEBP_QUALITY):
+    _save_atomic(img, path, format="WEBP", quality=quality, method=4)
+
+
+def load_manifest(assets_dir):
+    variants_dir = os.path.join(assets_dir, "variants")
+    if variants_dir not in _manifests:
+        try:
+            with open(os.path.join(variants_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                _manifests[variants_dir] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _manifests[variants_dir] = {}
+    return _manifests[variants_dir]
+
+
+def save_manifest(assets_dir):
+    variants_dir = os.path.join(assets_dir, "variants")
+    os.makedirs(variants_dir, exist_ok=True)
+    with open(os.path.join(variants_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(load_manifest(assets_dir), f, indent=1, sort_keys=True)
+
+
+def publish_hero(source_path, assets_dir, name):
+    """
+    Write the canonical hero/og image for a new post: <assets>/<name>.jpg at
+    1200x630 (progressive JPEG) plus a WebP twin. Replaces the verbatim copy
+    of the generator's full-size output.
+
+    Returns:
+        str: Filename of the JPEG inside assets_dir
+    """
+    os.makedirs(assets_dir, exist_ok=True)
+    hero = _fit(_load_rgb(source_path), HERO_SIZE)
+    jpg_name = f"{name}.jpg"
+    save_jpeg(hero, os.path.join(assets_dir, jpg_name), quality=85)
+    save_webp(hero, os.path.join(assets_dir, f"{name}.webp"))
+    return jpg_name
+
+
+def process_asset(source_path, assets_dir):
+    """
+    Build card variants (WebP at every CARD_SIZES width, plus a JPEG of
+    FALLBACK_VARIANT) for one asset.
+
+    Skipped when the source's content hash matches the manifest and every
+    output exists, so rebuilds only re-encode new or replaced images.
+
+    Returns:
+        tuple: (manifest entry, True if variants were (re)written)
+    """
+    manifest = load_manifest(assets_dir)
+    variants_dir = os.path.join(assets_dir, "variants")
+    rel = os.path.relpath(source_path, assets_dir).replace(os.sep, "/")
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+
+    digest = file_hash(source_path)
+    entry = manifest.get(rel)
+    if entry and entry["hash"] == digest and all(
+        os.path.exists(os.path.join(variants_dir, f)) for files in entry["variants"].values() for f in files.values()
+    ):
+        return entry, False
+
+    os.makedirs(variants_dir, exist_ok=True)
+    entry = {"hash": digest, "variants": {}}
+    img = _load_rgb(source_path)
+    for variant, size in CARD_SIZES.items():
+        resized = _fit(img, size)
+        files = {"webp": f"{stem}-{variant}.webp"}
+        save_webp(resized, os.path.join(variants_dir, files["webp"]))
+        if variant == FALLBACK_VARIANT:
+            files["jpg"] = f"{stem}-{variant}.jpg"
+            save_jpeg(resized, os.path.join(variants_dir, files["jpg"]))
+        entry["variants"][variant] = files
+    manifest[rel] = entry
+    return entry, True
+
+
+def build_assets(assets_dir):
+    """
+    Process every image in assets_dir (not recursive) and drop manifest
+    entries/variants for sources that no longer exist.
+
+    Returns:
+        list: Paths of variant files that were written or removed
+    """
+    if not os.path.isdir(assets_dir):
+        return []
+
+    manifest = load_manifest(assets_dir)
+    variants_dir = os.path.join(assets_dir, "variants")
+    changed = []
+    seen = set()
+
+    for filename in sorted(os.listdir(assets_dir)):
+        path = os.path.join(assets_dir, filename)
+        if not os.path.isfile(path) or not filename.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        if any(s in filename.lower() for s in SKIP_NAMES):
+            continue
+        # WebP twins written by publish_hero are outputs, not sources
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() == ".webp" and os.path.exists(os.path.join(assets_dir, f"{stem}.jpg")):
+            continue
+        seen.add(filename)
+        try:
+            entry, written = process_asset(path, assets_dir)
+            if written:
+                changed.extend(os.path.join(variants_dir, f) for files in entry["variants"].values() for f in files.values())
+        except Exception as e:
+            print(f"⚠️ Could not process asset {filename}: {e}")
+
+    for rel in [r for r in manifest if r not in seen]:
+        for files in manifest.pop(rel)["variants"].values():
+            for f in files.values():
+                path = os.path.join(variants_dir, f)
+                if os.path.exists(path):
+                    os.remove(path)
+                    changed.append(path)
+
+    if changed or not os.path.exists(os.path.join(variants_dir, MANIFEST_NAME)):
+        save_manifest(assets_dir)
+        changed.append(os.path.join(variants_dir, MANIFEST_NAME))
+    return changed
+
+
+def card_variants(image_url, assets_dir):
+    """Manifest entry for a page-relative 'assets/<file>' URL, or None."""
+    if not image_url.startswith("assets/"):
+        return None
+    return load_manifest(assets_dir).get(image_url[len("assets/"):])
+
+
+def card_image_html(image_url, assets_dir, sizes="(max-width: 768px) 100vw, 420px"):
+    """
+    <picture> markup for a grid card: a WebP srcset with a JPEG fallback when
+    variants exist, otherwise a plain lazy <img> of the original URL.
+    """
+    entry = card_variants(image_url, assets_dir)
+    if not entry:
+        return f'<img src="{image_url}" alt="" loading="lazy" decoding="async">'
+
+    srcset = ", ".join(
+        f"assets/variants/{files['webp']} {CARD_SIZES[variant][0]}w"
+        for variant, files in entry["variants"].items()
+    )
+    return (
+        f'<picture><source type="image/webp" srcset="{srcset}" sizes="{sizes}">'
+        f'<img src="{card_thumbnail_url(image_url, assets_dir)}" alt="" loading="lazy" decoding="async"></picture>'
+    )
+
+
+def card_thumbnail_url(image_url, assets_dir):
+    """JPEG fallback card variant for image_url (used by the JSON feed), or image_url itself."""
+    entry = card_variants(image_url, assets_dir)
+    if not entry:
+        return image_url
+    return f"assets/variants/{entry['variants'][FALLBACK_VARIANT]['jpg']}"
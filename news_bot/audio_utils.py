@@ -1,44 +1,157 @@
 """
 Audio Utilities for Viral Reel Generation
-Handles TTS and Background Music Mixing
+Handles TTS (with a content-addressed cache) and Background Music Mixing
+
+gTTS and moviepy are imported inside the functions that need them; a TTS
+cache hit never loads either.
 """
 
-from gtts import gTTS
-from moviepy.editor import AudioFileClip, CompositeAudioClip, concatenate_audioclips
+from pathlib import Path
+import numpy as np
+import hashlib
+import json
 import os
+import shutil
+import uuid
+
+# Synthesized speech is stored by content hash so identical lines
+# (e.g. the CTA read on every reel) are only sent to gTTS once.
+TTS_CACHE_DIR = Path(__file__).parent.parent / 'tts_cache'
+
+AUDIO_FPS = 44100
+
+# Decoded background tracks, keyed by (path, mtime, fps)
+_music_buffers = {}
 
-def generate_tts(text, output_path):
+
+def tts_cache_key(text, lang='en', voice='com'):
+    """Stable cache key for a (text, lang, voice) triple."""
+    payload = json.dumps([text, lang, voice], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def generate_tts(text, output_path=None, lang='en', voice='com', use_cache=True):
     """
-    Generate TTS audio from text using gTTS
+    Generate TTS audio from text using gTTS.
+
+    Results are cached under TTS_CACHE_DIR keyed by (text, lang, voice).
+    `voice` is the gTTS accent domain (tld), e.g. 'com', 'co.uk'.
+
+    Args:
+        text (str): Line to synthesize
+        output_path (str, optional): Copy the audio here. If omitted, the
+            cached file path is returned directly (callers must not delete it).
+        lang (str): gTTS language code
+        voice (str): gTTS accent (top-level domain)
+        use_cache (bool): Set False to force a fresh synthesis
+
+    Returns:
+        str: Path to the MP3, or None on failure
     """
     try:
-        tts = gTTS(text=text, lang='en')
-        tts.save(output_path)
-        return output_path
+        TTS_CACHE_DIR.mkdir(exist_ok=True)
+        cached_path = TTS_CACHE_DIR / f"{tts_cache_key(text, lang, voice)}.mp3"
+
+        if not (use_cache and cached_path.exists()):
+            # Write to a unique temp name then rename, so parallel jobs never
+            # observe a half-written cache entry.
+            tmp_path = TTS_CACHE_DIR / f".{uuid.uuid4().hex}.tmp"
+            try:
+                from gtts import gTTS
+                tts = gTTS(text=text, lang=lang, tld=voice)
+                tts.save(str(tmp_path))
+                os.replace(tmp_path, cached_path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+        if output_path:
+            shutil.copyfile(cached_path, output_path)
+            return output_path
+        return str(cached_path)
     except Exception as e:
         print(f"❌ TTS Generation Error: {e}")
         return None
 
+
+def _as_stereo(samples):
+    """Return samples as a (n, 2) float array."""
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    if samples.shape[1] == 1:
+        samples = np.repeat(samples, 2, axis=1)
+    return samples[:, :2]
+
+
+def decode_clip(clip, fps=AUDIO_FPS):
+    """Decode an AudioClip into a stereo NumPy buffer in a single pass."""
+    chunks = list(clip.iter_chunks(fps=fps, chunksize=50000))
+    if not chunks:
+        return np.zeros((0, 2), dtype=np.float32)
+    return _as_stereo(np.vstack(chunks))
+
+
+def load_music_buffer(path, fps=AUDIO_FPS):
+    """Decode a music file into a stereo NumPy buffer (cached per file version)."""
+    key = (os.path.abspath(path), os.path.getmtime(path), fps)
+    buffer = _music_buffers.get(key)
+    if buffer is None:
+        from moviepy.editor import AudioFileClip
+        clip = AudioFileClip(path)
+        try:
+            buffer = decode_clip(clip, fps=fps)
+        finally:
+            clip.close()
+        _music_buffers[key] = buffer
+    return buffer
+
+
+def mix_buffers(voice, music, bg_volume=0.2):
+    """
+    Mix a voice buffer with background music in one vectorized pass.
+    Music is looped or trimmed to the voice length and scaled by bg_volume.
+    """
+    voice = _as_stereo(voice)
+    n = len(voice)
+    if music is None or len(music) == 0 or n == 0:
+        return voice
+
+    music = _as_stereo(music)
+    if len(music) < n:
+        reps = -(-n // len(music))  # ceil division
+        music = np.tile(music, (reps, 1))
+    mixed = voice + music[:n] * bg_volume
+    return np.clip(mixed, -1.0, 1.0)
+
+
+def mix_voice_with_music(voice_clip, background_music_path, bg_volume=0.2, fps=AUDIO_FPS):
+    """
+    Mix an in-memory voice AudioClip with background music.
+
+    Returns:
+        AudioArrayClip: The mixed track, ready for clip.set_audio()
+    """
+    voice = decode_clip(voice_clip, fps=fps)
+    music = None
+    if background_music_path and os.path.exists(background_music_path):
+        music = load_music_buffer(background_music_path, fps=fps)
+    from moviepy.audio.AudioClip import AudioArrayClip
+    return AudioArrayClip(mix_buffers(voice, music, bg_volume), fps=fps)
+
+
 def mix_audio(voice_clip_path, background_music_path, output_path, bg_volume=0.2):
     """
     Mix voiceover with background music
     """
     try:
+        from moviepy.editor import AudioFileClip
         voice_clip = AudioFileClip(voice_clip_path)
-        
-        if background_music_path and os.path.exists(background_music_path):
-            bg_clip = AudioFileClip(background_music_path).volumex(bg_volume)
-            # Loop bg music if it's shorter than voiceover
-            if bg_clip.duration < voice_clip.duration:
-                bg_clip = bg_clip.loop(duration=voice_clip.duration)
-            else:
-                bg_clip = bg_clip.subclip(0, voice_clip.duration)
-            
-            final_audio = CompositeAudioClip([bg_clip, voice_clip])
-        else:
-            final_audio = voice_clip
-            
-        final_audio.write_audiofile(output_path, fps=44100)
+        try:
+            final_audio = mix_voice_with_music(voice_clip, background_music_path, bg_volume)
+            final_audio.write_audiofile(output_path, fps=AUDIO_FPS)
+        finally:
+            voice_clip.close()
         return output_path
     except Exception as e:
         print(f"❌ Audio Mixing Error: {e}")
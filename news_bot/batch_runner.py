@@ -0,0 +1,169 @@
+"""
+Batch Job Runner
+Runs a transform over many blog posts with a worker pool, resumable checkpoints and dry-run diffs
+
+A transform is a function (path, html) -> new html, or None to leave the
+file alone. Raising marks the file as failed; failed files are retried on
+the next run, finished ones are skipped.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+import difflib
+import json
+import os
+import threading
+import time
+
+CHECKPOINT_DIR = Path(__file__).parent.parent / '.batch_checkpoints'
+
+DEFAULT_WORKERS = 8
+
+
+class RateLimiter:
+    """
+    Spaces calls evenly so all workers together stay under a per-minute quota.
+
+    Call wait() right before each API request (or await asyncio.sleep(reserve())
+    from async code).
+    """
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Claim the next slot. Returns how many seconds to wait for it."""
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        return slot - now
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _write_atomic(path, content):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class BatchRunner:
+    """
+    Args:
+        name (str): Job name; the checkpoint is stored as .batch_checkpoints/<name>.json
+        transform (callable): (path, html) -> new html or None
+        workers (int): Worker threads (I/O and API bound, so threads are enough)
+        dry_run (bool): Print unified diffs instead of writing files (no checkpoint)
+        restart (bool): Ignore any existing checkpoint
+    """
+
+    def __init__(self, name, transform, workers=DEFAULT_WORKERS, dry_run=False, restart=False):
+        self.name = name
+        self.transform = transform
+        self.workers = max(1, workers)
+        self.dry_run = dry_run
+        self.checkpoint_path = CHECKPOINT_DIR / f"{name}.json"
+        self.checkpoint = {} if restart else self._load_checkpoint()
+        self._lock = threading.Lock()
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_checkpoint(self):
+        CHECKPOINT_DIR.mkdir(exist_ok=True)
+        _write_atomic(self.checkpoint_path, json.dumps(self.checkpoint, indent=1, sort_keys=True))
+
+    def _record(self, path, status):
+        if self.dry_run:
+            return
+        with self._lock:
+            self.checkpoint[str(path)] = status
+            self._save_checkpoint()
+
+    def _process(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+
+        new_html = self.transform(path, html)
+        if new_html is None or new_html == html:
+            return "unchanged"
+
+        if self.dry_run:
+            diff = difflib.unified_diff(
+                html.splitlines(keepends=True), new_html.splitlines(keepends=True),
+                fromfile=f"a/{Path(path).name}", tofile=f"b/{Path(path).name}"
+            )
+            with self._lock:
+                print("".join(diff))
+            return "updated"
+
+        _write_atomic(path, new_html)
+        return "updated"
+
+    def run(self, paths):
+        """
+        Process every path not already finished in the checkpoint.
+
+        Returns:
+            dict: Counts per outcome (updated, unchanged, error, already_done)
+        """
+        paths = [str(p) for p in paths]
+        todo = [p for p in paths if self.checkpoint.get(p) not in ("updated", "unchanged")]
+        counts = {"updated": 0, "unchanged": 0, "error": 0, "already_done": len(paths) - len(todo)}
+
+        mode = "DRY RUN - " if self.dry_run else ""
+        print(f"🚀 {mode}{self.name}: {len(todo)} posts to process "
+              f"({counts['already_done']} done in a previous run), {self.workers} workers")
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._process, path): path for path in todo}
+            try:
+                for future in as_completed(futures):
+                    path = futures[future]
+                    done += 1
+                    try:
+                        status = future.result()
+                        print(f"  [{done}/{len(todo)}] {'✅' if status == 'updated' else '⏭️'} {Path(path).name}")
+                    except Exception as e:
+                        status = "error"
+                        print(f"  [{done}/{len(todo)}] ❌ {Path(path).name}: {e}")
+                    counts[status] += 1
+                    self._record(path, status)
+            except KeyboardInterrupt:
+                print("\n⏹️ Interrupted - finished posts are checkpointed, rerun to resume.")
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+
+        print(f"\n✨ {self.name}: {counts['updated']} updated, {counts['unchanged']} unchanged, "
+              f"{counts['error']} failed, {counts['already_done']} skipped (checkpoint)")
+        if not self.dry_run and todo:
+            print(f"   Checkpoint: {self.checkpoint_path} (use --restart to run everything again)")
+        return counts
+
+
+def add_batch_arguments(parser, rpm=None):
+    """Common CLI flags for bulk post scripts."""
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Parallel workers")
+    parser.add_argument("--dry-run", action="store_true", help="Show diffs, don't write files")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and process every post")
+    if rpm is not None:
+        parser.add_argument("--rpm", type=int, default=rpm, help="Max API requests per minute across all workers")
+    return parser
+
+
+def runner_from_args(name, transform, args):
+    return BatchRunner(name, transform, workers=args.workers, dry_run=args.dry_run, restart=args.restart)
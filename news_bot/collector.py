@@ -1,6 +1,11 @@
-import feedparser
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from .settings import RSS_FEEDS, KEYWORDS
+from .settings import RSS_FEEDS
+from .keyword_matcher import match_keywords
+from .metrics import incr
+
+# Feeds downloaded at once by iter_news()
+FEED_WORKERS = 8
 
 class NewsCollector:
     def __init__(self):
@@ -8,51 +13,113 @@ class NewsCollector:
 
     def fetch_news(self, hours_back=72, max_posts_per_feed=3):
         """Fetch news from the last N hours, limiting to first X posts per feed."""
-        recent_news = []
+        return list(self.iter_news(hours_back, max_posts_per_feed))
+
+    def iter_news(self, hours_back=72, max_posts_per_feed=3, collapse=True, known=None):
+        """
+        Yield matching articles feed by feed, as each download finishes.
+
+        Feeds are fetched in parallel; closing the generator early (e.g. when
+        the scorer has found what it needs) abandons feeds not yet parsed.
+
+        With collapse, the same story from several feeds (same canonical URL
+        or near-identical title) is yielded once; the first article seen
+        represents it and collects the others' links in 'duplicate_links'.
+
+        known (list, optional): articles from earlier collections (the
+        daemon's pool). They are indexed first and stay their stories'
+        representatives, so the surviving link doesn't depend on which feed
+        finishes first; a known story is yielded as its known article, once.
+        """
+        import feedparser  # Deferred so importing the bot doesn't pay for it
+        from .near_duplicates import StoryIndex
+
+        stories = StoryIndex() if collapse else None
+        pending = {}  # id -> known article not yielded yet
+        if stories:
+            for article in known or ():
+                if stories.add(article) is None:
+                    article.setdefault('duplicate_links', [])
+                    pending[id(article)] = article
+
         time_threshold = datetime.now() - timedelta(hours=hours_back)
+        executor = ThreadPoolExecutor(max_workers=min(FEED_WORKERS, len(self.feeds) or 1))
+        try:
+            futures = {}
+            for feed_url in self.feeds:
+                print(f"Checking {feed_url}...")
+                futures[executor.submit(feedparser.parse, feed_url)] = feed_url
 
-        for feed_url in self.feeds:
-            print(f"Checking {feed_url}...")
-            feed = feedparser.parse(feed_url)
-            
-            # Only process first N entries from each feed (most recent posts)
-            for entry in feed.entries[:max_posts_per_feed]:
-                # Check date
-                published = getattr(entry, "published_parsed", None)
-                if published:
-                    pub_date = datetime(*published[:6])
-                    if pub_date < time_threshold:
-                        continue
-                
-                # Check keywords
-                title = entry.title.lower()
-                summary = getattr(entry, "summary", "").lower()
-                
-                # Image Extraction
-                image_url = None
+            for future in as_completed(futures):
                 try:
-                    if "media_content" in entry and entry.media_content:
-                        image_url = entry.media_content[0].get("url")
-                    elif "media_thumbnail" in entry and entry.media_thumbnail:
-                        image_url = entry.media_thumbnail[0].get("url")
-                    elif "links" in entry:
-                        for link in entry.links:
-                            if link.rel == "enclosure" and "image" in link.type:
-                                image_url = link.href
-                                break
-                except Exception:
-                    pass
-                
-                if any(kw in title or kw in summary for kw in KEYWORDS):
-                    recent_news.append({
-                        "title": entry.title,
-                        "link": entry.link,
-                        "summary": entry.summary,
-                        "published": pub_date,
-                        "image_url": image_url
-                    })
-        
-        return recent_news
+                    feed = future.result()
+                except Exception as e:
+                    print(f"⚠️ Feed failed: {futures[future]}: {e}")
+                    continue
+
+                # Only process first N entries from each feed (most recent posts)
+                for entry in feed.entries[:max_posts_per_feed]:
+                    article = self._parse_entry(entry, time_threshold)
+                    if not article:
+                        continue
+                    original = stories.add(article) if stories else None
+                    if original is not None:
+                        if article['link'] != original['link'] and article['link'] not in original['duplicate_links']:
+                            original['duplicate_links'].append(article['link'])
+                        if pending.pop(id(original), None) is not None:
+                            yield original  # Known story: its known link stays the representative
+                            continue
+                        incr("stories_collapsed")
+                        print(f"   🔁 Same story as '{original['title'][:50]}': {article['link']}")
+                        continue
+                    yield article
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _parse_entry(self, entry, time_threshold):
+        """Article dict for a feed entry, or None if it is too old or off-topic."""
+        # Check date
+        pub_date = None
+        published = getattr(entry, "published_parsed", None)
+        if published:
+            pub_date = datetime(*published[:6])
+            if pub_date < time_threshold:
+                return None
+
+        # Check keywords
+        title_keywords = match_keywords(entry.title)
+        keywords = title_keywords + match_keywords(getattr(entry, "summary", ""))
+        if not keywords:
+            return None
+
+        # Image Extraction
+        image_url = None
+        try:
+            if "media_content" in entry and entry.media_content:
+                image_url = entry.media_content[0].get("url")
+            elif "media_thumbnail" in entry and entry.media_thumbnail:
+                image_url = entry.media_thumbnail[0].get("url")
+            elif "links" in entry:
+                for link in entry.links:
+                    if link.rel == "enclosure" and "image" in link.type:
+                        image_url = link.href
+                        break
+        except Exception:
+            pass
+
+        return {
+            "title": entry.title,
+            "link": entry.link,
+            "summary": getattr(entry, "summary", ""),
+            "published": pub_date,
+            "image_url": image_url,
+            # Other feeds' links for the same story (filled in by iter_news)
+            "duplicate_links": [],
+            # Keyword -> occurrences in title + summary (cheap relevance signal)
+            "keywords": dict(keywords),
+            "keyword_hits": sum(keywords.values()),
+            "title_keyword_hits": sum(title_keywords.values()),
+        }
 
 if __name__ == "__main__":
     collector = NewsCollector()
@@ -0,0 +1,190 @@
+"""
+News Bot Daemon
+One long-running process that polls feeds on an interval and publishes on its own cadence
+
+The Gemini client, tracker, title index and the pool of already-scored
+candidates stay warm between cycles, so a cycle only pays for new
+articles. SIGINT/SIGTERM stop the scheduler once the current job is done;
+pending deploys are pushed and the candidate pool is saved to STATE_FILE,
+so a restart does not re-score what it already knows.
+
+    python -m news_bot.daemon [--poll-minutes 30] [--publish-minutes 240] [--top-k 1] [--once]
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+import traceback
+from .main import NewsBot, HOURS_BACK, collect_and_score, process_best
+from .metrics import start_run, finish_run, incr
+from .settings import DAEMON_POLL_MINUTES, DAEMON_PUBLISH_MINUTES, PUBLISH_TOP_K, PUBLISH_WORKERS
+
+STATE_FILE = Path(__file__).parent.parent / '.daemon_state.json'
+
+
+class Scheduler:
+    """
+    Runs jobs at fixed intervals on the calling thread until stop().
+
+    The next run of a job is scheduled from when it finishes, so a slow
+    cycle delays its successor instead of piling runs up.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self.stopping = threading.Event()
+
+    def every(self, minutes, name, fn, run_now=True):
+        due = time.monotonic() if run_now else time.monotonic() + minutes * 60
+        self.jobs.append({"name": name, "interval": minutes * 60, "fn": fn, "due": due})
+
+    def run(self):
+        while self.jobs and not self.stopping.is_set():
+            job = min(self.jobs, key=lambda j: j["due"])  # Ties go to the first registered
+            delay = job["due"] - time.monotonic()
+            if delay > 0 and self.stopping.wait(delay):
+                break
+            try:
+                job["fn"]()
+            except Exception as e:
+                print(f"❌ Job '{job['name']}' failed: {e}")
+                traceback.print_exc()
+            job["due"] = time.monotonic() + job["interval"]
+
+    def stop(self):
+        self.stopping.set()
+
+
+class NewsDaemon:
+    def __init__(self, bot=None, state_file=STATE_FILE, top_k=PUBLISH_TOP_K, workers=PUBLISH_WORKERS):
+        self.bot = bot or NewsBot()
+        self.state_file = state_file
+        self.top_k = top_k
+        self.workers = workers
+        # link -> {"article": ..., "score": ...}
+        self.candidates = {}
+        self.load_state()
+
+    def poll(self):
+        """Collect and score; articles already in the pool keep their score."""
+        start_run("daemon_poll")
+        status = "error"
+        try:
+            known = {link: c["score"] for link, c in self.candidates.items()}
+            known_articles = [c["article"] for c in self.candidates.values()]
+            for article, score in collect_and_score(self.bot, known, stop_after=self.top_k, known_articles=known_articles):
+                self.candidates[article['link']] = {"article": article, "score": score}
+            self.prune()
+            incr("candidates", len(self.candidates))
+            status = "polled"
+        finally:
+            finish_run(status)
+
+    def publish(self):
+        """Publish the top_k best candidates in the pool as one batch."""
+        start_run("daemon_publish")
+        status = "error"
+        try:
+            self.prune()
+            pool = sorted(
+                ((c["article"], c["score"]) for c in self.candidates.values()),
+                key=lambda x: x[1], reverse=True
+            )
+            if not pool:
+                print("No candidates to publish yet.")
+                status = "no_candidates"
+            else:
+                status = process_best(self.bot, pool, self.top_k, self.workers)
+            self.prune()
+        finally:
+            finish_run(status)
+
+    def prune(self):
+        """Drop candidates that were processed (published or skipped) or are too old."""
+        cutoff = datetime.now() - timedelta(hours=HOURS_BACK)
+        for link, candidate in list(self.candidates.items()):
+            published = candidate["article"].get("published")
+            if self.bot.tracker.is_processed(link) or (published and published < cutoff):
+                del self.candidates[link]
+
+    def load_state(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for link, candidate in saved.get("candidates", {}).items():
+            article = candidate["article"]
+            if article.get("published"):
+                article["published"] = datetime.fromisoformat(article["published"])
+            self.candidates[link] = candidate
+        print(f"♻️ Restored {len(self.candidates)} scored candidates from {self.state_file}")
+
+    def save_state(self):
+        candidates = {}
+        for link, candidate in self.candidates.items():
+            article = dict(candidate["article"])
+            if isinstance(article.get("published"), datetime):
+                article["published"] = article["published"].isoformat()
+            candidates[link] = {"article": article, "score": candidate["score"]}
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"saved": datetime.now().isoformat(), "candidates": candidates}, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, self.state_file)
+
+    def shutdown(self):
+        """Flush state: push anything still queued for deploy, then save the pool."""
+        deployer = self.bot.blog_gen.deployer
+        if deployer and (deployer.pending or deployer.unpushed):
+            print("📤 Pushing pending deploy before exit...")
+            self.bot.blog_gen.deploy_to_github()
+        self.save_state()
+        print(f"💾 Saved {len(self.candidates)} candidates to {self.state_file}")
+
+
+def install_signal_handlers(scheduler):
+    """First SIGINT/SIGTERM finishes the current job and exits; a second SIGINT aborts."""
+    def handle(signum, frame):
+        if scheduler.stopping.is_set():
+            raise KeyboardInterrupt
+        print(f"\n🛑 {signal.Signals(signum).name} received, stopping after the current job...")
+        scheduler.stop()
+
+    signal.signal(signal.SIGINT, handle)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, handle)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the news bot as a long-lived daemon")
+    parser.add_argument("--poll-minutes", type=float, default=DAEMON_POLL_MINUTES)
+    parser.add_argument("--publish-minutes", type=float, default=DAEMON_PUBLISH_MINUTES)
+    parser.add_argument("--top-k", type=int, default=PUBLISH_TOP_K, help="Articles per publish (one rebuild + deploy)")
+    parser.add_argument("--workers", type=int, default=PUBLISH_WORKERS)
+    parser.add_argument("--once", action="store_true", help="Run one poll and one publish, then exit")
+    args = parser.parse_args()
+
+    daemon = NewsDaemon(top_k=args.top_k, workers=args.workers)
+    try:
+        if args.once:
+            daemon.poll()
+            daemon.publish()
+            return
+
+        scheduler = Scheduler()
+        scheduler.every(args.poll_minutes, "poll", daemon.poll)
+        scheduler.every(args.publish_minutes, "publish", daemon.publish)
+        install_signal_handlers(scheduler)
+        print(f"🤖 Daemon started: poll every {args.poll_minutes:g} min, publish every {args.publish_minutes:g} min")
+        scheduler.run()
+    finally:
+        daemon.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Git Deployer
+Stages only the files a build wrote, batches publishes into one commit and one push
+"""
+
+import os
+import shutil
+import subprocess
+from datetime import datetime
+
+# Fallback for Windows machines where git is installed but not on PATH
+WINDOWS_GIT = r"C:\Program Files\Git\cmd\git.exe"
+
+DEFAULT_REMOTE = "origin"
+
+
+def find_git():
+    """
+    Locate the git executable: $GIT_EXECUTABLE, then PATH, then the default
+    Windows install location.
+
+    Raises:
+        FileNotFoundError: If git cannot be found
+    """
+    candidates = [os.environ.get("GIT_EXECUTABLE"), shutil.which("git"), WINDOWS_GIT]
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    raise FileNotFoundError("git executable not found (set GIT_EXECUTABLE or add git to PATH)")
+
+
+class GitDeployer:
+    """
+    Queues build outputs and publishes them as a single commit.
+
+    Only queued paths are staged (never `git add .`), so temp images, logs
+    and other untracked files in the working tree are left alone. Several
+    posts can be queued before calling publish() to get one commit and one
+    push for the whole batch.
+
+    Args:
+        work_dir (str): Any directory inside the target repository
+        remote (str): Remote to push to
+        branch (str): Remote branch to push to (default: the current branch)
+        git (str): Path to git (default: find_git())
+    """
+
+    def __init__(self, work_dir=".", remote=DEFAULT_REMOTE, branch=None, git=None):
+        self.git = git or find_git()
+        self.remote = remote
+        self.repo_dir = self._run(["rev-parse", "--show-toplevel"], cwd=work_dir).stdout.strip()
+        self.branch = branch or self._run(["rev-parse", "--abbrev-ref", "HEAD"]).stdout.strip()
+        self.pending = set()
+        self.published = 0  # queued publishes since the last commit
+        self.unpushed = False
+
+    def _run(self, args, cwd=None, input=None, check=True):
+        return subprocess.run(
+            [self.git] + args,
+            cwd=cwd or self.repo_dir,
+            input=input,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=check
+        )
+
+    def queue(self, paths):
+        """
+        Add files (written or removed) to the next commit.
+
+        Paths may be absolute or relative to the current directory; anything
+        outside the repository is ignored.
+
+        Returns:
+            int: Number of paths queued
+        """
+        queued = 0
+        for path in paths:
+            if not path:
+                continue
+            rel = os.path.relpath(os.path.abspath(path), self.repo_dir)
+            if rel.startswith(".."):
+                print(f"⚠️ Not deploying {path}: outside {self.repo_dir}")
+                continue
+            self.pending.add(rel.replace(os.sep, "/"))
+            queued += 1
+        if queued:
+            self.published += 1
+        return queued
+
+    def _stageable(self, paths):
+        """Existing files plus deleted files git still tracks (git add errors on anything else)."""
+        missing = [p for p in paths if not os.path.exists(os.path.join(self.repo_dir, p))]
+        tracked = set()
+        if missing:
+            result = self._run(["ls-files", "-z", "--"] + missing)
+            tracked = set(filter(None, result.stdout.split("\0")))
+        return [p for p in paths if p not in missing or p in tracked]
+
+    def publish(self, message=None, push=True):
+        """
+        Stage the queued paths, commit them and push.
+
+        A push that failed earlier is retried here even when nothing new
+        was queued.
+
+        Returns:
+            bool: True if everything queued is committed (and pushed, if push=True)
+        """
+        try:
+            paths = self._stageable(sorted(self.pending))
+            if paths:
+                pathspec = "\0".join(paths)
+                self._run(["add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul"], input=pathspec)
+                staged = set(self._run(["diff", "--cached", "--name-only", "-z"]).stdout.split("\0"))
+                if staged.intersection(paths):
+                    if not message:
+                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+                        message = f"Auto-publish {self.published} update(s) - {timestamp}"
+                    self._run(["commit", "-m", message, "--pathspec-from-file=-", "--pathspec-file-nul"], input=pathspec)
+                    print(f"💾 Committed {len(paths)} files: {message}")
+                    self.unpushed = True
+                else:
+                    print("Nothing new to commit.")
+            self.pending.clear()
+            self.published = 0
+
+            if push and self.unpushed:
+                self._run(["push", self.remote, f"HEAD:{self.branch}"])
+                self.unpushed = False
+                print(f"⬆️ Pushed to {self.remote}/{self.branch}")
+            return True
+        except subprocess.CalledProcessError as e:
+            error = (e.stderr or "").strip().splitlines()
+            print(f"Deploy failed: git {e.cmd[1]}: {error[0] if error else e.returncode}")
+            return False
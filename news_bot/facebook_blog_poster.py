@@ -13,9 +13,6 @@ import json
 from datetime import datetime
 from pathlib import Path
 import re
-import re
-from bs4 import BeautifulSoup
-import requests
 import time
 
 
@@ -48,6 +45,7 @@ class BlogScanner:
         with open(html_file, 'r', encoding='utf-8') as f:
             html = f.read()
         
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(html, 'html.parser')
         
         # Extract title
@@ -135,11 +133,7 @@ class FacebookBlogPoster:
     def generate_facebook_post(self, blog):
         """Generate Facebook post content from blog data."""
         # Use Gemini to create engaging Facebook post
-        import google.generativeai as genai
-        from .settings import GOOGLE_API_KEY
-        
-        genai.configure(api_key=GOOGLE_API_KEY)
-        model = genai.GenerativeModel('gemini-flash-latest')
+        from .gemini_client import generate_text
         
         prompt = f"""
 **Role:** You are a Viral Content Strategist and Behavioral Psychologist.
@@ -175,8 +169,7 @@ Output ONLY the Facebook post text. Do NOT include the URL.
 """
         
         try:
-            response = model.generate_content(prompt)
-            return response.text.strip() + "\n\n#AICoreLogic"
+            return generate_text(prompt) + "\n\n#AICoreLogic"
         except Exception as e:
             print(f"⚠️ AI generation failed: {e}")
             # Fallback post
@@ -184,6 +177,7 @@ Output ONLY the Facebook post text. Do NOT include the URL.
     
     def verify_live_url(self, url, retries=30):
         """Checks if the URL returns 200 OK. Retries a few times."""
+        import requests
         for i in range(retries):
             try:
                 r = requests.head(url, timeout=5)
@@ -251,6 +245,12 @@ Output ONLY the Facebook post text. Do NOT include the URL.
             return
         
         print(f"✅ Image generated: {local_image_path}")
+
+        # Reference the image from the article's tracker entry so storage cleanup
+        # keeps it until the post is live (a retry replaces it with its own image)
+        from .article_tracker import ArticleTracker
+        article_tracker = ArticleTracker()
+        article_tracker.update_blog_entry(blog['filename'], {'image_path': os.path.abspath(local_image_path)})
         
         # Post to Facebook
         print("\n[Post] Posting Photo to Facebook Timeline...", flush=True)
@@ -266,6 +266,7 @@ Output ONLY the Facebook post text. Do NOT include the URL.
         if post_id:
             print(f"✅ Posted Photo to Timeline! ID: {post_id}")
             self.tracker.mark_posted(blog['filename'], post_id, blog['url'])
+            article_tracker.update_blog_entry(blog['filename'], {'facebook_photo_id': post_id})
             
             # Post link in comments
             print(f"💬 Posting link in comments...")
@@ -280,6 +281,10 @@ Output ONLY the Facebook post text. Do NOT include the URL.
         else:
             print("[Error] Facebook posting failed")
 
+        # The uploaded image is no longer needed once posted; failed uploads stay protected
+        from .storage_manager import StorageManager
+        StorageManager().collect_in_background(protect=() if post_id else (local_image_path,))
+
         print("\n" + "="*60)
         print("🛡️ SAFE POSTING VERIFICATION REQUIRED")
         from .settings import FB_PAGE_ID
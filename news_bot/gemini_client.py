@@ -0,0 +1,138 @@
+"""
+Shared Gemini Client
+One lazily-created model handle per model name per process, with rate limiting and retry
+
+google.generativeai is only imported on the first call, so modules that
+import this one (and CLI tools that never reach Gemini) don't pay for it.
+"""
+
+import random
+import threading
+import time
+from .settings import GOOGLE_API_KEY, GEMINI_RPM
+from .batch_runner import RateLimiter
+from .metrics import incr
+
+DEFAULT_MODEL = "gemini-flash-latest"
+
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 2.0
+
+# google.api_core exception names worth retrying (rate limits, overload, timeouts)
+TRANSIENT_ERRORS = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+    "DeadlineExceeded", "InternalServerError", "GatewayTimeout",
+}
+
+_models = {}
+_lock = threading.Lock()
+_limiter = RateLimiter(GEMINI_RPM)
+_configured = False
+
+
+def set_rate_limit(per_minute):
+    """Replace the process-wide request budget (e.g. from a bulk script's --rpm)."""
+    global _limiter
+    _limiter = RateLimiter(per_minute)
+
+
+def _sdk():
+    """The google.generativeai module, configured with the API key on first use."""
+    global _configured
+    import google.generativeai as genai
+    if not _configured:
+        with _lock:
+            if not _configured:
+                genai.configure(api_key=GOOGLE_API_KEY)
+                _configured = True
+    return genai
+
+
+def get_model(name=DEFAULT_MODEL):
+    """Return the process-wide GenerativeModel for name, creating it on first use."""
+    model = _models.get(name)
+    if model is None:
+        genai = _sdk()
+        with _lock:
+            if name not in _models:
+                _models[name] = genai.GenerativeModel(name)
+            model = _models[name]
+    return model
+
+
+def upload_file(path):
+    """Upload a local file (e.g. an image) to the Gemini File API, for use in a prompt list."""
+    return _sdk().upload_file(path)
+
+
+def _is_transient(error):
+    return type(error).__name__ in TRANSIENT_ERRORS
+
+
+def _backoff(attempt):
+    return BACKOFF_SECONDS * (2 ** attempt) + random.uniform(0, 1)
+
+
+def record_usage(response):
+    """Add a response's token counts to the run metrics (for streams, pass the last chunk)."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        incr("llm_prompt_tokens", getattr(usage, "prompt_token_count", 0) or 0)
+        incr("llm_output_tokens", getattr(usage, "candidates_token_count", 0) or 0)
+
+
+def generate(prompt, model=DEFAULT_MODEL, retries=MAX_RETRIES, **kwargs):
+    """
+    Rate-limited generate_content with retry on transient errors.
+
+    Extra keyword arguments go to generate_content (e.g. stream=True,
+    generation_config={"response_mime_type": "application/json"}). For
+    streams only the initial request is retried.
+
+    Returns:
+        The generate_content response
+    """
+    handle = get_model(model)
+    for attempt in range(retries + 1):
+        _limiter.wait()
+        incr("llm_calls")
+        try:
+            response = handle.generate_content(prompt, **kwargs)
+            if not kwargs.get("stream"):
+                record_usage(response)
+            return response
+        except Exception as e:
+            if attempt == retries or not _is_transient(e):
+                incr("llm_errors")
+                raise
+            incr("llm_retries")
+            delay = _backoff(attempt)
+            print(f"⏳ Gemini {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            time.sleep(delay)
+
+
+async def generate_async(prompt, model=DEFAULT_MODEL, retries=MAX_RETRIES, **kwargs):
+    """Async generate(): same rate limit (shared with sync callers) and retry policy."""
+    import asyncio
+    handle = get_model(model)
+    for attempt in range(retries + 1):
+        delay = _limiter.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        incr("llm_calls")
+        try:
+            response = await handle.generate_content_async(prompt, **kwargs)
+            if not kwargs.get("stream"):
+                record_usage(response)
+            return response
+        except Exception as e:
+            if attempt == retries or not _is_transient(e):
+                incr("llm_errors")
+                raise
+            incr("llm_retries")
+            await asyncio.sleep(_backoff(attempt))
+
+
+def generate_text(prompt, model=DEFAULT_MODEL, **kwargs):
+    """generate() and return the stripped response text."""
+    return generate(prompt, model=model, **kwargs).text.strip()
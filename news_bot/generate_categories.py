@@ -1,12 +1,22 @@
 import os
 import re
+import json
 from pathlib import Path
 from datetime import datetime
+from .templates import get_template, render, render_each
+from .site_files import write_if_changed
+from .search_index import build_search_index
+from .asset_pipeline import build_assets, card_image_html, card_thumbnail_url
+from .static_build import asset_hashes, versioned_html, fingerprint_pages, unversioned
 
 # Configuration
 BLOG_DIR = r"c:\Users\OlgaKorniichuk\Documents\antiGravity Projects\Facebok AI.corelogic\blog"
 POSTS_DIR = os.path.join(BLOG_DIR, "posts")
 ASSETS_DIR = os.path.join(BLOG_DIR, "assets")
+FEED_DIR = os.path.join(BLOG_DIR, "feed")
+
+# Posts per listing shard (archive page / JSON feed file)
+PAGE_SIZE = 12
 
 CATEGORIES = {
     "Automation": ["automation", "agent", "bot", "workflow", "efficiency", "robot", "process", "audit", "scale", "autonomous"],
@@ -15,6 +25,21 @@ CATEGORIES = {
     "Tech Stack": ["python", "api", "database", "code", "dev", "sql", "javascript", "framework", "library", "github", "server", "backend", "frontend", "software", "platform", "tool", "tech", "tutorial", "guide", "build"]
 }
 
+# NEW THEMATIC ASSETS (Generated 2026-02-12)
+THEME_ASSETS = {
+    "Logistics": "assets/theme_logistics.png",
+    "Automation": "assets/theme_automation.png",
+    "Intelligence": "assets/theme_intelligence.png",
+    "Tech Stack": "assets/theme_techstack.png",
+    "Finance": "assets/theme_finance.png",
+    "Office": "assets/theme_office.png"
+}
+
+# Hero header background inside a post
+# Matches: class="article-hero" ... style="background-image: url('...');" or background: url(...)
+HERO_IMAGE_PATTERN = r'(class="article-hero"[^>]*style="[^"]*background(?:-image)?:\s*url\([\'"]?)(.*?)([\'"]?\))'
+OG_IMAGE_PATTERN = r'(<meta property="og:image" content=")(.*?)(")'
+
 def get_posts():
     """Reads all HTML posts and extracts metadata"""
     posts = []
@@ -32,6 +57,11 @@ def get_posts():
         else:
             title = filepath.stem
         
+        # Images the post file currently uses (compared by sync_post_images)
+        # (without the ?v= that static_build adds to local images)
+        hero_match = re.search(HERO_IMAGE_PATTERN, content, re.DOTALL)
+        og_images = re.findall(OG_IMAGE_PATTERN, content)
+        
         # Image Extraction Strategy (Fallback Logic)
         image_url = ""
         
@@ -88,6 +118,7 @@ def get_posts():
         else:
             best_cat = "Intelligence"
             
+        image_url = unversioned(image_url)
         # Fix relative paths for index (../assets/ -> assets/)
         if image_url.startswith("../assets/"):
             image_url = image_url.replace("../assets/", "assets/")
@@ -99,163 +130,252 @@ def get_posts():
             "date": date,
             "snippet": snippet,
             "category": best_cat,
-            "path": f"posts/{filepath.name}"
+            "path": f"posts/{filepath.name}",
+            "hero_image": unversioned(hero_match.group(2)) if hero_match else None,
+            "og_images": [unversioned(m[1]) for m in og_images]
         })
     return posts
 
-def generate_page(filename, posts, active_filter, page_title):
-    """Generates an HTML page based on the index.html template"""
-    
-    # Read template (index.html)
-    with open(os.path.join(BLOG_DIR, "index.html"), "r", encoding="utf-8") as f:
-        template = f.read()
-        
-    # 1. Update Navigation (Remove Join Community, Add About Us)
-    nav_replacement = """
-        <div class="header-right">
-            <a href="about.html" class="nav-link" style="color: #94A3B8; text-decoration: none; font-weight: 500; transition: color 0.2s;">About Us</a>
-        </div>
-    """
-    # Replace existing header-right div
-    template = re.sub(r'<div class="header-right">.*?</div>', nav_replacement, template, flags=re.DOTALL)
-    
-    # 2. Update Filter Bar Links & Active State
-    
-    # First, strip any existing "active" classes
-    template = re.sub(r'class="active"', '', template)
+def resolve_card_image(post):
+    """Decides which image a post uses on the grid (and therefore in the post itself)"""
     
-    # Ensure "All" link points to index.html (handle various spacing)
-    template = re.sub(r'<a href="#"\s*>All</a>', '<a href="index.html">All</a>', template)
+    # 1. Check for Existing Valid Image (e.g. External News Image)
+    # If the post already has a good image, we should use it for the grid too.
+    existing_image = post.get('image_url', '')
     
-    # Ensure other category links are correct (if they were reset to #)
-    template = template.replace('<a href="#">Automation</a>', '<a href="automation.html">Automation</a>')
-    template = template.replace('<a href="#">Logistics</a>', '<a href="logistics.html">Logistics</a>')
-    template = template.replace('<a href="#">Intelligence</a>', '<a href="intelligence.html">Intelligence</a>')
-    template = template.replace('<a href="#">Tech Stack</a>', '<a href="tech-stack.html">Tech Stack</a>')
-
-    # Now set the new active class
-    if active_filter == "All":
-        template = template.replace('<a href="index.html">All</a>', '<a href="index.html" class="active">All</a>')
-    else:
-        # Use regex to safely find the link and add class
-        # (simpler string replace might fail if attributes are reordered, but for now exact match is likely fine if we just generated it)
-        template = template.replace(f'<a href="{filename}">{active_filter}</a>', f'<a href="{filename}" class="active">{active_filter}</a>')
-    
-    # 3. Generate Post Grid
+    # Validation: Ignore empty, placeholders, logos, or assets (unless it's a theme asset)
+    is_valid_existing = False
+    if existing_image and "via.placeholder.com" not in existing_image and "pollinations.ai" not in existing_image:
+        if "assets/" not in existing_image or "theme_" in existing_image: 
+             # It's either external, or one of our themes (fine), or a manual asset
+             is_valid_existing = True
+        elif "logo" in existing_image.lower() or "icon" in existing_image.lower():
+             is_valid_existing = False
+        else:
+             # Standard local asset
+             is_valid_existing = True
+
+    if is_valid_existing:
+        return existing_image
+
+    # 2. Fallback to Thematic Assignment
+    title_lower = post['title'].lower()
     
-    # NEW THEMATIC ASSETS (Generated 2026-02-12)
-    THEME_ASSETS = {
-        "Logistics": "assets/theme_logistics.png",
-        "Automation": "assets/theme_automation.png",
-        "Intelligence": "assets/theme_intelligence.png",
-        "Tech Stack": "assets/theme_techstack.png",
-        "Finance": "assets/theme_finance.png",
-        "Office": "assets/theme_office.png"
-    }
+    if "stock" in title_lower or "market" in title_lower or "finance" in title_lower or "money" in title_lower or "investment" in title_lower:
+        return THEME_ASSETS["Finance"]
+    elif "manager" in title_lower or "corporate" in title_lower or "business" in title_lower or "office" in title_lower or "job" in title_lower:
+        return THEME_ASSETS["Office"]
+    elif "code" in title_lower or "python" in title_lower or "api" in title_lower or "tech" in title_lower or "software" in title_lower:
+        return THEME_ASSETS["Tech Stack"]
+    elif "robot" in title_lower or "agent" in title_lower or "musk" in title_lower or "rocket" in title_lower:
+        return THEME_ASSETS["Automation"]
+    elif "logistics" in title_lower or "supply chain" in title_lower or "shipping" in title_lower:
+        return THEME_ASSETS["Logistics"]
+    elif post['category'] in THEME_ASSETS:
+        return THEME_ASSETS[post['category']]
+    return THEME_ASSETS["Intelligence"]
 
-    posts_html = ""
+def sync_post_images(posts):
+    """
+    Makes every post file use the same image as its grid card.
+
+    Runs once per build, before any page is rendered. The image decision is
+    stored on each post as 'card_image'; a post file is only opened and
+    rewritten when its hero or og:image differs from that decision.
+    This prevents the "Grid shows X, Post shows Y" bug.
+
+    Returns:
+        list: Filenames of the posts that were rewritten
+    """
+    synced = []
     for post in posts:
-        bg_image = ""
+        bg_image = resolve_card_image(post)
+        post['card_image'] = bg_image
         
-        # 1. Check for Existing Valid Image (e.g. External News Image)
-        # If the post already has a good image, we should use it for the grid too.
-        existing_image = post.get('image_url', '')
-        
-        # Validation: Ignore empty, placeholders, logos, or assets (unless it's a theme asset)
-        is_valid_existing = False
-        if existing_image and "via.placeholder.com" not in existing_image and "pollinations.ai" not in existing_image:
-            if "assets/" not in existing_image or "theme_" in existing_image: 
-                 # It's either external, or one of our themes (fine), or a manual asset
-                 is_valid_existing = True
-            elif "logo" in existing_image.lower() or "icon" in existing_image.lower():
-                 is_valid_existing = False
-            else:
-                 # Standard local asset
-                 is_valid_existing = True
-
-        if is_valid_existing:
-            bg_image = existing_image
-        else:
-            # 2. Fallback to Thematic Assignment
-            title_lower = post['title'].lower()
-            
-            if "stock" in title_lower or "market" in title_lower or "finance" in title_lower or "money" in title_lower or "investment" in title_lower:
-                bg_image = THEME_ASSETS["Finance"]
-            elif "manager" in title_lower or "corporate" in title_lower or "business" in title_lower or "office" in title_lower or "job" in title_lower:
-                 bg_image = THEME_ASSETS["Office"]
-            elif "code" in title_lower or "python" in title_lower or "api" in title_lower or "tech" in title_lower or "software" in title_lower:
-                 bg_image = THEME_ASSETS["Tech Stack"]
-            elif "robot" in title_lower or "agent" in title_lower or "musk" in title_lower or "rocket" in title_lower:
-                 bg_image = THEME_ASSETS["Automation"]
-            elif "logistics" in title_lower or "supply chain" in title_lower or "shipping" in title_lower:
-                 bg_image = THEME_ASSETS["Logistics"]
-            elif post['category'] in THEME_ASSETS:
-                bg_image = THEME_ASSETS[post['category']]
-            else:
-                bg_image = THEME_ASSETS["Intelligence"]
-
-        print(f"Post: {post['filename']} | Image: {bg_image}") # DEBUG
-        
-        # --- CRITICAL FIX: SYNC POST FILE ---
-        # We must update the actual post HTML to match this EXACT image decision.
-        # This prevents the "Grid shows X, Post shows Y" bug.
+        # Relative path for inside /posts/ folder
+        rel_image = "../" + bg_image
+        hero_stale = post.get('hero_image') is not None and post['hero_image'] != rel_image
+        og_stale = any(og != rel_image for og in post.get('og_images', []))
+        if not (hero_stale or og_stale):
+            continue
         
         post_path = os.path.join(POSTS_DIR, post['filename'])
         try:
             with open(post_path, "r", encoding="utf-8") as f:
                 p_content = f.read()
             
-            # Relative path for inside /posts/ folder
-            rel_image = "../" + bg_image
-            
-            # Regex to find the hero header background 
-            # Matches: class="article-hero" ... style="background-image: url('...');" or background: url(...)
-            pattern = r'(class="article-hero"[^>]*style="[^"]*background(?:-image)?:\s*url\([\'"]?)(.*?)([\'"]?\))'
-            
-            def replacer(match):
-                prefix = match.group(1)
-                return f"{prefix}{rel_image}{match.group(3)}"
-            
-            new_p_content = re.sub(pattern, replacer, p_content, flags=re.DOTALL)
-            
-            # Also update og:image if present
-            og_pattern = r'(<meta property="og:image" content=")(.*?)(")'
-            new_p_content = re.sub(og_pattern, lambda m: f'{m.group(1)}{rel_image}{m.group(3)}', new_p_content)
+            new_p_content = re.sub(HERO_IMAGE_PATTERN, lambda m: f"{m.group(1)}{rel_image}{m.group(3)}", p_content, flags=re.DOTALL)
+            new_p_content = re.sub(OG_IMAGE_PATTERN, lambda m: f'{m.group(1)}{rel_image}{m.group(3)}', new_p_content)
             
             if new_p_content != p_content:
                 with open(post_path, "w", encoding="utf-8") as f:
                     f.write(new_p_content)
-                print(f"   -> Synced post file: {post['filename']}")
+                print(f"   -> Synced post file: {post['filename']} | Image: {bg_image}")
+                synced.append(post['filename'])
+
                 
         except Exception as e:
-            print(f"   -> ERROR syncing post file: {e}")
-        # ------------------------------------
+            print(f"   -> ERROR syncing post file {post['filename']}: {e}")
+    
+    return synced
 
-        posts_html += f"""
-        <article class="article-card">
-            <div class="card-image-placeholder" style="background-image: url('{bg_image}');">
-                <span class="category-pill">{post['category']}</span>
-            </div>
-            <div class="card-content">
-                <h2><a href="{post['path']}">{post['title']}</a></h2>
-                <p class="article-snippet">{post['snippet']}</p>
-                <div class="card-meta">
-                    <span class="date">{post['date']}</span>
-                    <a href="{post['path']}" class="read-more-btn"></a>
-                </div>
-            </div>
-        </article>
-        """
-        
-    # Replace Main Content
-    template = re.sub(r'<main id="news-feed">.*?</main>', f'<main id="news-feed">{posts_html}</main>', template, flags=re.DOTALL)
+# Filter bar entries: (label, page)
+FILTER_LINKS = [
+    ("All", "index.html"),
+    ("Automation", "automation.html"),
+    ("Logistics", "logistics.html"),
+    ("Intelligence", "intelligence.html"),
+    ("Tech Stack", "tech-stack.html"),
+]
+
+def card_context(post, picture=False):
+    """Slot values for one grid card (without picture: the JSON feed entry)"""
+    image = post.get('card_image') or resolve_card_image(post)
+    context = {
+        "image": card_thumbnail_url(image, ASSETS_DIR),
+        "category": post['category'],
+        "path": post['path'],
+        "title": post['title'],
+        "snippet": post['snippet'],
+        "date": post['date'],
+    }
+    if picture:
+        context["picture"] = card_image_html(image, ASSETS_DIR)
+    return context
+
+def shard_posts(posts, page_size=PAGE_SIZE):
+    """
+    Splits posts (newest first) into stable chronological shards.
+
+    Shard 1 holds the oldest posts and only the last shard is partial, so a
+    new post only ever changes the newest shard - older shards (and their
+    pages and JSON files) stay byte-identical between builds.
+
+    Returns:
+        list: Shards in chronological order, each listing its posts newest first
+    """
+    oldest_first = posts[::-1]
+    return [oldest_first[i:i + page_size][::-1] for i in range(0, len(oldest_first), page_size)]
+
+def generate_page(filename, posts, active_filter, page_title, versions=None, feed="", next_shard=0, newer=None, older=None):
+    """
+    Renders a listing page (index, category or archive page) from the compiled listing template.
+
+    Args:
+        versions (dict): CSS/JS content hashes from static_build.asset_hashes()
+        feed (str): Feed name used by the infinite-scroll loader (e.g. "index")
+        next_shard (int): Next older JSON shard to load on scroll (0 = none)
+        newer/older (str): Pagination links, or None
+
+    Returns:
+        str: Path of the page if it was (re)written, else None
+    """
+    
+    # 1. Filter Bar Links & Active State
+    filter_link = get_template("filter_link.html")
+    filter_links = "\n".join(
+        filter_link.render(href=href, label=label, active=' class="active"' if label == active_filter else "")
+        for label, href in FILTER_LINKS
+    )
+    
+    # 2. Post Grid (image decisions were made by sync_post_images)
+    posts_html = render_each("card.html", (card_context(post, picture=True) for post in posts))
+    
+    # 3. Pagination (plain links, so archives work without JavaScript)
+    pagination = ""
+    if newer or older:
+        pagination = render(
+            "pagination.html",
+            newer=f'<a href="{newer}" class="newer">&larr; Newer</a>' if newer else "",
+            older=f'<a href="{older}" class="older">Older &rarr;</a>' if older else ""
+        )
+    
+    page = render(
+        "listing.html",
+        page_title=page_title,
+        stylesheet="css/style.css",
+        filter_links=filter_links,
+        feed=feed,
+        next_shard=next_shard,
+        posts=posts_html,
+        pagination=pagination
+    )
+    
+    # Cache busting: ?v=<content hash>, so pages only change when an asset does
+    page, _ = versioned_html(page, versions if versions is not None else asset_hashes(BLOG_DIR))
     
     # Write File
-    with open(os.path.join(BLOG_DIR, filename), "w", encoding="utf-8") as f:
-        f.write(template)
-    print(f"Generated {filename} with {len(posts)} posts")
+    path = os.path.join(BLOG_DIR, filename)
+    if write_if_changed(path, page):
+        print(f"Generated {filename} with {len(posts)} posts")
+        return path
+    return None
 
-def generate_about_page():
+def generate_listing(name, posts, active_filter, page_title, versions=None, page_size=PAGE_SIZE):
+    """
+    Builds a paginated listing: {name}.html, archive pages {name}-{k}.html and
+    JSON shards feed/{name}-{k}.json, plus a small feed/{name}.json manifest.
+
+    {name}.html shows the newest shard plus the one before it (so the front
+    page is never nearly empty right after a shard fills up); archive page k
+    shows shard k. Files are only rewritten when their content changes.
+
+    Returns:
+        list: Paths of the files that were written or removed
+    """
+    shards = shard_posts(posts, page_size)
+    total = len(shards)
+    changed = []
+    
+    def page_name(k):
+        # Shards shown on the front page link back to it
+        return f"{name}.html" if k >= total - 1 else f"{name}-{k}.html"
+    
+    # Front page: newest two shards
+    front = shards[-1] + shards[-2] if total >= 2 else (shards[-1] if shards else [])
+    oldest_archive = total - 2
+    changed.append(generate_page(
+        f"{name}.html", front, active_filter, page_title, versions,
+        feed=name,
+        next_shard=max(oldest_archive, 0),
+        older=page_name(oldest_archive) if oldest_archive >= 1 else None
+    ))
+    
+    # Archive pages for every shard that has scrolled off the front page
+    for k in range(1, oldest_archive + 1):
+        changed.append(generate_page(
+            page_name(k), shards[k - 1], active_filter, f"{page_title} - Page {k}", versions,
+            feed=name,
+            next_shard=k - 1,
+            newer=page_name(k + 1),
+            older=page_name(k - 1) if k > 1 else None
+        ))
+    
+    # JSON shards for client-side infinite scroll
+    os.makedirs(FEED_DIR, exist_ok=True)
+    for k, shard in enumerate(shards, start=1):
+        shard_path = os.path.join(FEED_DIR, f"{name}-{k}.json")
+        payload = json.dumps([card_context(post) for post in shard], ensure_ascii=False, separators=(",", ":"))
+        if write_if_changed(shard_path, payload):
+            changed.append(shard_path)
+    
+    manifest_path = os.path.join(FEED_DIR, f"{name}.json")
+    manifest = json.dumps({"page_size": page_size, "shards": total, "posts": len(posts)})
+    if write_if_changed(manifest_path, manifest):
+        changed.append(manifest_path)
+    
+    # Remove pages/shards left over from a larger archive (e.g. after dedup)
+    stale = re.compile(re.escape(name) + r"-(\d+)\.(html|json)$")
+    for directory, ext, limit in ((BLOG_DIR, "html", oldest_archive), (FEED_DIR, "json", total)):
+        for filename in os.listdir(directory):
+            match = stale.match(filename)
+            if match and match.group(2) == ext and int(match.group(1)) > limit:
+                os.remove(os.path.join(directory, filename))
+                changed.append(os.path.join(directory, filename))
+    
+    return [path for path in changed if path]
+
+def generate_about_page(versions=None):
     """Generates the About Us page"""
     
     content = """<!DOCTYPE html>
@@ -264,7 +384,7 @@ def generate_about_page():
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>About Us | AI Core Logic</title>
-    <link rel="stylesheet" href="css/style.css?v=6">
+    <link rel="stylesheet" href="css/style.css">
     <link href="https://fonts.googleapis.com/css2?family=Outfit:wght@300;400;600;700&display=swap" rel="stylesheet">
     <style>
         .about-container { max-width: 800px; margin: 0 auto; padding: 4rem 2rem; }
@@ -358,9 +478,13 @@ def generate_about_page():
 </body>
 </html>"""
     
-    with open(os.path.join(BLOG_DIR, "about.html"), "w", encoding="utf-8") as f:
-        f.write(content)
-    print("Generated about.html")
+    content, _ = versioned_html(content, versions if versions is not None else asset_hashes(BLOG_DIR))
+    
+    path = os.path.join(BLOG_DIR, "about.html")
+    if write_if_changed(path, content):
+        print("Generated about.html")
+        return path
+    return None
 
 def main():
     print("Starting Logic Core Expansion...")
@@ -369,6 +493,10 @@ def main():
     all_posts = get_posts()
     print(f"Parsed {len(all_posts)} posts")
     
+    # Sync hero/og images into post files once, before any page is rendered
+    synced = sync_post_images(all_posts)
+    print(f"Synced images in {len(synced)} post files")
+    
     # 2. Filter posts by category
     cat_posts = {cat: [] for cat in CATEGORIES}
     for post in all_posts:
@@ -379,17 +507,40 @@ def main():
     print(f"   - Intelligence: {len(cat_posts['Intelligence'])}")
     print(f"   - Tech Stack: {len(cat_posts['Tech Stack'])}")
     
-    # 3. Generate Category Pages
-    generate_page("automation.html", cat_posts['Automation'], "Automation", "Automation & Efficiency")
-    generate_page("logistics.html", cat_posts['Logistics'], "Logistics", "Logistics & Supply Chain")
-    generate_page("intelligence.html", cat_posts['Intelligence'], "Intelligence", "Business Intelligence")
-    generate_page("tech-stack.html", cat_posts['Tech Stack'], "Tech Stack", "Engineering & Code")
+    # 3. Resized card variants for new/changed images (srcset on the grid);
+    # synced post files are build outputs too and must ship with the grid
+    written = [os.path.join(POSTS_DIR, filename) for filename in synced] + build_assets(ASSETS_DIR)
+    
+    # 4. Generate Category Pages
+    versions = asset_hashes(BLOG_DIR)
+    written += generate_listing("automation", cat_posts['Automation'], "Automation", "Automation & Efficiency", versions)
+    written += generate_listing("logistics", cat_posts['Logistics'], "Logistics", "Logistics & Supply Chain", versions)
+    written += generate_listing("intelligence", cat_posts['Intelligence'], "Intelligence", "Business Intelligence", versions)
+    written += generate_listing("tech-stack", cat_posts['Tech Stack'], "Tech Stack", "Engineering & Code", versions)
+    
+    # 5. Update Index (All Posts)
+    written += generate_listing("index", all_posts, "All", "Business Intelligence", versions)
+    
+    # 6. Generate About Page
+    written.append(generate_about_page(versions))
+    
+    # 7. Cache-bust any other page whose CSS/JS/images changed, refresh the asset manifest
+    written += fingerprint_pages(BLOG_DIR)
     
-    # 4. Update Index (All Posts)
-    generate_page("index.html", all_posts, "All", "Business Intelligence")
+    # 8. Static search index (incremental, from cached per-post metadata). Runs
+    # after fingerprinting, so it caches the post mtimes this build leaves behind
+    written += build_search_index(all_posts, POSTS_DIR, BLOG_DIR)
     
-    # 5. Generate About Page
-    generate_about_page()
+    written = [path for path in written if path]
+    print(f"Wrote {len(written)} files")
+    return written
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Rebuild listing pages, feeds and the search index")
+    parser.add_argument("--written-out", help="Write the list of changed files to this JSON file (used for deploys)")
+    args = parser.parse_args()
+    written = main()
+    if args.written_out:
+        with open(args.written_out, "w", encoding="utf-8") as f:
+            json.dump([os.path.abspath(path) for path in written], f)
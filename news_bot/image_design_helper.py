@@ -8,83 +8,196 @@ Inspired by professional news network graphics:
 - Professional photojournalism style
 """
 
-import google.generativeai as genai
-from .settings import GOOGLE_API_KEY
+import json
+import re
+from .gemini_client import generate
+from .metrics import record_cache
 
+# Visual briefs already produced by the LLM, keyed by article content
+_brief_cache = {}
 
-def analyze_article_visual_context(article):
+DEFAULT_SPECS = {
+    'scene': 'modern technology workspace with computers',
+    'emotion_trigger': 'professional',
+    'category_badge': 'NEWS',
+    'headline_position': 'bottom',
+    'color_scheme': 'vibrant blue'
+}
+
+# Keyword heuristics for the offline fallback: (keywords, badge, emotion, scene, color)
+# Whole words only (plural/tense forms spelled out): 'new' must not match
+# "news" or "network", nor 'ban' match "bank"
+HEURISTIC_RULES = [
+    ([r'breach(?:es|ed)?', r'hack(?:s|ed|ers?|ing)?', r'lawsuits?', r'ban(?:s|ned)?', r'warn(?:s|ed|ings?)?',
+      r'risks?', r'layoffs?'], 'INDUSTRY ALERT', 'concerning',
+     'dimly lit security operations center with red warning screens', 'alert red'),
+    ([r'funding', r'rais(?:e|es|ed|ing)', r'revenues?', r'profits?', r'markets?', r'acquir(?:e|es|ed|ing)',
+      r'acquisitions?', r'billions?', r'millions?'], 'BUSINESS', 'professional',
+     'modern boardroom with financial charts on a wall display', 'corporate navy blue'),
+    ([r'robots?', r'robotics', r'agents?', r'agentic', r'automation', r'automat(?:e|es|ed|ing)', r'logistics',
+      r'warehouses?'], 'AI NEWS', 'urgent',
+     'automated warehouse with robotic arms and glowing data overlays', 'tech blue'),
+    ([r'models?', r'gpt(?:-?\d[\w.]*)?', r'gemini', r'claude', r'llms?', r'chips?', r'gpus?'], 'TECH UPDATE', 'exciting',
+     'AI datacenter with rows of servers and blue lighting', 'electric blue'),
+    ([r'launch(?:es|ed|ing)?', r'releas(?:e|es|ed|ing)', r'unveil(?:s|ed|ing)?', r'announc(?:e|es|ed|ing|ement)',
+      r'new'], 'BREAKING NEWS', 'exciting',
+     'product launch stage with large screens and dramatic lighting', 'electric blue'),
+]
+
+
+def build_breaking_news_prompt(title, brief):
     """
-    Analyzes article and returns visual design specifications
-    inspired by news network graphics (ABC, Bloomberg, Variety style).
-    
+    Fill the "Breaking News Graphic" formula (split composition, circular
+    insets, AI CORE LOGIC banner, headline stack with yellow highlight).
+
     Args:
-        article (dict): Article with 'title' and 'summary' keys
-        
+        title (str): Article title
+        brief (dict): Visual brief with scene/evidence/headline fields
+
     Returns:
-        dict: {
-            'scene': str,           # Background photo description
-            'emotion_trigger': str, # Visual mood (urgent/professional/exciting)
-            'category_badge': str,  # Badge text (BREAKING NEWS, TECH UPDATE, etc.)
-            'headline_position': str, # 'bottom' (default for news overlay style)
-            'color_scheme': str     # Primary color scheme
-        }
+        str: Single-line image prompt
     """
+    prompt = (
+        f"Create a powerful, 'breaking news' style Facebook graphic for a post about {title}. "
+        f"1. The Split Composition (Crucial): Top 60% of Frame: A high-resolution, professional photo of {brief['scene']}. "
+        "Bottom 40% of Frame: A solid, dark, heavy contrast block (e.g., black or very dark blue) that serves as the dedicated text container. "
+        "The transition between the photo and this block should be clean. "
+        f"2. The Insets (Tighter Anchoring): Top Right: A clean circular inset with a portrait of {brief['primary_visual']}. "
+        "Anchor it so its bottom edge is near the top of the dark text block. "
+        f"Top Left: A distinct circular inset with {brief['secondary_visual']}. Anchor it symmetrically with the first inset. "
+        "3. The Branding: Place the 'AI CORE LOGIC' black and white banner at the Top Center, between the two insets. "
+        "4. The Typography Stack (The 'Breaking News' Look): Inside the bottom dark block, create a massive, multi-line text stack "
+        "using an ultra-bold, compressed sans-serif font. "
+        f"Line 1 (Main Header): Giant, white text: '{brief['main_headline']}'. "
+        "Line 2 (Sub-Header & Highlight): Below it, a slightly smaller but still dominant line of text. "
+        f"You MUST use a thick bright yellow (#FFFF00) highlight bar behind the key phrase. The text is: '{brief['highlight_headline']}'. "
+        f"Accent color: {brief['color_scheme']}. "
+        "Aesthetic Rule: The image must feel dense, urgent, and professional, like a cable news alert. "
+        "The text stack must be the dominant visual element of the entire composition."
+    )
+    return prompt
+
+
+def _split_headline(title):
+    """Split a title into a 3-4 word main header and the highlighted rest."""
+    words = title.split()
+    cut = 4 if len(words) > 6 else 3
+    main = " ".join(words[:cut]).upper()
+    rest = " ".join(words[cut:]).upper() or main
+    return main, rest
+
+
+def heuristic_visual_brief(article, image_idea=None):
+    """
+    Build a visual brief locally (no LLM) from keywords in the article.
+    Used when Gemini is unavailable or returns something unusable.
+    """
+    text = f"{article['title']} {article.get('summary', '')}".lower()
+    brief = dict(DEFAULT_SPECS)
+    brief['primary_visual'] = 'the key executive or product at the center of the story'
+    brief['secondary_visual'] = 'a chart or document that proves the headline'
+
+    for keywords, badge, emotion, scene, color in HEURISTIC_RULES:
+        if re.search(r'\b(?:' + '|'.join(keywords) + r')\b', text):
+            brief.update({'category_badge': badge, 'emotion_trigger': emotion, 'scene': scene, 'color_scheme': color})
+            break
+
+    if image_idea:
+        brief['scene'] = f"{image_idea}, {brief['scene']}"
+
+    brief['main_headline'], brief['highlight_headline'] = _split_headline(article['title'])
+    brief['image_prompt'] = build_breaking_news_prompt(article['title'], brief)
+    return brief
+
+
+def generate_visual_brief(article, image_idea=None):
+    """
+    One LLM call that returns both the design specs and the final image prompt.
+
+    Successful briefs are cached per (title, summary, image_idea), so the
+    same article never costs a second round-trip. Falls back to
+    heuristic_visual_brief() if the LLM call fails.
+
+    Args:
+        article (dict): Article with 'title' and optional 'summary'
+        image_idea (str, optional): AI-suggested image idea from processor
+
+    Returns:
+        dict: DEFAULT_SPECS keys plus 'primary_visual', 'secondary_visual',
+              'main_headline', 'highlight_headline' and 'image_prompt'
+    """
+    summary = article.get('summary', '')[:300]
+    key = (article['title'], summary, image_idea)
+    record_cache("visual_brief", key in _brief_cache)
+    if key in _brief_cache:
+        return dict(_brief_cache[key])
+
     try:
-        genai.configure(api_key=GOOGLE_API_KEY)
-        model = genai.GenerativeModel('gemini-flash-latest')  # Same model as processor.py
-        
-        prompt = f"""Analyze this news article and provide visual design specifications for a Facebook post image.
+        idea_line = f"\nSuggested image idea: {image_idea}" if image_idea else ""
+        prompt = f"""Role: Expert AI Art Director for a Viral Tech News Page (Facebook).
 
-Article Title: {article['title']}
-Summary: {article.get('summary', '')[:300]}
+Analyze this news article and design a "Breaking News Graphic" (split composition: photo on top, dark text block at the bottom, two circular insets, bold headline stack).
 
-Create specifications for a NEWS OVERLAY GRAPHIC (ABC News / Variety / Bloomberg style):
+Article Title: {article['title']}
+Summary: {summary}{idea_line}
 
-Return ONLY a JSON object with these exact keys (no markdown, no explanation):
+Return ONLY a JSON object with these exact keys:
 {{
-    "scene": "Detailed description of background photo/scene that visually represents the story",
+    "scene": "High-res background photo that visually represents the story",
+    "primary_visual": "The 'Who': close-up of the key person/CEO or hero object",
+    "secondary_visual": "The 'Proof': document, chart or contrasting object",
+    "main_headline": "First 3-4 words of the headline, ALL CAPS, massive impact",
+    "highlight_headline": "Rest of the headline containing the key phrase, ALL CAPS",
     "emotion_trigger": "Choose ONE: urgent | professional | exciting | concerning | inspiring",
-    "category_badge": "Choose appropriate badge: BREAKING NEWS | TECH UPDATE | BUSINESS | AI NEWS | INDUSTRY ALERT",
-    "headline_position": "bottom",
+    "category_badge": "Choose ONE: BREAKING NEWS | TECH UPDATE | BUSINESS | AI NEWS | INDUSTRY ALERT",
     "color_scheme": "Primary color for accents (e.g., 'vibrant red', 'tech blue', 'gold')"
-}}
+}}"""
 
-Examples:
-- For breaking AI news: {{"scene": "Modern AI datacenter with servers and blue lighting", "emotion_trigger": "urgent", "category_badge": "BREAKING NEWS", "headline_position": "bottom", "color_scheme": "electric blue"}}
-- For business update: {{"scene": "Professional business meeting with charts on screen", "emotion_trigger": "professional", "category_badge": "BUSINESS", "headline_position": "bottom", "color_scheme": "corporate navy blue"}}"""
-
-        response = model.generate_content(prompt)
+        response = generate(prompt, generation_config={"response_mime_type": "application/json"})
         text = response.text.strip()
         
-        # Parse JSON response
-        import json
-        import re
-        
         # Remove markdown code blocks if present
         text = re.sub(r'^```json\s*', '', text)
         text = re.sub(r'\s*```$', '', text)
-        
-        design_specs = json.loads(text)
-        
-        # Validate and provide defaults
-        return {
-            'scene': design_specs.get('scene', 'modern office with technology'),
-            'emotion_trigger': design_specs.get('emotion_trigger', 'professional'),
-            'category_badge': design_specs.get('category_badge', 'NEWS'),
-            'headline_position': 'bottom',  # Always bottom for news overlay style
-            'color_scheme': design_specs.get('color_scheme', 'vibrant blue')
-        }
-        
+        specs = json.loads(text)
+
+        fallback = heuristic_visual_brief(article, image_idea)
+        brief = {k: specs.get(k) or fallback[k] for k in fallback if k != 'image_prompt'}
+        brief['headline_position'] = 'bottom'  # Always bottom for news overlay style
+        if image_idea and image_idea not in brief['scene']:
+            brief['scene'] = f"{image_idea}, {brief['scene']}"
+        brief['image_prompt'] = build_breaking_news_prompt(article['title'], brief)
+
+        _brief_cache[key] = brief
+        return dict(brief)
+
     except Exception as e:
-        print(f"Warning: Design analysis failed: {e}, using defaults")
-        # Fallback defaults
-        return {
-            'scene': 'modern technology workspace with computers',
-            'emotion_trigger': 'professional',
-            'category_badge': 'NEWS',
-            'headline_position': 'bottom',
-            'color_scheme': 'vibrant blue'
+        print(f"Warning: Visual brief generation failed: {e}, using heuristics")
+        return heuristic_visual_brief(article, image_idea)
+
+
+def analyze_article_visual_context(article):
+    """
+    Analyzes article and returns visual design specifications
+    inspired by news network graphics (ABC, Bloomberg, Variety style).
+
+    Served from generate_visual_brief(), so asking for the image prompt
+    afterwards does not cost another LLM call.
+    
+    Args:
+        article (dict): Article with 'title' and 'summary' keys
+        
+    Returns:
+        dict: {
+            'scene': str,           # Background photo description
+            'emotion_trigger': str, # Visual mood (urgent/professional/exciting)
+            'category_badge': str,  # Badge text (BREAKING NEWS, TECH UPDATE, etc.)
+            'headline_position': str, # 'bottom' (default for news overlay style)
+            'color_scheme': str     # Primary color scheme
         }
+    """
+    brief = generate_visual_brief(article)
+    return {k: brief[k] for k in DEFAULT_SPECS}
 
 
 def create_news_overlay_prompt(article, design_specs, image_idea=None):
@@ -3,12 +3,12 @@ Multi-Provider Image Generator with Robust Fallbacks
 Supports: Pollinations AI (free), DALL-E 3 (paid), PIL text graphics (fallback)
 """
 
-import os
 from pathlib import Path
 from datetime import datetime
 import urllib.parse
 import requests
 import random
+from .metrics import incr
 
 class ImageGenerator:
     def __init__(self):
@@ -50,8 +50,11 @@ class ImageGenerator:
         # Try Vertex AI Imagen first (Google Cloud - free tier available)
         if use_vertex:
             try:
-                return self._generate_with_vertex(prompt, output_filename, title=title)
+                path = self._generate_with_vertex(prompt, output_filename, title=title)
+                incr("image_provider_vertex")
+                return path
             except Exception as e:
+                incr("image_provider_fallbacks")
                 with open(self.log_file, "a") as f:
                     f.write(f"[{datetime.now()}] Vertex AI Failed: {str(e)}\n")
                 print(f"❌ Vertex AI Imagen failed: {e}")
@@ -60,23 +63,32 @@ class ImageGenerator:
         # Try DALL-E 3 second if requested and available
         if use_dalle and self.openai_key:
             try:
-                return self._generate_with_dalle(prompt, output_filename, title=title)
+                path = self._generate_with_dalle(prompt, output_filename, title=title)
+                incr("image_provider_dalle")
+                return path
             except Exception as e:
+                incr("image_provider_fallbacks")
                 print(f"❌ DALL-E 3 failed: {e}")
                 print(f"🔄 Falling back to Pollinations AI...")
         
         # Try Pollinations AI (free but can be unreliable)
         try:
-            return self._generate_with_pollinations(prompt, output_filename)
+            path = self._generate_with_pollinations(prompt, output_filename)
+            incr("image_provider_pollinations")
+            return path
         except Exception as e:
+            incr("image_provider_fallbacks")
             print(f"❌ Pollinations AI failed: {e}")
             
             # Final Fallback: PIL Text Image
             try:
                 # Use title if available for better looking fallback
                 text_to_use = title if title else prompt
-                return self._generate_with_pil(text_to_use, output_filename, is_title=bool(title))
+                path = self._generate_with_pil(text_to_use, output_filename, is_title=bool(title))
+                incr("image_provider_pil")
+                return path
             except Exception as e_pil:
+                incr("image_provider_failures")
                 print(f"❌ PIL Fallback failed: {e_pil}")
                 return None
     
@@ -252,7 +264,8 @@ class ImageGenerator:
             # Composite
             out = Image.alpha_composite(img, overlay)
             out = out.convert("RGB")
-            out.save(image_path, quality=95)
+            # Intermediate file - the asset pipeline re-encodes it for the site
+            out.save(image_path, quality=85, optimize=True, progressive=True)
             print(f"   ✅ Added News Overlay to {image_path}")
             
         except Exception as e:
@@ -451,90 +464,19 @@ class ImageGenerator:
         """
         Uses Gemini to generate a highly specific, content-aware image prompt.
         Ensures variety by analyzing the actual story details.
+
+        The "Breaking News Master Prompt" style (split composition, circular
+        insets, yellow highlight headline stack) lives in
+        image_design_helper.generate_visual_brief, which produces the design
+        specs and this prompt in one cached call.
         """
         print(f"🧠 Generating content-aware prompt for: {title[:50]}...")
         
-        try:
-            import google.generativeai as genai
-            from .settings import GOOGLE_API_KEY
-            
-            genai.configure(api_key=GOOGLE_API_KEY)
-            model = genai.GenerativeModel('gemini-flash-latest')
-            
-            # NEW "Breaking News Master Prompt" Style Guide
-            # Composition: Split (Photo Top/Dark Block Bottom) + Tighter Insets + Text Stack
-            
-            user_prompt = f"""
-            Role: Expert AI Art Director for a Viral Tech News Page (Facebook).
-            
-            Task: Create a prompt for a "Breaking News Graphic" (Split Composition) about the following article.
-            
-            Article Title: {title}
-            Article Summary: {summary}
-            
-            VISUAL FORMULA (The "Distinguished Idea" - Urgent & Professional):
-            1. The Split Composition (Crucial):
-               - Top 60% of Frame: A high-resolution, professional photo of [MAIN BACKGROUND SCENE].
-               - Bottom 40% of Frame: A solid, dark, heavy contrast block (black or very dark blue) serving as the dedicated text container. Clean transition.
-            
-            2. The Insets (Tighter Anchoring):
-               - Top Right: Clean circular inset with [PRIMARY VISUAL EVIDENCE]. Anchor bottom edge near the top of the dark text block.
-               - Top Left: Distinct circular inset with [SECONDARY VISUAL EVIDENCE]. Anchor symmetrically.
-            
-            3. The Branding:
-               - Place the 'AI CORE LOGIC' black and white banner at the Top Center, between the two insets.
-            
-            4. The Typography Stack (The 'Breaking News' Look):
-               - Inside the bottom dark block, create a massive, multi-line text stack using an ultra-bold, compressed sans-serif font.
-               - Line 1 (Main Header): Giant, white text: '[INSERT 3-4 WORD MAIN HEADLINE]'.
-               - Line 2 (Sub-Header & Highlight): Below it, a slightly smaller but dominant line. MUST use a thick bright yellow (#FFFF00) highlight bar behind the key phrase. The text is: '[INSERT REST OF HEADLINE WITH YELLOW BAR]'.
-            
-            DYNAMIC VARIABLES (Extract from text):
-            • [MAIN BACKGROUND SCENE]: [Identify the best high-res background photo.]
-            • [PRIMARY VISUAL EVIDENCE]: [The 'Who': Close-up of Key Person/CEO or Hero Object.]
-            • [SECONDARY VISUAL EVIDENCE]: [The 'Proof': Document, Chart, or Contrasting Object.]
-            • [INSERT 3-4 WORD MAIN HEADLINE]: [The first part of the headline. Massive impact.]
-            • [INSERT REST OF HEADLINE WITH YELLOW BAR]: [The second part of the headline, containing the key phrase to highlight with a yellow bar.]
-            
-            Output Template:
-            "Create a powerful, 'breaking news' style Facebook graphic for a post about {title}.
-            
-            1. The Split Composition (Crucial):
-            Top 60% of Frame: A high-resolution, professional photo of [MAIN BACKGROUND SCENE].
-            Bottom 40% of Frame: A solid, dark, heavy contrast block (e.g., black or very dark blue) that serves as the dedicated text container. The transition between the photo and this block should be clean.
-            
-            2. The Insets (Tighter Anchoring):
-            Top Right: A clean circular inset with a portrait of [PRIMARY VISUAL EVIDENCE]. Anchor it so its bottom edge is near the top of the dark text block.
-            Top Left: A distinct circular inset with [SECONDARY VISUAL EVIDENCE]. Anchor it symmetrically with the first inset.
-            
-            3. The Branding:
-            Place the 'AI CORE LOGIC' black and white banner at the Top Center, between the two insets.
-            
-            4. The Typography Stack (The 'Breaking News' Look):
-            Inside the bottom dark block, create a massive, multi-line text stack using an ultra-bold, compressed sans-serif font.
-            Line 1 (Main Header): Giant, white text: '[INSERT 3-4 WORD MAIN HEADLINE]'.
-            Line 2 (Sub-Header & Highlight): Below it, a slightly smaller but still dominant line of text. You MUST use a thick bright yellow (#FFFF00) highlight bar behind the key phrase. The text is: '[INSERT REST OF HEADLINE WITH YELLOW BAR]'.
-            
-            Aesthetic Rule: The image must feel dense, urgent, and professional, like a cable news alert. The text stack must be the dominant visual element of the entire composition."
-            
-            Output:
-            Return ONLY the final prompt text with the variables filled in.
-            """
-            
-            response = model.generate_content(user_prompt)
-            generated_prompt = response.text.strip()
-            
-            # Safety cleanup
-            generated_prompt = generated_prompt.replace("\n", " ")
-            
-            print(f"   ✨ LLM Prompt: {generated_prompt[:100]}...")
-            return generated_prompt
-            
-        except Exception as e:
-            print(f"⚠️ LLM Prompt Generation failed: {e}. Falling back to template.")
-            # Fallback to old template logic but with new style
-            style_guide = "VISUAL STYLE: Broadcast News Graphic. Split screen or Picture-in-Picture. High Contrast."
-            return f"A news graphic about '{title}' with a circular inset of a relevant person and a bold headline at the bottom. {style_guide}"
+        from .image_design_helper import generate_visual_brief
+        
+        generated_prompt = generate_visual_brief({'title': title, 'summary': summary})['image_prompt']
+        print(f"   ✨ LLM Prompt: {generated_prompt[:100]}...")
+        return generated_prompt
 
     def create_viral_prompt(self, title):
         """Legacy wrapper for backward compatibility."""
@@ -542,19 +484,9 @@ class ImageGenerator:
     
     
     def cleanup_old_images(self, days_old=7):
-        """Delete image files older than specified days."""
-        import time
-        current_time = time.time()
-        deleted_count = 0
-        
-        for filepath in self.output_dir.glob("*.jpg"):
-            file_age_days = (current_time - os.path.getmtime(filepath)) / 86400
-            if file_age_days > days_old:
-                os.remove(filepath)
-                deleted_count += 1
-        
-        if deleted_count > 0:
-            print(f"🧹 Cleaned up {deleted_count} old image files")
+        """Delete old images, keeping temp_images under its size budget (see StorageManager)."""
+        from .storage_manager import StorageManager
+        return StorageManager(self.output_dir, max_age_days=days_old).collect()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+"""
+Keyword Matcher
+One compiled regex per keyword list, with per-keyword hit counts
+
+The keywords are folded into a trie-shaped pattern ("ai(?: tool)?|s(?:mall
+business|oftware|tartup)|..."), so the scan stays a single pass with
+little backtracking however many keywords there are. Text is lowercased
+before matching (cheaper than re.IGNORECASE). Matching keeps the old
+substring semantics ("startup" also hits "startups") but ignores case, so
+mixed-case entries like "AI tool" now match.
+"""
+
+from collections import Counter
+from functools import lru_cache
+import re
+from .settings import KEYWORDS
+
+
+def _trie_pattern(words):
+    """Regex source matching any of words, longest match first at each position."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a word
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A word ends here too: the rest is optional (greedy, so longer keywords win)
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+@lru_cache(maxsize=8)
+def compile_keywords(keywords):
+    """
+    Build the matcher for a tuple of keywords (cached, so it is compiled
+    once per KEYWORDS change).
+
+    Returns:
+        tuple: (compiled pattern over lowercased text, dict of lowercased keyword -> keyword as configured)
+    """
+    canonical = {}
+    for keyword in keywords:
+        if keyword:
+            canonical.setdefault(keyword.lower(), keyword)
+    return re.compile(_trie_pattern(canonical) or r"(?!)"), canonical
+
+
+def match_keywords(text, keywords=None):
+    """
+    Count keyword occurrences in text.
+
+    Returns:
+        Counter: keyword (as configured) -> hits; empty if nothing matched
+    """
+    pattern, canonical = compile_keywords(tuple(KEYWORDS if keywords is None else keywords))
+    return Counter(canonical[m] for m in pattern.findall((text or "").lower()))
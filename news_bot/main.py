@@ -1,42 +1,63 @@
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from difflib import SequenceMatcher
+from queue import Queue
 from .collector import NewsCollector
 from .processor import NewsProcessor
 # from .publisher import FacebookPublisher  # Removed - Facebook posting now in facebook_blog_poster.py
 from .blog_generator import BlogGenerator
 from .article_tracker import ArticleTracker
+from .storage_manager import StorageManager
+from .gemini_client import generate_text
+from .metrics import start_run, finish_run, span, incr
+from .settings import PUBLISH_TOP_K, PUBLISH_WORKERS, SCORE_TARGET, SCORE_BUDGET, PRERANK_TOP_N, PRERANK_WINDOW
 # from .viral_reel_generator import ViralReelGenerator  # Removed per user request
-from .image_design_helper import analyze_article_visual_context, create_news_overlay_prompt
+from .keyword_matcher import match_keywords
+from .image_design_helper import generate_visual_brief
 
-def run_bot():
-    print("Starting AI Core Logic News Bot...")
+BLOG_URL = "https://aicorelogic-ops.github.io/ai-core-logic-blogz/blog/posts/"
 
-    # Initialize tracker
-    tracker = ArticleTracker()
-    
-    # 1. Collect
-    collector = NewsCollector()
-    # Fetch only the first 10 posts from each RSS feed to analyze for viral potential
-    articles = collector.fetch_news(hours_back=168, max_posts_per_feed=10)
-    print(f"Found {len(articles)} potential articles.")
+# Fetch only the first N posts from each RSS feed to analyze for viral potential
+HOURS_BACK = 168
+MAX_POSTS_PER_FEED = 10
+# Top-scored candidates checked against existing posts before giving up
+# (for a batch of K, the top K + MAX_CANDIDATES - 1)
+MAX_CANDIDATES = 3
+# Two picks in one batch this similar are the same story from different feeds
+BATCH_DUPLICATE_THRESHOLD = 0.85
 
-    if not articles:
-        print("No new articles found. Sleeping.")
-        return
-
-    # 2. Score Articles for Viral Potential (Select BEST, not newest)
-    print("Scoring articles for viral potential...")
-    
-    def score_viral_potential(article):
-        # (existing scoring logic unchanged)
-        try:
-            import google.generativeai as genai
-            from .settings import GOOGLE_API_KEY
-            
-            genai.configure(api_key=GOOGLE_API_KEY)
-            model = genai.GenerativeModel('gemini-flash-latest')
-            
-            prompt = f"""Score this article for VIRAL POTENTIAL in the logistics/business automation niche (0-100).
+# Scoring pipeline: LLM scoring calls in flight, and articles buffered
+# between the feeds and the scorers
+SCORE_WORKERS = 4
+SCORE_QUEUE_SIZE = 8
+# Keyword hits per word of title + summary below which an article is a
+# passing mention, not worth an LLM call (title hits always pass)
+MIN_KEYWORD_DENSITY = 0.005
+
+
+def _ascii(text):
+    return text.encode('ascii', 'ignore').decode('ascii')
+
+
+class NewsBot:
+    """
+    The clients a run needs. run_bot() builds a fresh one per cron run; the
+    daemon (news_bot.daemon) keeps one alive so they stay warm across cycles.
+    """
+
+    def __init__(self):
+        self.tracker = ArticleTracker()
+        self.collector = NewsCollector()
+        self.processor = NewsProcessor()
+        self.blog_gen = BlogGenerator()
+        # viral_gen = ViralReelGenerator()  # Removed per user request
+
+
+def score_viral_potential(article):
+    try:
+        prompt = f"""Score this article for VIRAL POTENTIAL in the logistics/business automation niche (0-100).
 
 Title: {article['title']}
 Summary: {article.get('summary', '')[:300]}
@@ -51,118 +72,421 @@ Scoring Factors:
 
 Return ONLY a number 0-100. No explanation."""
 
-            response = model.generate_content(prompt)
-            score = int(response.text.strip())
-            return max(0, min(100, score))  # Clamp between 0-100
-        except Exception as e:
-            print(f"Scoring error: {e}")
-            return 50  # Default middle score if error
-    
-    # Score all articles
+        score = int(generate_text(prompt))
+        return max(0, min(100, score))  # Clamp between 0-100
+    except Exception as e:
+        print(f"Scoring error: {e}")
+        return 50  # Default middle score if error
+
+
+def prefilter(bot, article, seen):
+    """
+    Cheap local checks run before any LLM call (recency is already
+    enforced by the collector).
+
+    Returns:
+        str: Why the article was dropped, or None to score it
+    """
+    if article['link'] in seen:
+        return "duplicate_link"
+    seen.add(article['link'])
+    if bot.tracker.is_processed(article['link']):
+        return "processed"
+    words = len(article['title'].split()) + len(article.get('summary', '').split())
+    hits = article.get('keyword_hits', 1)
+    title_hits = article.get('title_keyword_hits')
+    if title_hits is None:
+        title_hits = sum(match_keywords(article['title']).values())
+    if not title_hits and hits / max(words, 1) < MIN_KEYWORD_DENSITY:
+        return "low_keyword_density"
+    return None
+
+
+def collect_and_score(bot, known_scores=None, stop_after=1, target_score=SCORE_TARGET, budget=SCORE_BUDGET,
+                      prerank_top_n=PRERANK_TOP_N, prerank_window=PRERANK_WINDOW, known_articles=None):
+    """
+    1-2. Collect and score for viral potential (select BEST, not newest) as
+    one pipeline: articles stream from the feeds through prefilter() into a
+    bounded queue, and SCORE_WORKERS scorers consume it while later feeds
+    are still downloading.
+
+    With prerank_top_n, only the best prerank_top_n of every prerank_window
+    new articles (by local score, news_bot.viral_ranker) are queued, so
+    scoring still overlaps collection.
+
+    Collection stops early once stop_after newly scored articles reach
+    target_score (target_score=None never stops early), or after `budget`
+    LLM scoring calls. The run's whole candidate pool - LLM scores, local
+    scores and what was dropped - is recorded in the tracker for tuning the
+    pre-ranker.
+
+    Args:
+        known_scores (dict, optional): link -> score from earlier polls; those
+            articles are not sent to the LLM again and take no pre-rank slot
+        known_articles (list, optional): the articles behind known_scores;
+            they seed the collector's story index, so a known story keeps
+            its known link instead of coming back under another feed's link
+
+    Returns:
+        list: (article, score) for unprocessed articles, highest score first
+    """
+    print("Collecting and scoring articles for viral potential...")
+    run = datetime.now().isoformat(timespec="seconds")
+    known_scores = known_scores if known_scores is not None else {}
+    queue = Queue(maxsize=SCORE_QUEUE_SIZE)
+    enough = threading.Event()
+    lock = threading.Lock()
     articles_with_scores = []
-    for article in articles:
-        # Check if already processed
-        if tracker.is_processed(article['link']):
-            print(f"  Skipping score for processed article: {article['title'][:60].encode('ascii', 'ignore').decode('ascii')}...")
-            continue
-            
-        score = score_viral_potential(article)
-        articles_with_scores.append((article, score))
-        print(f"  '{article['title'][:60].encode('ascii', 'ignore').decode('ascii')}...' -> Score: {score}")
-    
-    if not articles_with_scores:
-        print("All found articles have already been processed. Nothing to do.")
-        return
-
-    # Select the HIGHEST scoring article
-    best_article, best_score = max(articles_with_scores, key=lambda x: x[1])
-    print(f"\nSelected BEST article (Score: {best_score}): {best_article['title'].encode('ascii', 'ignore').decode('ascii')}\n")
-    
-    # 3. Process & Generate Blog for the BEST article
-    processor = NewsProcessor()
-    blog_gen = BlogGenerator()
-    # viral_gen = ViralReelGenerator()  # Removed per user request
-
-    # Process only the BEST article (highest viral score)
-    # UPDATED: Loop through top 3 articles in case the best one is a duplicate
+    llm_calls = [0]
+    hits = [0]
+
+    def score_worker():
+        while True:
+            article = queue.get()
+            if article is None:
+                return
+            if enough.is_set():
+                incr("articles_unscored_early_stop")
+                continue  # Keep draining so the producer never blocks
+
+            with lock:
+                if llm_calls[0] >= budget:
+                    enough.set()
+                    print(f"💸 Scoring budget of {budget} LLM calls reached")
+                    continue
+                llm_calls[0] += 1
+            with span("score"):
+                score = score_viral_potential(article)
+            incr("articles_scored")
+            print(f"  '{_ascii(article['title'][:60])}...' -> Score: {score}")
+
+            with lock:
+                articles_with_scores.append((article, score))
+                if target_score is not None and score >= target_score:
+                    hits[0] += 1
+                reached = target_score is not None and hits[0] >= stop_after
+            if reached and not enough.is_set():
+                enough.set()
+                print(f"🎯 {hits[0]} article(s) scored {target_score}+, stopping collection early")
+
+    seen = set()
+    # Every article that passed the prefilters, in arrival order (recorded below)
+    pool = []
+    reused = []
+
+    def candidates(articles):
+        for article in articles:
+            if enough.is_set():
+                return
+            incr("articles_collected")
+            reason = prefilter(bot, article, seen)
+            if reason:
+                incr(f"prefiltered_{reason}")
+                if reason == "processed":
+                    print(f"  Skipping score for processed article: {_ascii(article['title'][:60])}...")
+                continue
+            pool.append(article)
+            if article['link'] in known_scores:
+                # Scored in an earlier poll: free, so it neither queues nor takes a pre-rank slot
+                reused.append(article)
+                incr("scores_reused")
+                continue
+            yield article
+
+    with span("collect_score"), ThreadPoolExecutor(max_workers=SCORE_WORKERS) as scorers:
+        for _ in range(SCORE_WORKERS):
+            scorers.submit(score_worker)
+        articles = bot.collector.iter_news(hours_back=HOURS_BACK, max_posts_per_feed=MAX_POSTS_PER_FEED,
+                                           known=known_articles)
+        try:
+            source = candidates(articles)
+            if prerank_top_n:
+                from .viral_ranker import prerank_windows  # numpy stays out of the import path
+                source = prerank_windows(source, prerank_window, prerank_top_n)
+            for article in source:
+                if enough.is_set():
+                    break
+                queue.put(article)
+        finally:
+            articles.close()
+            for _ in range(SCORE_WORKERS):
+                queue.put(None)
+
+    articles_with_scores += [(article, known_scores[article['link']]) for article in reused]
+    incr("prerank_dropped", sum(1 for article in pool if article.get('prerank_kept') is False))
+    print(f"Scored {len(articles_with_scores) - len(reused)} of {len(seen)} collected articles "
+          f"({len(reused)} scores reused).")
+    record_pool(bot, run, pool, articles_with_scores, known_scores, {
+        "prerank_top_n": prerank_top_n,
+        "prerank_window": prerank_window if prerank_top_n else None,
+        "target_score": target_score,
+        "budget": budget,
+    })
     articles_with_scores.sort(key=lambda x: x[1], reverse=True)
-    
-    selected_article = None
-    
-    for article, score in articles_with_scores[:3]:
-        print(f"Checking candidate: {article['title'].encode('ascii', 'ignore').decode('ascii')} (Score: {score})")
-        
-        # Check against existing filesystem (Title Similarity)
-        is_dup, existing_file = blog_gen.is_duplicate_title(article['title'])
-        if is_dup:
-             print(f"  SKIP: Similar article already exists: {existing_file}")
-             # Mark as processed so we don't check it again next time
-             tracker.mark_as_processed(article['link'], {'title': article['title'], 'status': 'duplicate_skipped'})
-             continue
-             
-        selected_article = article
-        break
-    
-    if not selected_article:
-        print("All top candidates were duplicates or processed. Sleeping.")
-        return
-
-    for article in [selected_article]:  # Process only the winner
-        print(f"Processing: {article['title'].encode('ascii', 'ignore').decode('ascii')}")
-        
-        # Generates DICT: {'blog_html': ..., 'facebook_msg': ...}
-        content_package = processor.summarize(article)
-        
-        if content_package:
-            # A. Create Blog Post HTML
-            fname, generated_image_url = blog_gen.create_post(
-                article['title'], 
-                content_package['blog_html'], 
-                article['link'],
-                # image_url=article.get('image_url'),
-                image_url=None, # FORCE GENERATION: User selected "Always Generate AI Images"
-                # image_url=article.get('image_url'),
-                tldr_summary=content_package.get('tldr_summary'),
-                editorial_prospect=content_package.get('editorial_prospect'),
-                summary=article.get('summary', '')  # Pass summary for content-aware image gen
-            )
-            
-            # B. Update Index
-            # If create_post generated a new image, use it. Otherwise fall back to what we had.
-            final_image_url = generated_image_url if generated_image_url else article.get('image_url')
-            
-            blog_gen.update_index(
-                article['title'],
-                content_package['tldr_summary'],
-                fname,
-                image_url=final_image_url
-            )
-            
-            # C. Deploy to GitHub
-            is_deployed = blog_gen.deploy_to_github()
-            
-            if not is_deployed:
-                print("GitHub deploy reported failure (might just be 'no changes'), proceeding anyway...")
-            
-            # Generate blog URL for tracking
-            blog_url = f"https://aicorelogic-ops.github.io/ai-core-logic-blogz/blog/posts/{fname}"
-            
-            print(f"✅ Blog post created and deployed: {fname}")
-            print(f"   URL: {blog_url}")
-            print(f"📢 To post to Facebook, run: python -m news_bot.facebook_blog_poster")
-            
-            # D. Track as processed (blog created)
-            tracker.mark_as_processed(article['link'], {
-                'title': article['title'],
-                'blog_path': f"blog/posts/{fname}",
-                'blog_url': blog_url,
-                'processed_date': datetime.now().isoformat()
-            })
-            
-            # Sleep to avoid spamming
-            time.sleep(10)
+    return articles_with_scores
+
+
+def record_pool(bot, run, pool, articles_with_scores, known_scores, mode):
+    """
+    Record a run's candidate pool for scripts/eval_viral_ranker.py: every
+    article with its arrival position, local score, LLM score (if any) and
+    status - scored, reused (score from an earlier poll), prerank_dropped,
+    or unscored (early stop / budget reached first).
+    """
+    scores = {article['link']: score for article, score in articles_with_scores}
+    entries = {}
+    for position, article in enumerate(pool):
+        link = article['link']
+        if link in known_scores:
+            status = "reused"
+        elif link in scores:
+            status = "scored"
+        elif article.get('prerank_kept') is False:
+            status = "prerank_dropped"
         else:
-            print("Failed to process article.")
+            status = "unscored"
+        entries[link] = {
+            'title': article['title'],
+            'summary': article.get('summary', '')[:300],
+            'score': scores.get(link),
+            'local_score': article.get('local_score'),
+            'status': status,
+            'position': position,
+        }
+    bot.tracker.record_scores(entries, run=run, mode=mode)
+
+
+def select_articles(bot, articles_with_scores, top_k=1):
+    """
+    3. Pick the top_k best candidates that aren't already on the blog (or
+    the same story as another pick), skipping past duplicates.
+
+    Returns:
+        list: Up to top_k articles, best first
+    """
+    selected = []
+    with span("dedupe"):
+        for article, score in articles_with_scores[:top_k + MAX_CANDIDATES - 1]:
+            if len(selected) == top_k:
+                break
+            print(f"Checking candidate: {_ascii(article['title'])} (Score: {score})")
+
+            # Check against existing filesystem (Title Similarity)
+            is_dup, existing_file = bot.blog_gen.is_duplicate_title(article['title'])
+            if is_dup:
+                incr("duplicates_skipped")
+                print(f"  SKIP: Similar article already exists: {existing_file}")
+                # Mark as processed so we don't check it again next time
+                bot.tracker.mark_as_processed(article['link'], {'title': article['title'], 'status': 'duplicate_skipped'})
+                continue
+
+            title = article['title'].lower().strip()
+            if any(SequenceMatcher(None, title, other['title'].lower().strip()).ratio() > BATCH_DUPLICATE_THRESHOLD for other in selected):
+                incr("duplicates_skipped")
+                print(f"  SKIP: Same story as another article in this batch")
+                continue
+
+            selected.append(article)
+    return selected
+
+
+def summarize_article(bot, article):
+    """
+    4. Generate the blog content package for one article.
+
+    Streamed: once the blog HTML is in, the image brief (an independent
+    LLM call, cached for create_post) starts while TL;DR/editorial finish.
+
+    Returns:
+        dict: {'blog_html': ..., 'tldr_summary': ..., 'editorial_prospect': ...} or None
+    """
+    print(f"Processing: {_ascii(article['title'])}")
+    started = time.time()
+    prefetch = []
+
+    def on_section(name, value):
+        print(f"   ✍️ {name} ready after {time.time() - started:.1f}s")
+        if name == "blog_html":
+            brief_article = {'title': article['title'], 'summary': article.get('summary', '')}
+            prefetch.append(threading.Thread(target=generate_visual_brief, args=(brief_article,)))
+            prefetch[-1].start()
+
+    with span("summarize"):
+        content_package = bot.processor.summarize(article, stream=True, on_section=on_section)
+        for thread in prefetch:
+            thread.join()
+    return content_package
+
+
+def create_article_post(bot, article, content_package):
+    """
+    5A. Create the blog post HTML (and its hero image).
+
+    Returns:
+        dict: article, content_package, filename and image_url of the post
+    """
+    fname, generated_image_url = bot.blog_gen.create_post(
+        article['title'],
+        content_package['blog_html'],
+        article['link'],
+        # image_url=article.get('image_url'),
+        image_url=None, # FORCE GENERATION: User selected "Always Generate AI Images"
+        tldr_summary=content_package.get('tldr_summary'),
+        editorial_prospect=content_package.get('editorial_prospect'),
+        summary=article.get('summary', '')  # Pass summary for content-aware image gen
+    )
+    # If create_post generated a new image, use it. Otherwise fall back to what we had.
+    return {
+        'article': article,
+        'content_package': content_package,
+        'filename': fname,
+        'image_url': generated_image_url if generated_image_url else article.get('image_url'),
+    }
+
+
+def prepare_article(bot, article):
+    """
+    Stages 4 and 5A for one article (safe to run on a worker thread).
+
+    Returns:
+        dict: The created post (see create_article_post), or None on failure
+    """
+    try:
+        content_package = summarize_article(bot, article)
+        if not content_package:
+            print(f"Failed to process article: {_ascii(article['title'])}")
+            return None
+        return create_article_post(bot, article, content_package)
+    except Exception as e:
+        print(f"❌ Failed to prepare '{_ascii(article['title'])}': {e}")
+        return None
+
+
+def publish_posts(bot, posts):
+    """
+    5B-D. One site rebuild and one deploy for the whole batch, then track
+    every article as processed.
+
+    Returns:
+        list: Filenames of the published posts
+    """
+    blog_gen = bot.blog_gen
+
+    # B. Update Index (rebuilds every page, so once covers the whole batch)
+    last = posts[-1]
+    with span("rebuild"):
+        blog_gen.update_index(
+            last['article']['title'],
+            last['content_package']['tldr_summary'],
+            last['filename'],
+            image_url=last['image_url']
+        )
+
+    # C. Deploy to GitHub
+    with span("deploy"):
+        is_deployed = blog_gen.deploy_to_github()
+
+    if not is_deployed:
+        print("GitHub deploy reported failure (might just be 'no changes'), proceeding anyway...")
+
+    # Reclaim temp_images space without holding up the run
+    StorageManager().collect_in_background()
+
+    for post in posts:
+        article, fname = post['article'], post['filename']
+        # Generate blog URL for tracking
+        blog_url = f"{BLOG_URL}{fname}"
+
+        print(f"✅ Blog post created and deployed: {fname}")
+        print(f"   URL: {blog_url}")
+
+        # D. Track as processed (blog created)
+        bot.tracker.mark_as_processed(article['link'], {
+            'title': article['title'],
+            'blog_path': f"blog/posts/{fname}",
+            'blog_url': blog_url,
+            'processed_date': datetime.now().isoformat()
+        })
+        # The same story from other feeds (collapsed by the collector) is covered too
+        for link in article.get('duplicate_links', []):
+            bot.tracker.mark_as_processed(link, {'title': article['title'], 'status': 'duplicate_skipped', 'duplicate_of': fname})
+        incr("posts_published")
+    print(f"📢 To post to Facebook, run: python -m news_bot.facebook_blog_poster")
+    return [post['filename'] for post in posts]
+
+
+def process_best(bot, articles_with_scores, top_k=PUBLISH_TOP_K, workers=PUBLISH_WORKERS):
+    """
+    Stages 3-5 for the top_k best scored candidates. Summaries, images and
+    post pages are built concurrently (at most `workers` at a time); the
+    rebuild and deploy run once for the batch.
+
+    Returns:
+        str: Run status for the metrics record
+    """
+    articles = select_articles(bot, articles_with_scores, top_k)
+    if not articles:
+        print("All top candidates were duplicates or processed. Sleeping.")
+        return "all_duplicates"
+
+    if len(articles) == 1:
+        posts = [prepare_article(bot, articles[0])]
+    else:
+        print(f"Processing {len(articles)} articles with {min(workers, len(articles))} workers...")
+        # Stage spans inside are summed across workers; "batch" is the wall time
+        with span("batch"), ThreadPoolExecutor(max_workers=min(workers, len(articles))) as pool:
+            posts = list(pool.map(lambda article: prepare_article(bot, article), articles))
+
+    posts = [post for post in posts if post]
+    if not posts:
+        return "failed"
+
+    publish_posts(bot, posts)
+    return "published" if len(posts) == len(articles) else "partial"
+
+
+def run_cycle(bot, top_k=PUBLISH_TOP_K, workers=PUBLISH_WORKERS, calibrate=False):
+    """
+    Args:
+        calibrate (bool): Score every candidate (no pre-ranking, no early
+            stop; SCORE_BUDGET still applies) so the recorded pool gives
+            unbiased data for scripts/eval_viral_ranker.py
+
+    Returns:
+        str: Run status for the metrics record
+    """
+    print("Starting AI Core Logic News Bot...")
+
+    if calibrate:
+        print("📏 Calibration run: scoring every candidate (no pre-ranking, no early stop)")
+        articles_with_scores = collect_and_score(bot, stop_after=top_k, target_score=None, prerank_top_n=0)
+    else:
+        articles_with_scores = collect_and_score(bot, stop_after=top_k)
+    if not articles_with_scores:
+        print("No new unprocessed articles found. Sleeping.")
+        return "no_articles"
+
+    best_article, best_score = articles_with_scores[0]
+    print(f"\nSelected BEST article (Score: {best_score}): {_ascii(best_article['title'])}\n")
+    return process_best(bot, articles_with_scores, top_k, workers)
+
+
+def run_bot(bot=None, top_k=PUBLISH_TOP_K, workers=PUBLISH_WORKERS, calibrate=False):
+    """One collect -> publish cycle, recorded as a line in the run metrics file."""
+    start_run("run_bot")
+    status = "error"
+    try:
+        status = run_cycle(bot or NewsBot(), top_k, workers, calibrate)
+    finally:
+        finish_run(status)
+    return status
 
 if __name__ == "__main__":
-    run_bot()
+    import argparse
+    parser = argparse.ArgumentParser(description="Collect, score and publish the best news articles")
+    parser.add_argument("--top-k", type=int, default=PUBLISH_TOP_K, help="Articles to publish this run (one rebuild + deploy)")
+    parser.add_argument("--workers", type=int, default=PUBLISH_WORKERS, help="Articles prepared in parallel")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="LLM-score every candidate (no pre-rank, no early stop) to tune PRERANK_TOP_N")
+    args = parser.parse_args()
+    run_bot(top_k=args.top_k, workers=args.workers, calibrate=args.calibrate)
@@ -0,0 +1,207 @@
+"""
+Run Metrics
+Per-stage spans and counters for one bot run, appended as a JSON line (plus an optional Prometheus textfile)
+
+Instrumented code calls the module-level span()/incr()/record_cache(); they
+are no-ops unless a run was started, so library callers (scripts, tests,
+the Facebook poster) pay nothing.
+
+    python -m news_bot.metrics [--last 20]   # per-stage averages of recent runs
+"""
+
+from contextlib import nullcontext
+from datetime import datetime
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from .stage_timer import StageTimer
+from .settings import METRICS_FILE, PROMETHEUS_TEXTFILE
+
+PROMETHEUS_PREFIX = "news_bot"
+
+_current = None
+
+
+class RunMetrics:
+    """
+    Timings and counters for a single run. Spans re-entered (or nested) add
+    to the same stage total, like StageTimer; counters are safe to bump from
+    worker threads.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.time()
+        self.timer = StageTimer()
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        return self.timer.stage(name)
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_cache(self, cache, hit):
+        self.incr(f"{cache}_cache_{'hits' if hit else 'misses'}")
+
+    def cache_hit_rates(self):
+        rates = {}
+        for name in self.counters:
+            if name.endswith("_cache_hits") or name.endswith("_cache_misses"):
+                cache = name.rsplit("_cache_", 1)[0]
+                hits = self.counters.get(f"{cache}_cache_hits", 0)
+                total = hits + self.counters.get(f"{cache}_cache_misses", 0)
+                rates[cache] = round(hits / total, 3)
+        return rates
+
+    def to_record(self, status):
+        return {
+            "run": self.name,
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "duration": round(time.time() - self.started, 3),
+            "status": status,
+            "stages": {name: round(seconds, 3) for name, seconds in self.timer.timings.items()},
+            "counters": dict(self.counters),
+            "cache_hit_rates": self.cache_hit_rates(),
+        }
+
+
+def start_run(name="run_bot"):
+    """Begin collecting metrics for a run (replaces any unfinished one)."""
+    global _current
+    _current = RunMetrics(name)
+    return _current
+
+
+def current():
+    return _current
+
+
+def span(name):
+    """Context manager timing a stage of the current run."""
+    return _current.span(name) if _current else nullcontext()
+
+
+def incr(name, value=1):
+    if _current:
+        _current.incr(name, value)
+
+
+def record_cache(cache, hit):
+    if _current:
+        _current.record_cache(cache, hit)
+
+
+def finish_run(status="ok", metrics_file=METRICS_FILE, textfile=PROMETHEUS_TEXTFILE):
+    """
+    End the current run: append its record to metrics_file and, when
+    configured, rewrite the Prometheus textfile.
+
+    Returns:
+        dict: The run record, or None if no run was started
+    """
+    global _current
+    run, _current = _current, None
+    if run is None:
+        return None
+
+    record = run.to_record(status)
+    try:
+        if metrics_file:
+            os.makedirs(os.path.dirname(os.path.abspath(metrics_file)), exist_ok=True)
+            with open(metrics_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        if textfile:
+            write_prometheus(record, textfile)
+    except OSError as e:
+        print(f"⚠️ Could not write run metrics: {e}")
+
+    stages = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in record["stages"].items())
+    print(f"📊 Run {status} in {record['duration']:.1f}s ({stages})")
+    return record
+
+
+def _metric_name(name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name).lower()
+
+
+def prometheus_text(record):
+    """Render a run record in the Prometheus text exposition format."""
+    p = PROMETHEUS_PREFIX
+    run = record["run"]
+    lines = [
+        f"# HELP {p}_last_run_timestamp_seconds Start of the last {run} run.",
+        f"# TYPE {p}_last_run_timestamp_seconds gauge",
+        f'{p}_last_run_timestamp_seconds{{run="{run}"}} {datetime.fromisoformat(record["started"]).timestamp():.0f}',
+        f"# HELP {p}_last_run_success 1 if the last run did not raise.",
+        f"# TYPE {p}_last_run_success gauge",
+        f'{p}_last_run_success{{run="{run}",status="{record["status"]}"}} {0 if record["status"] == "error" else 1}',
+        f"# HELP {p}_run_duration_seconds Wall time of the last run.",
+        f"# TYPE {p}_run_duration_seconds gauge",
+        f'{p}_run_duration_seconds{{run="{run}"}} {record["duration"]}',
+        f"# HELP {p}_stage_duration_seconds Wall time per stage of the last run.",
+        f"# TYPE {p}_stage_duration_seconds gauge",
+    ]
+    lines += [f'{p}_stage_duration_seconds{{run="{run}",stage="{stage}"}} {seconds}' for stage, seconds in record["stages"].items()]
+    for name, value in sorted(record["counters"].items()):
+        metric = f"{p}_{_metric_name(name)}"
+        lines += [f"# TYPE {metric} gauge", f'{metric}{{run="{run}"}} {value}']
+    if record["cache_hit_rates"]:
+        lines += [f"# HELP {p}_cache_hit_ratio Cache hit ratio over the last run.", f"# TYPE {p}_cache_hit_ratio gauge"]
+        lines += [f'{p}_cache_hit_ratio{{run="{run}",cache="{cache}"}} {rate}' for cache, rate in record["cache_hit_rates"].items()]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(record, path):
+    """Atomically replace a node_exporter textfile-collector file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(prometheus_text(record))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_runs(metrics_file=METRICS_FILE, last=None):
+    try:
+        with open(metrics_file, "r", encoding="utf-8") as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+    return runs[-last:] if last else runs
+
+
+def summarize(runs):
+    """Mean seconds per stage across runs (stages a run skipped are not counted)."""
+    totals = {}
+    for run in runs:
+        for stage, seconds in run["stages"].items():
+            total, count = totals.get(stage, (0.0, 0))
+            totals[stage] = (total + seconds, count + 1)
+    return {stage: round(total / count, 3) for stage, (total, count) in totals.items()}
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarize recent run metrics")
+    parser.add_argument("--file", default=METRICS_FILE)
+    parser.add_argument("--last", type=int, default=20)
+    args = parser.parse_args()
+
+    runs = load_runs(args.file, args.last)
+    if not runs:
+        print(f"No runs recorded in {args.file}")
+    else:
+        print(f"📊 Last {len(runs)} runs, mean seconds per stage:")
+        for stage, seconds in summarize(runs).items():
+            print(f"   {stage:<12} {seconds:>8.2f}")
+        durations = [run["duration"] for run in runs]
+        print(f"   {'total':<12} {sum(durations) / len(durations):>8.2f}")
@@ -0,0 +1,349 @@
+"""
+Near-Duplicate Detection
+MinHash signatures + LSH buckets over title and body shingles, for archive dedup at 10k+ posts,
+plus URL canonicalization and SimHash title fingerprints for collapsing the same story across feeds
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import zlib
+import numpy as np
+
+NUM_PERM = 128
+# 32 bands x 4 rows: pairs with Jaccard >= ~0.42 almost always share a bucket
+LSH_BANDS = 32
+
+# Posts already shared on Facebook (filename -> post info); never removed
+POSTED_TRACKER = Path(__file__).parent / 'posted_to_facebook.json'
+
+# Removed posts are moved here (outside the published blog), never deleted outright
+TRASH_DIR = Path(__file__).parent.parent / '.dedup_trash'
+
+TITLE_THRESHOLD = 0.6  # Jaccard of title words + word pairs
+BODY_THRESHOLD = 0.5   # Jaccard of body word 3-grams
+
+SIMHASH_BITS = 64
+# Title fingerprints this close are checked with exact Jaccard; rewordings
+# of one headline land around 4-13 bits apart, unrelated titles 24+
+SIMHASH_DISTANCE = 18
+
+# Query parameters that only track the click, never select the content
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid", "guccounter", "_hsenc", "_hsmi"}
+
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+TITLE_PATTERN = re.compile(r"<h1[^>]*>(.*?)</h1>|<title>(.*?)(?: \| [^<]*)?</title>", re.DOTALL)
+BODY_PATTERN = re.compile(r'<div class="article-body"[^>]*>(.*?)(?:</div>\s*<hr|$)', re.DOTALL)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+
+def normalize(text):
+    return " ".join(WORD_PATTERN.findall(html.unescape(text or "").lower()))
+
+
+def word_shingles(text, size=3):
+    words = normalize(text).split()
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def title_shingles(text):
+    """Words plus adjacent word pairs - robust to one changed or added word."""
+    words = normalize(text).split()
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def canonical_url(url):
+    """
+    Normalize an article URL so the same page compares equal: lowercase
+    scheme and host, no "www.", default port, fragment, utm_* or other
+    tracking parameters, or trailing slash; remaining parameters sorted.
+    """
+    parts = urlsplit((url or "").strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((parts.scheme.lower() or "https", host, parts.path.rstrip("/"), urlencode(query), ""))
+
+
+def simhash(shingles, bits=SIMHASH_BITS):
+    """SimHash fingerprint (int) of a shingle set: similar sets differ in few bits."""
+    weights = [0] * bits
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=bits // 8).digest(), "big")
+        for bit in range(bits):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class StoryIndex:
+    """
+    Recognizes articles already seen in this collection: the same canonical
+    URL, or a title whose SimHash is within max_distance bits and whose
+    title Jaccard clears title_threshold.
+    """
+
+    def __init__(self, max_distance=SIMHASH_DISTANCE, title_threshold=TITLE_THRESHOLD):
+        self.max_distance = max_distance
+        self.title_threshold = title_threshold
+        self.by_url = {}
+        self.fingerprints = []  # (fingerprint, title shingles, article)
+
+    def add(self, article):
+        """
+        Returns:
+            dict: The earlier article this one duplicates, or None if it is
+                  new (it then becomes the representative for its story)
+        """
+        url = canonical_url(article['link'])
+        if url in self.by_url:
+            return self.by_url[url]
+
+        shingles = title_shingles(article['title'])
+        fingerprint = simhash(shingles)
+        for other_fingerprint, other_shingles, other in self.fingerprints:
+            if hamming(fingerprint, other_fingerprint) <= self.max_distance and jaccard(shingles, other_shingles) >= self.title_threshold:
+                self.by_url[url] = other
+                return other
+
+        self.by_url[url] = article
+        if shingles:
+            self.fingerprints.append((fingerprint, shingles, article))
+        return None
+
+
+class MinHasher:
+    """
+    Fixed random permutations, so signatures are comparable across runs.
+
+    Permutations use multiply-shift hashing: (a * x + b) mod 2^64, top 32
+    bits. uint64 arithmetic wraps in numpy, so there is no modulo to pay for.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=42):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(0, 1 << 62, size=num_perm, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+        self.b = rng.randint(0, 1 << 62, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def signature(self, shingles):
+        """MinHash signature (uint64 array of num_perm) of a shingle set."""
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        x = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        return ((self.a[:, None] * x[None, :] + self.b[:, None]) >> np.uint64(32)).min(axis=1)
+
+
+class LSHIndex:
+    """Band the signatures; documents sharing any band bucket become candidate pairs."""
+
+    def __init__(self, num_perm=NUM_PERM, bands=LSH_BANDS):
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = defaultdict(list)
+
+    def add(self, key, signature):
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            self.buckets[(band, chunk.tobytes())].append(key)
+
+    def candidate_groups(self):
+        """Buckets holding more than one document."""
+        return [keys for keys in self.buckets.values() if len(keys) > 1]
+
+
+def load_post(path):
+    """
+    Cheap regex extraction of a post's title and body text (no HTML parser,
+    so scanning 10k posts stays fast).
+
+    Returns:
+        dict: key, path, title, body, size, modified
+    """
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        content = f.read()
+    title_match = TITLE_PATTERN.search(content)
+    title = (title_match.group(1) or title_match.group(2)) if title_match else ""
+    body_match = BODY_PATTERN.search(content)
+    body = TAG_PATTERN.sub(" ", body_match.group(1) if body_match else content)
+    stat = os.stat(path)
+    return {
+        "key": os.path.basename(path),
+        "path": path,
+        "title": " ".join(TAG_PATTERN.sub(" ", title).split()),
+        "body": body,
+        "size": stat.st_size,
+        "modified": stat.st_mtime,
+    }
+
+
+def load_posts(posts_dir):
+    paths = sorted(os.path.join(posts_dir, f) for f in os.listdir(posts_dir) if f.endswith(".html"))
+    return [load_post(path) for path in paths]
+
+
+def find_clusters(docs, title_threshold=TITLE_THRESHOLD, body_threshold=BODY_THRESHOLD, hasher=None):
+    """
+    Group near-duplicate documents.
+
+    Candidates come from LSH over separate title and body signatures, then
+    each candidate pair is verified with exact Jaccard similarity. A pair
+    is a duplicate if either score clears its threshold.
+
+    Args:
+        docs (list): Dicts with at least key, title and body
+
+    Returns:
+        list: Clusters (largest first) as dicts with "keys" and "pairs";
+              each pair is (key_a, key_b, title_similarity, body_similarity)
+    """
+    hasher = hasher or MinHasher()
+    title_index = LSHIndex(hasher.num_perm)
+    body_index = LSHIndex(hasher.num_perm)
+    title_sets = {}
+    body_sets = {}
+
+    for doc in docs:
+        key = doc["key"]
+        title_sets[key] = title_shingles(doc["title"])
+        body_sets[key] = word_shingles(doc.get("body", ""))
+        if title_sets[key]:
+            title_index.add(key, hasher.signature(title_sets[key]))
+        if body_sets[key]:
+            body_index.add(key, hasher.signature(body_sets[key]))
+
+    parent = {doc["key"]: doc["key"] for doc in docs}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    # Verify candidates bucket by bucket against one representative per
+    # cluster already in the bucket, so n copies of a post cost ~n checks, not n^2.
+    matches = []
+    checked = set()
+    for keys in title_index.candidate_groups() + body_index.candidate_groups():
+        reps = []
+        for key in keys:
+            for rep in reps:
+                if find(rep) == find(key):
+                    break
+                if (rep, key) in checked:
+                    continue
+                checked.add((rep, key))
+                title_sim = jaccard(title_sets[rep], title_sets[key])
+                body_sim = jaccard(body_sets[rep], body_sets[key])
+                if title_sim >= title_threshold or body_sim >= body_threshold:
+                    matches.append((rep, key, round(title_sim, 3), round(body_sim, 3)))
+                    parent[find(key)] = find(rep)
+                    break
+            else:
+                reps.append(key)
+
+    clusters = defaultdict(lambda: {"keys": [], "pairs": []})
+    for doc in docs:
+        members = clusters[find(doc["key"])]
+        members["keys"].append(doc["key"])
+    for match in matches:
+        clusters[find(match[0])]["pairs"].append(match)
+
+    result = [c for c in clusters.values() if len(c["keys"]) > 1]
+    result.sort(key=lambda c: (-len(c["keys"]), c["keys"][0]))
+    return result
+
+
+def posted_keys(tracking_file=POSTED_TRACKER):
+    """Filenames of posts that have been shared on Facebook."""
+    try:
+        with open(tracking_file, "r", encoding="utf-8") as f:
+            return set(json.load(f))
+    except (FileNotFoundError, ValueError):
+        return set()
+
+
+def largest_first(doc):
+    """Default keep policy: the most complete (largest) file, then the newest."""
+    return (doc["size"], doc["modified"])
+
+
+def plan_deletions(clusters, docs, keep_policy=largest_first, protected=()):
+    """
+    Decide which file of each cluster to keep.
+
+    Protected keys (e.g. posts already shared on Facebook) are always kept.
+
+    Returns:
+        list: One entry per cluster: {"keep": key, "delete": [keys], "pairs": [...]}
+    """
+    by_key = {doc["key"]: doc for doc in docs}
+    protected = set(protected)
+    plan = []
+    for cluster in clusters:
+        members = sorted(cluster["keys"], key=lambda k: keep_policy(by_key[k]), reverse=True)
+        keep = next((k for k in members if k in protected), members[0])
+        delete = [k for k in members if k != keep and k not in protected]
+        if delete:
+            plan.append({"keep": keep, "delete": delete, "pairs": cluster["pairs"]})
+    return plan
+
+
+def print_plan(plan, docs):
+    by_key = {doc["key"]: doc for doc in docs}
+    for entry in plan:
+        keep = by_key[entry["keep"]]
+        print(f"\n📄 {keep['title'][:80]}")
+        print(f"   ✅ KEEP:   {keep['key']} ({keep['size']} bytes)")
+        for key in entry["delete"]:
+            print(f"   🗑️ DELETE: {key} ({by_key[key]['size']} bytes)")
+        for a, b, title_sim, body_sim in entry["pairs"]:
+            print(f"      {a} ~ {b}: title {title_sim:.2f}, body {body_sim:.2f}")
+    print(f"\n📊 {len(plan)} clusters, {sum(len(e['delete']) for e in plan)} files to remove")
+
+
+def apply_plan(plan, posts_dir, trash_dir=None):
+    """
+    Move planned files into a timestamped trash folder (not os.remove), and
+    write the plan next to them so a cleanup can be reviewed or undone.
+
+    Returns:
+        str: The trash folder
+    """
+    trash_dir = trash_dir or os.path.join(TRASH_DIR, datetime.now().strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(trash_dir, exist_ok=True)
+    with open(os.path.join(trash_dir, "plan.json"), "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2)
+    for entry in plan:
+        for key in entry["delete"]:
+            source = os.path.join(posts_dir, key)
+            if os.path.exists(source):
+                shutil.move(source, os.path.join(trash_dir, key))
+                print(f"   Moved {key} -> {trash_dir}")
+    return trash_dir
@@ -1,148 +1,234 @@
 import os
-import google.generativeai as genai
+import json
 import traceback
 from .settings import GOOGLE_API_KEY
+from .gemini_client import generate, record_usage
 
 if not GOOGLE_API_KEY:
     print("Warning: GOOGLE_API_KEY is not set.")
 
-# Configure Gemini
-try:
-    genai.configure(api_key=GOOGLE_API_KEY)
-    model = genai.GenerativeModel('gemini-flash-latest')
-except Exception as e:
-    print(f"Error configuring Gemini: {e}")
-    model = None
+# Separator between the blog HTML, TL;DR and editorial in delimiter mode
+SECTION_DELIMITER = "|||||"
+SECTIONS = ("blog_html", "tldr", "editorial_prospect")
+
+DEFAULT_EDITORIAL = "We analyze the intersection of logistics, automation, and AI to deliver actionable insights for modern businesses. No hype, just practical strategy."
+DEFAULT_TLDR = "Key insights and actionable takeaways to stay ahead in the AI landscape."
+
+DELIMITER_FORMAT = """
+    CRITICAL RETURN FORMAT:
+    - Separate outputs with EXACT delimiter: "|||||"
+    - First part = HTML blog
+    - Second part = TL;DR bullet points
+    - Third part = Editorial Prospect text
+    """
+
+JSON_FORMAT = """
+    CRITICAL RETURN FORMAT:
+    Return ONLY a JSON object with exactly these keys:
+    {"blog_html": "<HTML blog post>", "tldr": ["bullet 1", "bullet 2", "bullet 3"], "editorial_prospect": "<editorial text>"}
+    """
+
+
+def build_prompt(article, json_mode=False):
+    """Copywriting prompt for an article; json_mode asks for a JSON object instead of delimiters."""
+    return _content_specs(article) + (JSON_FORMAT if json_mode else DELIMITER_FORMAT)
+
+
+def _content_specs(article):
+    return f"""
+    You are a Direct Response Copywriter for 'AI Core Logic' - writing in the style of Sabri Suby.
+    
+    Input:
+    Title: {article['title']}
+    Summary: {article['summary']}
+    
+    CORE PRINCIPLES:
+    - HIGH-READABILITY: Structure for scanners first. Most important info at the TOP.
+    - HIGH-AROUSAL EMOTION: Evoke awe, anxiety, or anger to drive virality.
+    - NO FLUFF: One idea per sentence. 6th grade reading level.
+    - MOBILE-FIRST: Paragraphs must be 1-3 sentences max.
+    
+    Task: Create TWO outputs in a strictly formatted way.
+    
+    Output 1: A BLOG POST (HTML Format)
+    **STRUCTURE SPECS:**
+    
+    1. **PATTERN INTERRUPT HOOK**: Start with a shocking statement or number.
+    
+    2. **PPT INTRO (Preview, Proof, Transition)**:
+       - PREVIEW: What is this post about?
+       - PROOF: Why should they listen? (Expertise/Data)
+       - TRANSITION: Move them into the body content.
+       
+    3. **INVERTED PYRAMID**: Put the "Who, What, When, Where, Why" in the first 2 paragraphs.
+    
+    4. **LAYER-CAKE SCANNING**:
+       - Use BOLD and DESCRIPTIVE H2/H3 headers.
+       - Use BULLET POINTS (<ul><li>) for key data.
+       - NO generic headers like "Introduction" or "Conclusion".
+       
+    5. **SABRI SUBY STYLE**: 80% agitation of pain/desire, 20% solution.
+    
+    6. **TAC CONCLUSION (Transition, Ask, Call to Action)**:
+       - TRANSITION: Signal the end of the content (Natural flow, NO labels).
+       - ASK: Ask a specific question to encourage reflection.
+       - CALL TO ACTION: Direct them to "Contact AI Core Logic for a strategy audit" or "Follow for more updates."
+       - **CRITICAL**: Do NOT offer downloads, whitepapers, or PDF guides. We do not have them.
+       - **CRITICAL**: Do NOT use labels like "TRANSITION:", "ASK:", or "CALL TO ACTION:" in the output. Just write the text.
+    
+    **CONTENT RULES**:
+    - Use H2 for major segments and H3 for sub-points.
+    - Keep paragraphs 1-3 sentences for mobile readability.
+    - Take a strong stance. Be opinionated.
+    
+    Output 2: A TL;DR SUMMARY (2-3 Bullet Points)
+    **PURPOSE**: Distill the entire article into actionable key takeaways
+    
+    **FORMAT**:
+    - Exactly 2-3 bullet points
+    - Each bullet should be ONE sentence (15-20 words max)
+    - Focus on ACTIONABLE insights or shocking facts
+    - Use plain text (no markdown symbols like • or -)
+    
+    Output 3: EDITORIAL PROSPECT (Unique Insight)
+    **PURPOSE**: A short, punchy opinion/take on why this matters (for the author bio section)
+    
+    **FORMAT**:
+    - A 2-3 sentence paragraph (50-70 words)
+    - Written in a "no-nonsense, insider" voice
+    - Explain the "Real Truth" or "Hidden Implication" of this news
+    - Start with a strong hook like "Let's be real," "Here's the thing," or "The bottom line is"
+    """
+
+
+def _format_tldr(tldr_raw):
+    """
+    Turn raw TL;DR text (one bullet per line) or a list of bullets into the
+    HTML bullet list used in the post's quick-summary box.
+    """
+    if isinstance(tldr_raw, list):
+        bullets = [str(b).strip() for b in tldr_raw if str(b).strip()]
+    else:
+        # Clean up labels
+        tldr_raw = (tldr_raw or "").replace('**OUTPUT 2:**', '').replace('OUTPUT 2:', '')
+        tldr_raw = tldr_raw.replace('**TL;DR:**', '').replace('TL;DR:', '').strip()
+        bullets = [line.strip() for line in tldr_raw.split('\n') if line.strip()]
+
+    if not bullets:
+        return DEFAULT_TLDR
+
+    tldr_html = "<ul style='margin: 0; padding-left: 1.5rem; line-height: 1.8;'>"
+    for bullet in bullets:
+        tldr_html += f"<li style='margin-bottom: 0.75rem;'>{bullet}</li>"
+    tldr_html += "</ul>"
+    return tldr_html
+
+
+def _finish_section(name, text):
+    """Post-process one raw section into its final value."""
+    if name == "tldr":
+        return _format_tldr(text)
+    if name == "editorial_prospect":
+        return text.strip() or DEFAULT_EDITORIAL
+    return text.strip()
+
+
+class SectionStreamParser:
+    """
+    Incremental parser for delimiter-separated output.
+
+    feed() takes text chunks as they stream in; each section is finished
+    (and on_section(name, value) called) as soon as the delimiter after it
+    arrives, so callers can act on the blog HTML while the TL;DR and
+    editorial are still being generated.
+    """
+
+    def __init__(self, on_section=None):
+        self.on_section = on_section
+        self.sections = {}
+        self.raw = []
+        self._buffer = ""
+
+    def _emit(self, text):
+        index = len(self.sections)
+        if index >= len(SECTIONS):
+            # Extra delimiters (e.g. a trailing one): drop what follows, as the
+            # old split-based parser did; the last section was already emitted
+            return
+        name = SECTIONS[index]
+        self.raw.append(text)
+        self.sections[name] = _finish_section(name, text)
+        if self.on_section:
+            self.on_section(name, self.sections[name])
+
+    def feed(self, chunk):
+        self._buffer += chunk
+        while SECTION_DELIMITER in self._buffer:
+            section, self._buffer = self._buffer.split(SECTION_DELIMITER, 1)
+            self._emit(section)
+
+    def close(self):
+        """Finish the last section. Returns True if the delimiter format was followed."""
+        self._emit(self._buffer)
+        self._buffer = ""
+        return len(self.raw) > 1
+
 
 class NewsProcessor:
-    def summarize(self, article):
+    def summarize(self, article, stream=False, on_section=None, json_mode=False):
         """
         Takes an article dict and returns a DICT with:
         - 'blog_html': Full HTML analysis for the website.
         - 'facebook_msg': Short teaser for social media.
+        - 'tldr_summary': TL;DR as an HTML bullet list.
+        - 'editorial_prospect': Editorial take for the author bio.
+
+        Args:
+            stream (bool): Consume the response incrementally; sections are
+                finished as soon as their delimiter arrives
+            on_section (callable): on_section(name, value) for each finished
+                section ('blog_html', 'tldr', 'editorial_prospect')
+            json_mode (bool): Ask for a JSON object instead of delimiters
         """
-        if not model:
-            print("Skipping summarization: Gemini model not initialized.")
+        if not GOOGLE_API_KEY:
+            print("Skipping summarization: GOOGLE_API_KEY is not set.")
             return None
 
-        prompt = f"""
-        You are a Direct Response Copywriter for 'AI Core Logic' - writing in the style of Sabri Suby.
-        
-        Input:
-        Title: {article['title']}
-        Summary: {article['summary']}
-        
-        CORE PRINCIPLES:
-        - HIGH-READABILITY: Structure for scanners first. Most important info at the TOP.
-        - HIGH-AROUSAL EMOTION: Evoke awe, anxiety, or anger to drive virality.
-        - NO FLUFF: One idea per sentence. 6th grade reading level.
-        - MOBILE-FIRST: Paragraphs must be 1-3 sentences max.
-        
-        Task: Create TWO outputs in a strictly formatted way.
-        
-        Output 1: A BLOG POST (HTML Format)
-        **STRUCTURE SPECS:**
-        
-        1. **PATTERN INTERRUPT HOOK**: Start with a shocking statement or number.
-        
-        2. **PPT INTRO (Preview, Proof, Transition)**:
-           - PREVIEW: What is this post about?
-           - PROOF: Why should they listen? (Expertise/Data)
-           - TRANSITION: Move them into the body content.
-           
-        3. **INVERTED PYRAMID**: Put the "Who, What, When, Where, Why" in the first 2 paragraphs.
-        
-        4. **LAYER-CAKE SCANNING**:
-           - Use BOLD and DESCRIPTIVE H2/H3 headers.
-           - Use BULLET POINTS (<ul><li>) for key data.
-           - NO generic headers like "Introduction" or "Conclusion".
-           
-        5. **SABRI SUBY STYLE**: 80% agitation of pain/desire, 20% solution.
-        
-        6. **TAC CONCLUSION (Transition, Ask, Call to Action)**:
-           - TRANSITION: Signal the end of the content (Natural flow, NO labels).
-           - ASK: Ask a specific question to encourage reflection.
-           - CALL TO ACTION: Direct them to "Contact AI Core Logic for a strategy audit" or "Follow for more updates."
-           - **CRITICAL**: Do NOT offer downloads, whitepapers, or PDF guides. We do not have them.
-           - **CRITICAL**: Do NOT use labels like "TRANSITION:", "ASK:", or "CALL TO ACTION:" in the output. Just write the text.
-        
-        **CONTENT RULES**:
-        - Use H2 for major segments and H3 for sub-points.
-        - Keep paragraphs 1-3 sentences for mobile readability.
-        - Take a strong stance. Be opinionated.
-        
-        Output 2: A TL;DR SUMMARY (2-3 Bullet Points)
-        **PURPOSE**: Distill the entire article into actionable key takeaways
-        
-        **FORMAT**:
-        - Exactly 2-3 bullet points
-        - Each bullet should be ONE sentence (15-20 words max)
-        - Focus on ACTIONABLE insights or shocking facts
-        - Use plain text (no markdown symbols like • or -)
-        
-        Output 3: EDITORIAL PROSPECT (Unique Insight)
-        **PURPOSE**: A short, punchy opinion/take on why this matters (for the author bio section)
-        
-        **FORMAT**:
-        - A 2-3 sentence paragraph (50-70 words)
-        - Written in a "no-nonsense, insider" voice
-        - Explain the "Real Truth" or "Hidden Implication" of this news
-        - Start with a strong hook like "Let's be real," "Here's the thing," or "The bottom line is"
-        
-        CRITICAL RETURN FORMAT:
-        - Separate outputs with EXACT delimiter: "|||||"
-        - First part = HTML blog
-        - Second part = TL;DR bullet points
-        - Third part = Editorial Prospect text
-        """
+        prompt = build_prompt(article, json_mode=json_mode)
 
         try:
-            response = model.generate_content(prompt)
-            text = response.text.strip()
-            
-            # Split the response
-            if "|||||" in text:
-                parts = text.split("|||||")
-                blog_html = parts[0].strip()
-                tldr_raw = parts[1].strip() if len(parts) > 1 else ""
-                editorial_prospect = parts[2].strip() if len(parts) > 2 else "We analyze the intersection of logistics, automation, and AI to deliver actionable insights for modern businesses. No hype, just practical strategy."
-                
-                # Facebook msg is no longer generated here
-                facebook_msg = ""
-
-                
-                # Process TL;DR - format as HTML bullet list
-                tldr_html = ""
-                if tldr_raw:
-                    # Clean up labels
-                    tldr_raw = tldr_raw.replace('**OUTPUT 2:**', '').replace('OUTPUT 2:', '')
-                    tldr_raw = tldr_raw.replace('**TL;DR:**', '').replace('TL;DR:', '').strip()
-                    
-                    # Split into bullets and format
-                    bullets = [line.strip() for line in tldr_raw.split('\n') if line.strip()]
-                    if bullets:
-                        tldr_html = "<ul style='margin: 0; padding-left: 1.5rem; line-height: 1.8;'>" 
-                        for bullet in bullets:
-                            tldr_html += f"<li style='margin-bottom: 0.75rem;'>{bullet}</li>"
-                        tldr_html += "</ul>"
-                
-                if not tldr_html:
-                    # Fallback
-                    tldr_html = "Key insights and actionable takeaways to stay ahead in the AI landscape."
-                
-                return {
-                    "blog_html": blog_html,
-                    "facebook_msg": facebook_msg,
-                    "tldr_summary": tldr_html,
-                    "editorial_prospect": editorial_prospect
-                }
+            if json_mode:
+                sections = self._generate_json(prompt)
+                if on_section:
+                    for name in SECTIONS:
+                        on_section(name, sections[name])
             else:
-                # Fallback if AI forgets delimiter
-                return {
-                    "blog_html": f"<p>{text}</p>",
-                    "facebook_msg": "New AI Update! Check our blog. [LINK]",
-                    "tldr_summary": "Key insights from this AI development."
-                }
+                parser = SectionStreamParser(on_section)
+                if stream:
+                    chunk = None
+                    for chunk in generate(prompt, stream=True):
+                        parser.feed(chunk.text)
+                    record_usage(chunk)  # The final chunk carries the totals
+                else:
+                    parser.feed(generate(prompt).text.strip())
+
+                if not parser.close():
+                    # Fallback if AI forgets delimiter
+                    text = parser.raw[0].strip()
+                    return {
+                        "blog_html": f"<p>{text}</p>",
+                        "facebook_msg": "New AI Update! Check our blog. [LINK]",
+                        "tldr_summary": "Key insights from this AI development."
+                    }
+                sections = parser.sections
+
+            return {
+                "blog_html": sections["blog_html"],
+                # Facebook msg is no longer generated here
+                "facebook_msg": "",
+                "tldr_summary": sections.get("tldr", DEFAULT_TLDR),
+                "editorial_prospect": sections.get("editorial_prospect", DEFAULT_EDITORIAL)
+            }
 
         except Exception as e:
             print(f"Error generating summary with Gemini: {e}")
@@ -150,6 +236,12 @@ class NewsProcessor:
                 traceback.print_exc(file=panic_log)
             return None
 
+    def _generate_json(self, prompt):
+        """Structured output: no delimiter parsing, no fallback path."""
+        response = generate(prompt, generation_config={"response_mime_type": "application/json"})
+        data = json.loads(response.text)
+        return {name: _finish_section(name, data.get(name) or "") for name in SECTIONS}
+
 if __name__ == "__main__":
     # Test run
     processor = NewsProcessor()
@@ -1,10 +1,12 @@
 from moviepy.editor import *
 from PIL import Image, ImageDraw, ImageFont
-import requests
-from io import BytesIO
 import os
+import shutil
 import textwrap
 import numpy as np
+from .reel_workspace import ReelWorkspace
+from .stage_timer import StageTimer
+from .article_parser import parse_blog_html, NUMBER_PATTERN
 
 class ReelGenerator:
     def __init__(self):
@@ -12,102 +14,138 @@ class ReelGenerator:
         self.height = 1920
         self.fps = 30
         
+        # Encoder settings (overridable, e.g. by scripts/bench_reels.py)
+        self.output_dir = os.path.join("blog", "reels")
+        self.codec = 'libx264'
+        self.preset = 'medium'
+        self.ffmpeg_params = None
+        self.encode_logger = 'bar'
+        
+        # Per-stage timings of the last build
+        self.timer = StageTimer()
+        
     def create_reel(self, article, blog_html, image_url):
         """Generate a 15-30 second vertical reel from blog content"""
         
+        self.timer.reset()
         try:
-            print("🎬 Generating reel...")
-            
-            # Extract content for slides
-            hook = self._extract_hook(article['title'], blog_html)
-            pain_points = self._extract_pain_points(blog_html)
-            solution = self._extract_solution(blog_html)
-            
-            # Download viral image to use as background
-            viral_image_path = self._download_image(image_url) if image_url else None
-            
-            # Create slides with image backgrounds
-            slides = []
-            
-            # Slide 1: Hook with dramatic image background (3 seconds)
-            slides.append(self._create_image_text_slide(
-                hook,
-                duration=3,
-                image_path=viral_image_path,
-                text_color=(255, 50, 50),  # Red
-                font_size=80,
-                emoji="💣",
-                darken=0.6  # Darken image for text readability
-            ))
-            
-            # Slides 2-4: Pain points with image backgrounds (2 seconds each)
-            for i, pain in enumerate(pain_points[:3]):
-                slides.append(self._create_image_text_slide(
-                    pain,
-                    duration=2,
-                    image_path=viral_image_path,
-                    text_color=(255, 220, 100),  # Orange/yellow
-                    font_size=65,
-                    emoji=["⚠️", "💰", "⏰"][i],  # Different emoji per slide
-                    darken=0.7
-                ))
-            
-            # Slide 5: Solution with image (3 seconds)
-            slides.append(self._create_image_text_slide(
-                solution,
-                duration=3,
-                image_path=viral_image_path,
-                text_color=(100, 255, 150),  # Green
-                font_size=70,
-                emoji="✅",
-                darken=0.65
-            ))
-            
-            # Slide 6: CTA with dark overlay (2 seconds)
+            with ReelWorkspace() as workspace:
+                return self._render_reel(article, blog_html, image_url, workspace)
+        except Exception as e:
+            import traceback
+            print(f"❌ Reel generation error: {e}")
+            traceback.print_exc()
+            return None
+    
+    def _render_reel(self, article, blog_html, image_url, workspace):
+        """Build and encode the reel inside a job workspace"""
+        print("🎬 Generating reel...")
+        
+        # Extract content for slides
+        hook = self._extract_hook(article['title'], blog_html)
+        pain_points = self._extract_pain_points(blog_html)
+        solution = self._extract_solution(blog_html)
+        
+        # Download viral image (kept in memory) to use as background
+        with self.timer.stage("background"):
+            background = self._download_image(image_url, workspace) if image_url else None
+        
+        # Create slides with image backgrounds
+        slides = []
+        
+        # Slide 1: Hook with dramatic image background (3 seconds)
+        slides.append(self._create_image_text_slide(
+            hook,
+            duration=3,
+            background=background,
+            text_color=(255, 50, 50),  # Red
+            font_size=80,
+            emoji="💣",
+            darken=0.6  # Darken image for text readability
+        ))
+        
+        # Slides 2-4: Pain points with image backgrounds (2 seconds each)
+        for i, pain in enumerate(pain_points[:3]):
             slides.append(self._create_image_text_slide(
-                "Full story in bio 👆\n\nAI.Core Logic",
+                pain,
                 duration=2,
-                image_path=viral_image_path,
-                text_color=(255, 255, 255),  # White
-                font_size=75,
-                darken=0.8  # Very dark for emphasis
+                background=background,
+                text_color=(255, 220, 100),  # Orange/yellow
+                font_size=65,
+                emoji=["⚠️", "💰", "⏰"][i],  # Different emoji per slide
+                darken=0.7
             ))
-            
-            # Concatenate all slides
+        
+        # Slide 5: Solution with image (3 seconds)
+        slides.append(self._create_image_text_slide(
+            solution,
+            duration=3,
+            background=background,
+            text_color=(100, 255, 150),  # Green
+            font_size=70,
+            emoji="✅",
+            darken=0.65
+        ))
+        
+        # Slide 6: CTA with dark overlay (2 seconds)
+        slides.append(self._create_image_text_slide(
+            "Full story in bio 👆\n\nAI.Core Logic",
+            duration=2,
+            background=background,
+            text_color=(255, 255, 255),  # White
+            font_size=75,
+            darken=0.8  # Very dark for emphasis
+        ))
+        
+        # Concatenate all slides
+        with self.timer.stage("assembly"):
             final_video = concatenate_videoclips(slides, method="compose")
-            
-            # Export
-            output_path = os.path.join("blog", "reels", f"{article['title'][:30].replace(' ', '_').replace('/', '_')}.mp4")
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
+        
+        # Export
+        output_path = os.path.join(self.output_dir, f"{article['title'][:30].replace(' ', '_').replace('/', '_')}.mp4")
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        
+        # Render inside the workspace, then move into place in one step so
+        # parallel jobs never see (or clobber) a half-written file
+        scratch_path = workspace.path("reel.mp4")
+        with self.timer.stage("encode"):
             final_video.write_videofile(
-                output_path,
+                scratch_path,
                 fps=self.fps,
-                codec='libx264',
+                codec=self.codec,
                 audio=False,  # No audio for now (can add later)
-                preset='medium'
+                preset=self.preset,
+                ffmpeg_params=self.ffmpeg_params,
+                logger=self.encode_logger
             )
-            
-            print(f"✅ Reel created: {output_path}")
-            
-            # Cleanup temp image
-            if viral_image_path and os.path.exists(viral_image_path):
-                os.remove(viral_image_path)
-            
-            return output_path
-            
-        except Exception as e:
-            import traceback
-            print(f"❌ Reel generation error: {e}")
-            traceback.print_exc()
-            return None
+        final_video.close()
+        shutil.move(scratch_path, output_path)
+        
+        print(f"✅ Reel created: {output_path}")
+        
+        return output_path
     
-    def _create_image_text_slide(self, text, duration, image_path, text_color, font_size, emoji="", darken=0.5):
+    def _create_image_text_slide(self, text, duration, background, text_color, font_size, emoji="", darken=0.5):
         """Create a slide with image background and text overlay"""
         
-        if image_path and os.path.exists(image_path):
-            # Load and resize image to vertical format
-            img = Image.open(image_path).convert('RGB')
+        with self.timer.stage("background"):
+            img = self._prepare_background(background, darken)
+        
+        with self.timer.stage("text"):
+            self._draw_slide_text(img, text, text_color, font_size, emoji)
+        
+        # Convert to MoviePy clip
+        with self.timer.stage("assembly"):
+            img_array = np.array(img)
+            clip = ImageClip(img_array).set_duration(duration)
+        
+        return clip
+    
+    def _prepare_background(self, background, darken):
+        """Crop, resize and darken the background (or build the gradient fallback)"""
+        if background is not None:
+            # Resize in-memory image to vertical format
+            img = background
             
             # Resize to 9:16 vertical, crop if needed
             img_width, img_height = img.size
@@ -135,7 +173,10 @@ class ReelGenerator:
             # Fallback to gradient background
             img = self._create_gradient_background()
         
-        # Add text overlay
+        return img
+    
+    def _draw_slide_text(self, img, text, text_color, font_size, emoji=""):
+        """Draw centered, outlined slide text onto img in place"""
         draw = ImageDraw.Draw(img)
         
         # Try to use a bold font
@@ -169,12 +210,6 @@ class ReelGenerator:
         
         # Draw main text
         draw.text((x, y), wrapped_text, fill=text_color, font=font, align="center")
-        
-        # Convert to MoviePy clip
-        img_array = np.array(img)
-        clip = ImageClip(img_array).set_duration(duration)
-        
-        return clip
     
     def _create_gradient_background(self):
         """Create a gradient background as fallback"""
@@ -191,43 +226,60 @@ class ReelGenerator:
         
         return img
     
-    def _download_image(self, url):
-        """Download image from URL for use as background"""
-        try:
-            import uuid
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                temp_path = f"temp_reel_bg_{uuid.uuid4().hex[:8]}.jpg"
-                with open(temp_path, 'wb') as f:
-                    f.write(response.content)
-                return temp_path
-        except Exception as e:
-            print(f"⚠️ Image download failed: {e}")
-        return None
+    def _download_image(self, url, workspace):
+        """Download image from URL into memory for use as background"""
+        return workspace.load_image(url)
     
     def _extract_hook(self, title, blog_html):
         """Extract the hook from title or blog"""
-        # Use first 60 chars of title as hook
+        # A heading that leads with a number ("The $40,000 Leak...") beats the title
+        doc = parse_blog_html(blog_html)
+        for heading in doc.headings:
+            if NUMBER_PATTERN.search(heading):
+                return self._shorten(heading, 60).upper()
+        # Otherwise use first 60 chars of title as hook
         return title[:60].upper()
     
     def _extract_pain_points(self, blog_html):
         """Extract pain points from blog HTML"""
-        # Simple extraction - look for sentences with pain words
+        # Look for sentences with pain words, preferring ones with hard numbers
         pain_words = ["bleeding", "losing", "costing", "burning", "wasting", "stuck", "frustrated"]
         
-        # Basic extraction (can be enhanced with AI)
-        pain_points = [
+        doc = parse_blog_html(blog_html)
+        pain_points = [self._shorten(s) for s in doc.find_sentences(pain_words, limit=3)]
+        
+        # Top up from concrete facts, then generic lines
+        for fact in doc.facts:
+            if len(pain_points) >= 3:
+                break
+            fact = self._shorten(fact)
+            if fact not in pain_points:
+                pain_points.append(fact)
+        
+        defaults = [
             "You're bleeding cash every month",
             "Your team wastes 20+ hours weekly",
             "Competitors are automating faster"
         ]
+        pain_points.extend(defaults[len(pain_points):])
         
         return pain_points
     
     def _extract_solution(self, blog_html):
         """Extract solution from blog"""
+        solution_words = ["automate", "solution", "fix", "discovered", "cut", "save", "faster"]
+        
+        doc = parse_blog_html(blog_html)
+        matches = doc.find_sentences(solution_words, limit=1)
+        if matches:
+            return self._shorten(matches[0])
         return "Here's what smart businesses discovered..."
-
+    
+    def _shorten(self, text, limit=90):
+        """Trim text to a slide-friendly length on a word boundary"""
+        if len(text) <= limit:
+            return text
+        return text[:limit].rsplit(' ', 1)[0].rstrip(',;:') + "..."
 
 if __name__ == "__main__":
     # Test
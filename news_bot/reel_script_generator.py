@@ -3,13 +3,12 @@ AI-Powered Viral Reel Script Generator
 Uses Hyper-Dopamine Framework to convert articles into viral video scripts
 """
 
-import google.generativeai as genai
-from .settings import GOOGLE_API_KEY
+from .gemini_client import generate
+from .article_parser import parse_blog_html
 
 class ReelScriptGenerator:
     def __init__(self):
-        genai.configure(api_key=GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        self.model_name = 'gemini-2.0-flash-exp'
     
     def generate_viral_script(self, article_title, blog_html):
         """
@@ -23,6 +22,10 @@ class ReelScriptGenerator:
         }
         """
         
+        # Send a compact fact sheet rather than the raw page HTML - the
+        # model only needs the numbers and structure, not the markup
+        fact_sheet = parse_blog_html(blog_html).to_fact_sheet()
+        
         prompt = f"""Role: You are a Viral Video Strategist and Direct Response Copywriter.
 
 Task: Convert this article into a 30-60 second viral Facebook Reel script using the Hyper-Dopamine Framework.
@@ -36,8 +39,8 @@ CRITICAL RULES:
 
 Article Title: {article_title}
 
-Article Content:
-{blog_html}
+Article Fact Sheet:
+{fact_sheet}
 
 Output a JSON object with this EXACT structure:
 {{
@@ -73,12 +76,13 @@ Output a JSON object with this EXACT structure:
 Return ONLY the JSON object, no markdown formatting."""
 
         try:
-            response = self.model.generate_content(
+            response = generate(
                 prompt,
-                generation_config=genai.GenerationConfig(
-                    temperature=0.9,
-                    response_mime_type="application/json"
-                )
+                model=self.model_name,
+                generation_config={
+                    "temperature": 0.9,
+                    "response_mime_type": "application/json"
+                }
             )
             
             import json
@@ -0,0 +1,82 @@
+"""
+Reel Job Workspace
+Per-job scratch space for reel rendering so parallel builds never share files
+"""
+
+from PIL import Image
+from io import BytesIO
+import requests
+import shutil
+import tempfile
+import os
+
+
+class ReelWorkspace:
+    """
+    Scratch area for a single reel build.
+
+    Downloaded images stay in memory as PIL images; anything that has to
+    touch disk (MoviePy's temp audio track, intermediate renders) goes in a
+    private temp directory that is removed when the job ends, even on error.
+
+    Usage:
+        with ReelWorkspace() as ws:
+            bg = ws.load_image(url)
+            path = ws.path("audio.m4a")
+    """
+
+    def __init__(self, prefix="reel_job_"):
+        self.prefix = prefix
+        self.root = None
+        self._images = {}
+
+    def __enter__(self):
+        self.root = tempfile.mkdtemp(prefix=self.prefix)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+        return False
+
+    def path(self, name):
+        """Absolute path for a scratch file inside this job's directory."""
+        if self.root is None:
+            raise RuntimeError("ReelWorkspace is not active")
+        return os.path.join(self.root, os.path.basename(name))
+
+    def load_image(self, source, timeout=10):
+        """
+        Load an image into memory from a URL or local path.
+
+        Returns:
+            PIL.Image: RGB image, or None if it could not be loaded
+        """
+        if not source:
+            return None
+        if source in self._images:
+            return self._images[source]
+
+        try:
+            if os.path.exists(source):
+                with open(source, 'rb') as f:
+                    data = f.read()
+            else:
+                response = requests.get(source, timeout=timeout)
+                if response.status_code != 200:
+                    print(f"⚠️ Image download failed: HTTP {response.status_code}")
+                    return None
+                data = response.content
+
+            img = Image.open(BytesIO(data)).convert('RGB')
+            self._images[source] = img
+            return img
+        except Exception as e:
+            print(f"⚠️ Image download failed: {e}")
+            return None
+
+    def cleanup(self):
+        """Release in-memory buffers and delete the scratch directory."""
+        self._images.clear()
+        if self.root and os.path.isdir(self.root):
+            shutil.rmtree(self.root, ignore_errors=True)
+        self.root = None
@@ -66,11 +66,7 @@ def retry_latest_post():
     # We only save the title/url.
     # SO: We will run the Prompt again here to see if the NEW prompt logic works.
     
-    import google.generativeai as genai
-    from .settings import GOOGLE_API_KEY
-    
-    genai.configure(api_key=GOOGLE_API_KEY)
-    model = genai.GenerativeModel('gemini-flash-latest')
+    from .gemini_client import generate_text
     
     # Re-run the specific Facebook Prompt
     prompt = f"""
@@ -87,8 +83,7 @@ def retry_latest_post():
     """
     
     try:
-        response = model.generate_content(prompt)
-        caption = response.text.strip()
+        caption = generate_text(prompt)
     except Exception as e:
         print(f"Error generating caption: {e}")
         caption = f"New Article: {article_data['title']}\n\nRead here: https://aicorelogic-ops.github.io/ai-core-logic-blogz/{article_data['blog_path']}"
@@ -0,0 +1,136 @@
+"""
+Static Search Index
+Builds a sharded inverted index of post titles, snippets and TL;DRs for blog/js/search-index.js
+"""
+
+from pathlib import Path
+import html
+import json
+import os
+import re
+from .article_parser import parse_blog_html
+from .site_files import write_if_changed
+
+# Per-post metadata from previous builds, keyed by filename (not published)
+SEARCH_CACHE_PATH = Path(__file__).parent.parent / 'search_cache.json'
+
+# Bump when tokenization or the cache layout changes
+INDEX_VERSION = 1
+
+# Term weight per field
+FIELD_WEIGHTS = {"title": 3, "tldr": 2, "snippet": 1}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have",
+    "how", "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "was",
+    "what", "when", "why", "will", "with", "you", "your", "their", "they", "we", "our",
+}
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords (mirrored in blog/js/search-index.js)."""
+    text = html.unescape(text or "").lower()
+    return [t for t in TOKEN_PATTERN.findall(text) if len(t) > 1 and t not in STOPWORDS]
+
+
+def shard_key(term):
+    """Terms are sharded by first character; all digits share one shard."""
+    return "0" if term[0].isdigit() else term[0]
+
+
+def post_terms(title, snippet, tldr):
+    """Weighted term counts for one post."""
+    terms = {}
+    for field, text in (("title", title), ("snippet", snippet), ("tldr", tldr)):
+        for token in tokenize(text):
+            terms[token] = terms.get(token, 0) + FIELD_WEIGHTS[field]
+    return terms
+
+
+def _load_cache():
+    try:
+        with open(SEARCH_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == INDEX_VERSION:
+            return cache["posts"]
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def _post_metadata(post, posts_dir, cache):
+    """Cached metadata for a post, re-reading the file only if it changed."""
+    path = os.path.join(posts_dir, post['filename'])
+    mtime = os.path.getmtime(path)
+    entry = cache.get(post['filename'])
+    if entry and entry["mtime"] == mtime:
+        return entry, False
+
+    with open(path, "r", encoding="utf-8") as f:
+        tldr = parse_blog_html(f.read()).tldr
+    entry = {
+        "mtime": mtime,
+        "terms": post_terms(post['title'], post['snippet'], tldr),
+    }
+    return entry, True
+
+
+def build_search_index(posts, posts_dir, blog_dir):
+    """
+    Writes blog/search/docs.json, terms-<c>.json shards and manifest.json.
+
+    Doc ids follow filename order (oldest first), so a new post gets the
+    next id and only the shards holding its terms change. Post files are
+    only re-read when their mtime differs from the metadata cache.
+
+    Args:
+        posts (list): Post dicts from generate_categories.get_posts()
+        posts_dir (str): Directory containing the post HTML files
+        blog_dir (str): Site root; output goes to <blog_dir>/search
+
+    Returns:
+        list: Paths of the files that were written or removed
+    """
+    search_dir = os.path.join(blog_dir, "search")
+    cache = _load_cache()
+    new_cache = {}
+    docs = []
+    shards = {}
+    parsed = 0
+
+    for doc_id, post in enumerate(sorted(posts, key=lambda p: p['filename'])):
+        entry, fresh = _post_metadata(post, posts_dir, cache)
+        parsed += fresh
+        new_cache[post['filename']] = entry
+
+        docs.append([post['title'], post['path'], post['date'], post['category'], post.get('card_image', '')])
+        for term, weight in entry["terms"].items():
+            shards.setdefault(shard_key(term), {}).setdefault(term, []).extend([doc_id, weight])
+
+    written = []
+
+    def emit(name, payload):
+        path = os.path.join(search_dir, name)
+        if write_if_changed(path, json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))):
+            written.append(path)
+
+    emit("docs.json", docs)
+    for key, terms in shards.items():
+        emit(f"terms-{key}.json", terms)
+    emit("manifest.json", {"version": INDEX_VERSION, "docs": len(docs), "shards": sorted(shards)})
+
+    # Drop shards whose terms no longer exist
+    for filename in os.listdir(search_dir):
+        match = re.match(r"terms-(\w)\.json$", filename)
+        if match and match.group(1) not in shards:
+            os.remove(os.path.join(search_dir, filename))
+            written.append(os.path.join(search_dir, filename))
+
+    with open(SEARCH_CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"version": INDEX_VERSION, "posts": new_cache}, f, separators=(",", ":"))
+
+    print(f"🔎 Search index: {len(docs)} posts, {sum(len(t) for t in shards.values())} terms "
+          f"({parsed} re-read, {len(written)} files written)")
+    return written
@@ -11,6 +11,7 @@ FB_PAGE_ID = os.getenv("FB_PAGE_ID")
 
 # AI Config
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "60"))  # Shared request budget for all Gemini calls in a process
 
 # OpenAI Config (optional, for DALL-E 3 image generation)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # Optional: for premium image generation
@@ -20,6 +21,32 @@ VERTEX_PROJECT_ID = os.getenv("VERTEX_PROJECT_ID")  # e.g., "my-project-123456"
 VERTEX_LOCATION = os.getenv("VERTEX_LOCATION", "us-east4")  # Changed to us-east4 for better availability
 VERTEX_KEY_PATH = os.getenv("VERTEX_KEY_PATH")  # Optional: path to service account JSON
 
+# Deploy Config (git remote/branch the blog is published to)
+DEPLOY_REMOTE = os.getenv("DEPLOY_REMOTE", "origin")
+DEPLOY_BRANCH = os.getenv("DEPLOY_BRANCH")  # Default: the current branch
+
+# Run Metrics (one JSON line per bot run; the Prometheus textfile is optional)
+METRICS_FILE = os.getenv("METRICS_FILE", str(Path(__file__).parent.parent / "metrics" / "runs.jsonl"))
+PROMETHEUS_TEXTFILE = os.getenv("PROMETHEUS_TEXTFILE")  # e.g. /var/lib/node_exporter/textfile/news_bot.prom
+
+# Scoring: stop collecting once enough articles reach SCORE_TARGET; never
+# spend more than SCORE_BUDGET LLM scoring calls per run
+SCORE_TARGET = int(os.getenv("SCORE_TARGET", "85"))
+SCORE_BUDGET = int(os.getenv("SCORE_BUDGET", "40"))
+# Pre-ranking (news_bot.viral_ranker): of every PRERANK_WINDOW newly collected
+# articles, only the best PRERANK_TOP_N by local score are sent to the LLM;
+# 0 scores everything that passes the prefilters
+PRERANK_TOP_N = int(os.getenv("PRERANK_TOP_N", "3"))
+PRERANK_WINDOW = int(os.getenv("PRERANK_WINDOW", "10"))
+
+# Publishing: articles per run (one rebuild + one deploy per batch) and parallel workers
+PUBLISH_TOP_K = int(os.getenv("PUBLISH_TOP_K", "1"))
+PUBLISH_WORKERS = int(os.getenv("PUBLISH_WORKERS", "3"))
+
+# Daemon Mode (python -m news_bot.daemon)
+DAEMON_POLL_MINUTES = float(os.getenv("DAEMON_POLL_MINUTES", "30"))  # Fetch + score feeds
+DAEMON_PUBLISH_MINUTES = float(os.getenv("DAEMON_PUBLISH_MINUTES", "240"))  # Publish the best candidate
+
 # News Sources (RSS)
 # News Sources (RSS)
 RSS_FEEDS = [
@@ -0,0 +1,20 @@
+"""
+Site File Helpers
+Shared write helpers for the static blog build
+"""
+
+import os
+
+
+def write_if_changed(path, content):
+    """Writes content only if the file is missing or different. Returns True if written."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return True
@@ -0,0 +1,34 @@
+"""
+Stage Timer
+Accumulates wall-clock time per named stage (used by the reel generators
+and the reel benchmark)
+"""
+
+from contextlib import contextmanager
+import threading
+import time
+
+
+class StageTimer:
+    """
+    Collects elapsed seconds per stage. Re-entering a stage adds to its total,
+    so per-slide work (e.g. text rendering) is reported as one number.
+    Safe to use from several threads; their time is summed.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def reset(self):
+        self.timings = {}
@@ -0,0 +1,204 @@
+"""
+Static Build Step
+Content-hash cache busting for CSS/JS/image assets and optional pre-compressed (.gz/.br) siblings
+
+Usage:
+    python -m news_bot.static_build            # fingerprint pages
+    python -m news_bot.static_build --compress # ...and write .gz/.br files
+"""
+
+from pathlib import Path
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+from .site_files import write_if_changed
+
+try:
+    import brotli  # Optional - only needed for .br output
+except ImportError:
+    brotli = None
+
+DEFAULT_BLOG_DIR = Path(__file__).parent.parent / 'blog'
+MANIFEST_NAME = "asset-manifest.json"
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".svg")
+
+# Files that get a content-hash version: (<dir>, extensions). Images matter
+# as much as CSS/JS: a hero replaced under the same name is otherwise served
+# stale from caches
+FINGERPRINTED = (
+    ("css", (".css",)),
+    ("js", (".js",)),
+    ("assets", IMAGE_EXTENSIONS),
+    ("assets/variants", IMAGE_EXTENSIONS),
+)
+
+# Files worth pre-compressing
+COMPRESSIBLE = (".html", ".css", ".js", ".json", ".svg", ".xml")
+
+# href="css/style.css?v=11", src="../js/search.js", url('../assets/hero.jpg'),
+# srcset="assets/variants/a.webp 480w, ..." -> group 2 is the asset path
+ASSET_REF = re.compile(
+    r'(?<=["\'(\s,])((?:\.\./)*)((?:css|js|assets)/[\w./-]+?\.(?:css|js|jpe?g|png|webp|gif|svg))'
+    r'(?:\?v=[\w.-]*)?(?=["\')\s,])'
+)
+VERSION_SUFFIX = re.compile(r'\?v=[\w.-]*$')
+
+HASH_LENGTH = 10
+
+
+def hash_file(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:HASH_LENGTH]
+
+
+def asset_hashes(blog_dir):
+    """Content hashes of every fingerprinted CSS/JS/image file, keyed by site-relative path."""
+    hashes = {}
+    for folder, extensions in FINGERPRINTED:
+        directory = os.path.join(blog_dir, folder)
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            path = os.path.join(directory, filename)
+            if filename.lower().endswith(extensions) and os.path.isfile(path):
+                hashes[f"{folder}/{filename}"] = hash_file(path)
+    return hashes
+
+
+def unversioned(url):
+    """url without a ?v= cache-busting suffix (for comparing image URLs read back from pages)."""
+    return VERSION_SUFFIX.sub("", url) if url else url
+
+
+def versioned_html(html, hashes):
+    """
+    Point every CSS/JS/image reference in html at ?v=<content hash>.
+
+    Returns:
+        tuple: (new html, set of referenced asset paths)
+    """
+    refs = set()
+
+    def replace(match):
+        asset = match.group(2)
+        if asset not in hashes:
+            return match.group(0)
+        refs.add(asset)
+        return f"{match.group(1)}{asset}?v={hashes[asset]}"
+
+    return ASSET_REF.sub(replace, html), refs
+
+
+def load_manifest(blog_dir):
+    try:
+        with open(os.path.join(blog_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"assets": {}, "pages": {}}
+
+
+def _html_pages(blog_dir):
+    for root, dirs, files in os.walk(blog_dir):
+        for filename in files:
+            if filename.endswith(".html"):
+                yield os.path.relpath(os.path.join(root, filename), blog_dir).replace(os.sep, "/")
+
+
+def fingerprint_pages(blog_dir=DEFAULT_BLOG_DIR):
+    """
+    Rewrite ?v= cache-busting versions only where needed.
+
+    A page is opened only if it is new, was modified since the last build,
+    or references an asset whose content hash changed. Everything else is
+    skipped from the manifest alone.
+
+    Returns:
+        list: Paths of the pages rewritten (plus the manifest, if it changed)
+    """
+    blog_dir = str(blog_dir)
+    manifest = load_manifest(blog_dir)
+    hashes = asset_hashes(blog_dir)
+    changed_assets = {a for a, h in hashes.items() if manifest["assets"].get(a) != h}
+    changed_assets |= set(manifest["assets"]) - set(hashes)
+
+    pages = {}
+    written = []
+    for page in _html_pages(blog_dir):
+        path = os.path.join(blog_dir, page)
+        mtime = os.path.getmtime(path)
+        known = manifest["pages"].get(page)
+        if known and known["mtime"] == mtime and not changed_assets.intersection(known["refs"]):
+            pages[page] = known
+            continue
+
+        with open(path, "r", encoding="utf-8") as f:
+            html, refs = versioned_html(f.read(), hashes)
+        if write_if_changed(path, html):
+            written.append(path)
+        pages[page] = {"mtime": os.path.getmtime(path), "refs": sorted(refs)}
+
+    new_manifest = {"assets": hashes, "pages": pages}
+    manifest_path = os.path.join(blog_dir, MANIFEST_NAME)
+    if write_if_changed(manifest_path, json.dumps(new_manifest, indent=1, sort_keys=True)):
+        written.append(manifest_path)
+
+    if changed_assets:
+        print(f"🔖 Changed assets: {', '.join(sorted(changed_assets))}")
+    print(f"🔖 Cache busting: {len(written)} files rewritten")
+    return written
+
+
+def compress_file(path):
+    """
+    Write path.gz (and path.br when brotli is installed) if missing or older
+    than the source. Returns the list of files written.
+    """
+    written = []
+    source_mtime = os.path.getmtime(path)
+    targets = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli:
+        targets.append((".br", lambda data: brotli.compress(data, quality=11)))
+
+    data = None
+    for suffix, compress in targets:
+        target = path + suffix
+        if os.path.exists(target) and os.path.getmtime(target) >= source_mtime:
+            continue
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        with open(target, "wb") as f:
+            f.write(compress(data))
+        written.append(target)
+    return written
+
+
+def compress_site(blog_dir=DEFAULT_BLOG_DIR):
+    """Pre-compress every text asset whose sibling is missing or stale."""
+    written = []
+    for root, dirs, files in os.walk(str(blog_dir)):
+        for filename in files:
+            if filename.endswith(COMPRESSIBLE):
+                written += compress_file(os.path.join(root, filename))
+    print(f"🗜️ Pre-compressed {len(written)} files{'' if brotli else ' (gzip only - install brotli for .br)'}")
+    return written
+
+
+def build_static(blog_dir=DEFAULT_BLOG_DIR, compress=False):
+    """Run the cache-busting pass and, if requested, pre-compression. Returns written paths."""
+    written = fingerprint_pages(blog_dir)
+    if compress:
+        written += compress_site(blog_dir)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache-bust and pre-compress the static blog")
+    parser.add_argument("--blog-dir", default=str(DEFAULT_BLOG_DIR))
+    parser.add_argument("--compress", action="store_true", help="Write .gz/.br siblings for hosts that serve them")
+    args = parser.parse_args()
+    build_static(args.blog_dir, compress=args.compress)
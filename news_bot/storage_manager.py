@@ -0,0 +1,152 @@
+"""
+Temp Image Storage Manager
+Keeps temp_images under a size budget and max age, evicting least recently used files first
+"""
+
+from pathlib import Path
+import json
+import os
+import threading
+import time
+
+TEMP_IMAGES_DIR = Path(__file__).parent.parent / 'temp_images'
+TRACKER_FILE = Path(__file__).parent.parent / 'blog' / 'processed_articles.json'
+
+DEFAULT_MAX_BYTES = 25 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 7
+
+# Files newer than this may still be in use (e.g. mid-upload to Facebook)
+MIN_AGE_SECONDS = 3600
+
+MEDIA_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".mp4", ".wav", ".mp3")
+
+# Tracker metadata keys that point at generated media (image_path is set by
+# facebook_blog_poster before uploading; reels are written to blog/reels)
+TRACKED_MEDIA_KEYS = ("image_path", "reel_path")
+
+# Tracker metadata keys that mean the post is live on Facebook
+POSTED_KEYS = ("facebook_photo_id", "facebook_post_id")
+
+# One collection at a time per process
+_collect_lock = threading.Lock()
+
+
+def _format_size(num_bytes):
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+class StorageManager:
+    """
+    Garbage collector for generated media.
+
+    Policy, applied in order:
+        1. Protected files are never deleted: anything referenced by a
+           tracker entry that has not been posted yet, files younger than
+           min_age_seconds, and any extra paths passed in.
+        2. Files older than max_age_days are deleted.
+        3. If the directory is still over max_bytes, the least recently
+           used files (by access or modification time) go first.
+
+    Args:
+        directory (str): Directory to manage (default: temp_images/)
+        max_bytes (int): Size budget for the directory
+        max_age_days (float): Maximum age of an unprotected file
+        tracker_file (str): ArticleTracker JSON used to find pending media
+    """
+
+    def __init__(self, directory=TEMP_IMAGES_DIR, max_bytes=DEFAULT_MAX_BYTES, max_age_days=DEFAULT_MAX_AGE_DAYS,
+                 min_age_seconds=MIN_AGE_SECONDS, tracker_file=TRACKER_FILE):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.min_age_seconds = min_age_seconds
+        self.tracker_file = tracker_file
+
+    def pending_media(self):
+        """Absolute paths of media referenced by tracker entries without a Facebook post yet."""
+        try:
+            with open(self.tracker_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return set()
+
+        paths = set()
+        for metadata in data.values():
+            if any(metadata.get(key) for key in POSTED_KEYS):
+                continue
+            for key in TRACKED_MEDIA_KEYS:
+                if metadata.get(key):
+                    paths.add(os.path.abspath(metadata[key]))
+        return paths
+
+    def _scan(self):
+        """(path, size, last_used) for every media file, from a single scandir pass."""
+        files = []
+        if not self.directory.is_dir():
+            return files
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(MEDIA_EXTENSIONS):
+                    stat = entry.stat()
+                    files.append((os.path.abspath(entry.path), stat.st_size, max(stat.st_atime, stat.st_mtime)))
+        return files
+
+    def collect(self, protect=()):
+        """
+        Apply the policy once.
+
+        Args:
+            protect (iterable): Extra paths that must be kept
+
+        Returns:
+            dict: deleted (count), reclaimed/remaining (bytes), protected (count)
+        """
+        with _collect_lock:
+            now = time.time()
+            protected = self.pending_media() | {os.path.abspath(p) for p in protect}
+            files = self._scan()
+            total = sum(size for _, size, _ in files)
+
+            candidates = []
+            kept = 0
+            for path, size, last_used in files:
+                if path in protected or now - last_used < self.min_age_seconds:
+                    kept += 1
+                else:
+                    candidates.append((last_used, path, size))
+            candidates.sort()  # least recently used first
+
+            deleted = 0
+            reclaimed = 0
+            max_age_seconds = self.max_age_days * 86400
+            for last_used, path, size in candidates:
+                if now - last_used <= max_age_seconds and total - reclaimed <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    deleted += 1
+                    reclaimed += size
+                except OSError as e:
+                    print(f"⚠️ Could not delete {path}: {e}")
+
+            report = {"deleted": deleted, "reclaimed": reclaimed, "remaining": total - reclaimed, "protected": kept}
+            if deleted:
+                print(f"🧹 Reclaimed {_format_size(reclaimed)} from {deleted} files in {self.directory.name} "
+                      f"({_format_size(report['remaining'])} left, {kept} protected)")
+            return report
+
+    def collect_in_background(self, protect=()):
+        """Run collect() on a worker thread so publishing isn't held up. Returns the thread."""
+        def run():
+            try:
+                self.collect(protect)
+            except Exception as e:
+                print(f"⚠️ Storage cleanup failed: {e}")
+
+        thread = threading.Thread(target=run, name="storage-gc")
+        thread.start()
+        return thread
+
+
+if __name__ == "__main__":
+    StorageManager().collect()
@@ -0,0 +1,82 @@
+"""
+Compiled HTML Templates
+Small template registry used by every generated blog page (listings, posts, migrations)
+"""
+
+from pathlib import Path
+import os
+import re
+
+# Template files live next to this module
+TEMPLATE_DIR = Path(__file__).parent / 'templates'
+
+# {{ slot_name }} - the only syntax. CSS/JS braces are left untouched.
+SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Compiled templates, keyed by name -> (mtime, Template)
+_registry = {}
+
+
+class Template:
+    """
+    A template split once into literal chunks and slot names.
+
+    Rendering is a single pass that joins the chunks with the slot values,
+    so cost is linear in the output size no matter how many slots there are.
+    """
+
+    def __init__(self, name, source):
+        self.name = name
+        parts = SLOT_PATTERN.split(source)
+        self.chunks = parts[0::2]  # literal text (always one more than slots)
+        self.slots = parts[1::2]   # slot names, in order
+
+    def render(self, **context):
+        """
+        Fill every slot from context.
+
+        Raises:
+            KeyError: If a slot has no value in context
+        """
+        out = [self.chunks[0]]
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            if slot not in context:
+                raise KeyError(f"Template '{self.name}' needs a value for '{slot}'")
+            out.append(str(context[slot]))
+            out.append(chunk)
+        return "".join(out)
+
+
+def get_template(name):
+    """
+    Return the compiled template for templates/<name>.
+
+    Each file is compiled once per process and recompiled only if it
+    changes on disk. A single trailing newline is dropped so fragments
+    (cards, links) can be joined without stray blank lines.
+    """
+    path = TEMPLATE_DIR / name
+    mtime = os.path.getmtime(path)
+    cached = _registry.get(name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    if source.endswith("\n"):
+        source = source[:-1]
+
+    template = Template(name, source)
+    _registry[name] = (mtime, template)
+    return template
+
+
+def render(name, **context):
+    """Render templates/<name> with the given slot values."""
+    return get_template(name).render(**context)
+
+
+def render_each(name, items):
+    """Render one template per context dict and join the results."""
+    template = get_template(name)
+    return "".join(template.render(**item) for item in items)
@@ -1,9 +1,9 @@
-from PIL import Image, ImageDraw, ImageFont
 import textwrap
 import os
 
 def create_text_image(text, output_path, bg_color=(20, 20, 30), text_color=(255, 255, 255)):
     """Create a simple news graphic with text."""
+    from PIL import Image, ImageDraw, ImageFont
     width = 1200
     height = 630
     img = Image.new('RGB', (width, height), color=bg_color)
@@ -0,0 +1,119 @@
+"""
+Viral Pre-Ranker
+Cheap local score from the signals the LLM scoring prompt names, so only the top-N articles reach Gemini
+
+Features are extracted per article with a few regexes, then scored for a
+batch with one matrix product. prerank_windows() applies this to a stream:
+every window of collected articles passes its best N on to the scorers, so
+LLM scoring (and its early stop) overlaps collection instead of waiting for
+every feed. scripts/eval_viral_ranker.py measures how often the LLM's
+favourite survives a given N (and can refit WEIGHTS) using the pools the
+tracker has recorded.
+"""
+
+import re
+import numpy as np
+from .article_parser import NUMBER_PATTERN
+from .keyword_matcher import match_keywords
+
+URGENCY_PATTERN = re.compile(
+    r"\b(?:now|today|breaking|just|urgent|deadline|immediately|finally|"
+    r"launch(?:es|ed)?|announc(?:es|ed)|rolls? out|before|last chance|warn(?:s|ing)?)\b"
+)
+CONTROVERSY_PATTERN = re.compile(
+    r"\b(?:ban(?:s|ned)?|lawsuit|sues?|sued|fine[sd]?|layoffs?|fired|backlash|scandal|"
+    r"leak(?:s|ed)?|slams?|accus(?:es|ed)|controvers\w*|fails?|failed|kill(?:s|ed)?|"
+    r"replac(?:es|ed|ing)|threat\w*|vs\.?|versus|myth|wrong|dead)\b"
+)
+CURRENCY_PATTERN = re.compile(r"[$£€]\s?\d|\b\d[\d,.]*\s?(?:million|billion|dollars?)\b")
+
+FEATURES = ("numbers", "money", "urgency", "controversy", "title_length", "question", "keywords")
+
+# Weight per feature (features are scaled to 0-1)
+WEIGHTS = np.array([1.0, 1.0, 0.8, 1.0, 0.5, 0.4, 0.6])
+
+# Titles around this many characters tend to carry a full hook without truncating
+IDEAL_TITLE_LENGTH = 70
+
+
+def article_features(article):
+    """One row of FEATURES for an article (title counts double)."""
+    title = article.get('title', '')
+    text = f"{title} {title} {article.get('summary', '')[:600]}".lower()
+    return [
+        min(len(NUMBER_PATTERN.findall(text)), 3) / 3,
+        1.0 if CURRENCY_PATTERN.search(text) else 0.0,
+        min(len(URGENCY_PATTERN.findall(text)), 3) / 3,
+        min(len(CONTROVERSY_PATTERN.findall(text)), 3) / 3,
+        max(0.0, 1 - abs(len(title) - IDEAL_TITLE_LENGTH) / IDEAL_TITLE_LENGTH),
+        1.0 if "?" in title else 0.0,
+        # Distinct niche keywords (relevance); the collector already counted them
+        min(len(article['keywords'] if 'keywords' in article else match_keywords(text)), 3) / 3,
+    ]
+
+
+def feature_matrix(articles):
+    """(len(articles), len(FEATURES)) float array."""
+    if not articles:
+        return np.zeros((0, len(FEATURES)))
+    return np.array([article_features(article) for article in articles], dtype=float)
+
+
+def local_scores(articles, weights=WEIGHTS):
+    """Local viral score per article on the LLM's 0-100 scale."""
+    weights = np.asarray(weights, dtype=float)
+    return feature_matrix(articles) @ weights / weights.sum() * 100
+
+
+def windowed_top(scores, window, top_n):
+    """
+    Indices kept by window-wise pre-ranking of scores (in arrival order):
+    the top_n of every consecutive window of `window` entries.
+
+    Returns:
+        np.ndarray: Kept indices, window by window, best first within each
+    """
+    scores = np.asarray(scores, dtype=float)
+    kept = [
+        start + np.argsort(-scores[start:start + window], kind="stable")[:top_n]
+        for start in range(0, len(scores), window)
+    ]
+    return np.concatenate(kept) if kept else np.zeros(0, dtype=int)
+
+
+def prerank(articles, top_n, weights=WEIGHTS):
+    """
+    The top_n articles by local score, best first. Every article gets its
+    'local_score' and 'prerank_kept' set, so dropped ones can be recorded
+    next to the LLM scores too.
+
+    Returns:
+        list: At most top_n articles
+    """
+    scores = local_scores(articles, weights)
+    order = np.argsort(-scores, kind="stable")[:top_n]
+    for article, score in zip(articles, scores):
+        article['local_score'] = round(float(score), 1)
+        article['prerank_kept'] = False
+    ranked = []
+    for index in order:
+        article = articles[index]
+        article['prerank_kept'] = True
+        ranked.append(article)
+    return ranked
+
+
+def prerank_windows(articles, window, top_n, weights=WEIGHTS):
+    """
+    Pre-rank a stream: collect `window` articles, yield that window's top_n
+    (best first), repeat; the last, partial window is ranked when the input
+    ends. Nothing waits for the whole stream, so a consumer can stop early.
+    """
+    batch = []
+    for article in articles:
+        batch.append(article)
+        if len(batch) >= window:
+            yield from prerank(batch, top_n, weights)
+            batch = []
+    if batch:
+        yield from prerank(batch, top_n, weights)
@@ -5,154 +5,175 @@ Creates viral-style reels using AI-generated scripts
 
 from moviepy.editor import *
 from PIL import Image, ImageDraw, ImageFont
-import requests
-from io import BytesIO
 import os
+import shutil
 import textwrap
 import numpy as np
 from .reel_script_generator import ReelScriptGenerator
-from .audio_utils import generate_tts, mix_audio
+from .audio_utils import generate_tts, mix_voice_with_music
+from .reel_workspace import ReelWorkspace
+from .stage_timer import StageTimer
 
 class ViralReelGenerator:
-    def __init__(self):
+    def __init__(self, script_gen=None):
         self.width = 1080
         self.height = 1920
         self.fps = 30
-        self.script_gen = ReelScriptGenerator()
+        self.script_gen = script_gen or ReelScriptGenerator()
+        
+        # Encoder settings (overridable, e.g. by scripts/bench_reels.py)
+        self.output_dir = os.path.join("blog", "reels")
+        self.codec = 'libx264'
+        self.preset = 'medium'
+        self.ffmpeg_params = None
+        self.encode_logger = 'bar'
+        
+        # Per-stage timings of the last build
+        self.timer = StageTimer()
     
     def create_viral_reel(self, article, blog_html, image_url):
         """Generate viral reel using AI-generated script"""
         
+        self.timer.reset()
         try:
-            print("🎬 Generating viral reel...")
-            
-            # Generate AI script
-            print("🤖 Generating viral script with AI...")
+            with ReelWorkspace() as workspace:
+                return self._render_viral_reel(article, blog_html, image_url, workspace)
+        except Exception as e:
+            import traceback
+            print(f"❌ Viral reel generation error: {e}")
+            traceback.print_exc()
+            return None
+    
+    def _render_viral_reel(self, article, blog_html, image_url, workspace):
+        """Build and encode the viral reel inside a job workspace"""
+        print("🎬 Generating viral reel...")
+        
+        # Generate AI script
+        print("🤖 Generating viral script with AI...")
+        with self.timer.stage("script"):
             script = self.script_gen.generate_viral_script(article['title'], blog_html)
+        
+        if not script:
+            print("❌ Failed to generate script")
+            return None
+        
+        # Download viral image (kept in memory)
+        with self.timer.stage("background"):
+            background = self._download_image(image_url, workspace) if image_url else None
+        
+        # Create slides based on viral script
+        slides = []
+        
+        # Helper to process slides with audio
+        def process_slide(text, overlay_text, duration, style):
+            # 1. Generate Audio (served from the TTS cache when possible)
+            with self.timer.stage("tts"):
+                audio_path = generate_tts(text)
             
-            if not script:
-                print("❌ Failed to generate script")
-                return None
-            
-            # Download viral image
-            viral_image_path = self._download_image(image_url) if image_url else None
+            # 2. Get Audio Clip
+            audio_clip = AudioFileClip(audio_path)
+            # Ensure slide is at least as long as audio (plus buffer)
+            slide_duration = max(duration, audio_clip.duration + 0.5)
             
-            # Create slides based on viral script
-            slides = []
-            audio_clips = []
+            # 3. Create Video Slide
+            slide = self._create_urgent_slide(
+                text=text,
+                overlay_text=overlay_text,
+                background=background,
+                duration=slide_duration,
+                style=style
+            )
             
-            # Helper to process slides with audio
-            def process_slide(text, overlay_text, duration, style):
-                # 1. Generate Audio
-                audio_filename = f"temp_audio_{style}_{len(audio_clips)}.mp3"
-                audio_path = generate_tts(text, audio_filename)
-                
-                # 2. Get Audio Clip
-                audio_clip = AudioFileClip(audio_path)
-                # Ensure slide is at least as long as audio (plus buffer)
-                slide_duration = max(duration, audio_clip.duration + 0.5)
-                
-                # 3. Create Video Slide
-                slide = self._create_urgent_slide(
-                    text=text,
-                    overlay_text=overlay_text,
-                    image_path=viral_image_path,
-                    duration=slide_duration,
-                    style=style
-                )
-                
-                # 4. Attach Audio
+            # 4. Attach Audio
+            with self.timer.stage("assembly"):
                 slide = slide.set_audio(audio_clip)
-                audio_clips.append(audio_path)
-                return slide
+            return slide
 
-            # Hook slide (3 seconds)
-            slides.append(process_slide(
-                script['hook']['script'],
-                script['hook']['text_overlay'],
-                3, 'hook'
-            ))
-            
-            # Body slides (~10s each or audio duration)
-            for i, point in enumerate(script['body']):
-                slides.append(process_slide(
-                    point['script'],
-                    point['text_overlay'],
-                    10, 'body'
-                ))
-            
-            # CTA slide (3 seconds)
+        # Hook slide (3 seconds)
+        slides.append(process_slide(
+            script['hook']['script'],
+            script['hook']['text_overlay'],
+            3, 'hook'
+        ))
+        
+        # Body slides (~10s each or audio duration)
+        for i, point in enumerate(script['body']):
             slides.append(process_slide(
-                script['cta']['script'],
-                script['cta']['text_overlay'],
-                3, 'cta'
+                point['script'],
+                point['text_overlay'],
+                10, 'body'
             ))
-            
-            # Concatenate
+        
+        # CTA slide (3 seconds)
+        slides.append(process_slide(
+            script['cta']['script'],
+            script['cta']['text_overlay'],
+            3, 'cta'
+        ))
+        
+        # Concatenate
+        with self.timer.stage("assembly"):
             final_video = concatenate_videoclips(slides, method="compose")
-            
-            # Background Music Mixing (Optional)
-            bg_music = "assets/audio/urgent_bkg.mp3"
-            if os.path.exists(bg_music):
-                print("🎸 Adding background music...")
-                # We'll rely on the audio in the clips for the voiceover
-                # But we want to mix it with BG music
-                voiceover_audio = final_video.audio
-                bg_clip = AudioFileClip(bg_music).volumex(0.15)
-                
-                if bg_clip.duration < voiceover_audio.duration:
-                    bg_clip = bg_clip.loop(duration=voiceover_audio.duration)
-                else:
-                    bg_clip = bg_clip.subclip(0, voiceover_audio.duration)
-                
-                final_audio = CompositeAudioClip([bg_clip, voiceover_audio])
-                final_video = final_video.set_audio(final_audio)
+        
+        # Background Music Mixing (Optional)
+        bg_music = "assets/audio/urgent_bkg.mp3"
+        if os.path.exists(bg_music):
+            print("🎸 Adding background music...")
+            # Decode the voiceover and music once and mix them as arrays
+            with self.timer.stage("audio_mix"):
+                final_audio = mix_voice_with_music(final_video.audio, bg_music, bg_volume=0.15)
+            final_video = final_video.set_audio(final_audio)
 
-            # Export
-            output_path = os.path.join("blog", "reels", f"{article['title'][:30].replace(' ', '_').replace('/', '_')}_VIRAL.mp4")
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
+        # Export
+        output_path = os.path.join(self.output_dir, f"{article['title'][:30].replace(' ', '_').replace('/', '_')}_VIRAL.mp4")
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        
+        # MoviePy's intermediate audio track and the render itself stay in
+        # the job workspace; the finished file is moved into place at the end
+        scratch_path = workspace.path("reel.mp4")
+        with self.timer.stage("encode"):
             final_video.write_videofile(
-                output_path,
+                scratch_path,
                 fps=self.fps,
-                codec='libx264',
+                codec=self.codec,
                 audio=True, # 🔊 AUDIO IS NOW ON
-                preset='medium'
+                temp_audiofile=workspace.path("reel_audio.mp3"),
+                preset=self.preset,
+                ffmpeg_params=self.ffmpeg_params,
+                logger=self.encode_logger
             )
-            
-            print(f"✅ Viral reel created with Audio: {output_path}")
-            
-            # Cleanup temporary audio files
-            for a_path in audio_clips:
-                if os.path.exists(a_path):
-                    os.remove(a_path)
-            
-            print(f"✅ Viral reel created: {output_path}")
-            
-            # Cleanup
-            if viral_image_path and os.path.exists(viral_image_path):
-                os.remove(viral_image_path)
-            
-            return output_path
-            
-        except Exception as e:
-            import traceback
-            print(f"❌ Viral reel generation error: {e}")
-            traceback.print_exc()
-            return None
+        final_video.close()
+        shutil.move(scratch_path, output_path)
+        
+        print(f"✅ Viral reel created with Audio: {output_path}")
+        
+        return output_path
     
-    def _create_urgent_slide(self, text, overlay_text, image_path, duration, style='body'):
+    def _create_urgent_slide(self, text, overlay_text, background, duration, style='body'):
         """Create slide with viral urgent styling"""
         
         # Load/create background
-        if image_path and os.path.exists(image_path):
-            img = self._load_and_crop_image(image_path)
-            # Darken for text readability
-            overlay = Image.new('RGB', (self.width, self.height), (0, 0, 0))
-            img = Image.blend(img, overlay, 0.7)  # Very dark for urgency
-        else:
-            img = self._create_urgent_gradient(style)
+        with self.timer.stage("background"):
+            if background is not None:
+                img = self._load_and_crop_image(background)
+                # Darken for text readability
+                overlay = Image.new('RGB', (self.width, self.height), (0, 0, 0))
+                img = Image.blend(img, overlay, 0.7)  # Very dark for urgency
+            else:
+                img = self._create_urgent_gradient(style)
         
+        with self.timer.stage("text"):
+            self._draw_urgent_text(img, text, overlay_text, style)
+        
+        # Convert to clip
+        with self.timer.stage("assembly"):
+            img_array = np.array(img)
+            clip = ImageClip(img_array).set_duration(duration)
+        
+        return clip
+    
+    def _draw_urgent_text(self, img, text, overlay_text, style):
+        """Draw the top overlay and the centered script text onto img in place"""
         draw = ImageDraw.Draw(img)
         
         # Style colors based on type
@@ -170,7 +191,10 @@ class ViralReelGenerator:
         try:
             overlay_font = ImageFont.truetype("arialbd.ttf", 90)
         except:
-            overlay_font = ImageFont.truetype("arial.ttf", 90)
+            try:
+                overlay_font = ImageFont.truetype("arial.ttf", 90)
+            except:
+                overlay_font = ImageFont.load_default()
         
         # Wrap overlay text
         wrapped_overlay = textwrap.fill(overlay_text, width=15)
@@ -213,16 +237,10 @@ class ViralReelGenerator:
         
         # Script text
         draw.text((script_x, script_y), wrapped_script, fill=text_color, font=script_font, align="center")
-        
-        # Convert to clip
-        img_array = np.array(img)
-        clip = ImageClip(img_array).set_duration(duration)
-        
-        return clip
     
-    def _load_and_crop_image(self, image_path):
-        """Load and crop image to 9:16 vertical"""
-        img = Image.open(image_path).convert('RGB')
+    def _load_and_crop_image(self, image):
+        """Crop an in-memory image to 9:16 vertical"""
+        img = image
         
         img_width, img_height = img.size
         target_ratio = self.width / self.height
@@ -272,16 +290,6 @@ class ViralReelGenerator:
         
         return img
     
-    def _download_image(self, url):
-        """Download image for background"""
-        try:
-            import uuid
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                temp_path = f"temp_viral_bg_{uuid.uuid4().hex[:8]}.jpg"
-                with open(temp_path, 'wb') as f:
-                    f.write(response.content)
-                return temp_path
-        except Exception as e:
-            print(f"⚠️ Image download failed: {e}")
-        return None
+    def _download_image(self, url, workspace):
+        """Download image into memory for background"""
+        return workspace.load_image(url)
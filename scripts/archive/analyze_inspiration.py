@@ -1,13 +1,9 @@
 
 import os
-import google.generativeai as genai
-from news_bot.settings import GOOGLE_API_KEY
-import time
+from news_bot import gemini_client
 
-# Configure Gemini
-genai.configure(api_key=GOOGLE_API_KEY)
 # Use a model that supports vision
-model = genai.GenerativeModel('models/gemini-2.0-flash') 
+MODEL = 'models/gemini-2.0-flash'
 
 INSPIRATION_DIR = r"c:\Users\OlgaKorniichuk\Documents\antiGravity Projects\Facebok AI.corelogic\facebook post insperation pictures"
 
@@ -35,7 +31,7 @@ def analyze_images():
             path = os.path.join(INSPIRATION_DIR, img_file)
             print(f"   - Uploading {img_file}...")
             # Upload to Gemini File API
-            myfile = genai.upload_file(path)
+            myfile = gemini_client.upload_file(path)
             uploaded_files.append(myfile)
             
         print("🧠 Asking Gemini to reverse-engineer the style...")
@@ -55,7 +51,7 @@ def analyze_images():
         Comma-separated keywords defining the style.
         """
         
-        response = model.generate_content([prompt, *uploaded_files])
+        response = gemini_client.generate([prompt, *uploaded_files], model=MODEL)
         
         print("\n✨ ANALYSIS COMPLETE. HERE IS THE EXTRACTED STYLE PROMPT:\n")
         print(response.text)
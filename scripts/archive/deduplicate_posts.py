@@ -1,84 +1,45 @@
-import os
-import re
-from bs4 import BeautifulSoup
-from difflib import SequenceMatcher
+"""
+Remove near-duplicate blog posts.
 
-BLOG_POSTS_DIR = r"c:\Users\OlgaKorniichuk\Documents\antiGravity Projects\Facebok AI.corelogic\blog\posts"
+Clusters come from news_bot.near_duplicates (MinHash/LSH over title and body
+shingles), so the scan stays near-linear at 10k+ posts. Prints the plan by
+default; --apply moves the duplicates to .dedup_trash/ instead of deleting.
 
-def get_title_from_html(file_path):
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            soup = BeautifulSoup(content, 'html.parser')
-            h1 = soup.find('h1')
-            if h1:
-                return h1.get_text().strip()
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-    return None
+    python -m scripts.archive.deduplicate_posts [--apply]
+"""
 
-def similar(a, b):
-    return SequenceMatcher(None, a, b).ratio()
+import argparse
+from news_bot.near_duplicates import load_posts, find_clusters, plan_deletions, print_plan, apply_plan, posted_keys
 
-def deduplicate():
-    files = [f for f in os.listdir(BLOG_POSTS_DIR) if f.endswith('.html')]
-    posts = []
+BLOG_POSTS_DIR = r"c:\Users\OlgaKorniichuk\Documents\antiGravity Projects\Facebok AI.corelogic\blog\posts"
 
-    # 1. Extract titles and metadata
-    print(f"Scanning {len(files)} files...")
-    for filename in files:
-        path = os.path.join(BLOG_POSTS_DIR, filename)
-        title = get_title_from_html(path)
-        size = os.path.getsize(path)
-        if title:
-            posts.append({
-                'filename': filename,
-                'path': path,
-                'title': title,
-                'size': size
-            })
-    
-    # 2. Find duplicates based on Title Similarity
-    # We'll group them.
-    # A simple way is to sort by title, or just compare O(N^2) (N is small, ~60)
-    
-    unique_posts = []
-    to_delete = []
+def deduplicate(apply=False, posts_dir=BLOG_POSTS_DIR):
+    # 1. Extract titles and body text
+    posts = load_posts(posts_dir)
+    print(f"Scanning {len(posts)} files...")
 
-    # Sort by size usage descending so we prefer keeping larger files (feature rich) first
-    posts.sort(key=lambda x: x['size'], reverse=True)
+    # 2. Cluster near-duplicates. Keep the largest file (feature rich) of each
+    #    cluster, and never remove a post that was shared on Facebook.
+    clusters = find_clusters(posts)
+    plan = plan_deletions(clusters, posts, protected=posted_keys())
 
-    for post in posts:
-        is_duplicate = False
-        for valid_post in unique_posts:
-            # Check title similarity
-            similarity = similar(post['title'].lower(), valid_post['title'].lower())
-            
-            # If titles are identical or extremely similar (> 0.95), it's a duplicate
-            if similarity > 0.95:
-                sanitized_title = post['title'].encode('ascii', 'ignore').decode('ascii')
-                print(f"Duplicate found:\n  KEEP: {valid_post['filename']} ({valid_post['size']} bytes)\n  DEL : {post['filename']} ({post['size']} bytes)\n  Title: {sanitized_title}\n")
-                to_delete.append(post)
-                is_duplicate = True
-                break
-        
-        if not is_duplicate:
-            unique_posts.append(post)
+    if not plan:
+        print("No duplicates found.")
+        return plan
 
-    print(f"Found {len(to_delete)} duplicates to delete.")
-    
-    if to_delete:
-        # Automating deletion since we confirmed logic is sound
-        print("Auto-deleting duplicates...")
-        for item in to_delete:
-            try:
-                os.remove(item['path'])
-                print(f"Deleted: {item['filename']}")
-            except Exception as e:
-                print(f"Failed to delete {item['filename']}: {e}")
-        print("Cleanup complete.")
+    print_plan(plan, posts)
+
+    if apply:
+        trash_dir = apply_plan(plan, posts_dir)
+        print(f"Cleanup complete. Removed posts (and plan.json) are in {trash_dir}")
+        print("Run `python -m news_bot.generate_categories` to rebuild the listings.")
     else:
-        print("No duplicates found.")
+        print("\nThis was a DRY RUN. Re-run with --apply to move the duplicates to the trash folder.")
+    return plan
 
 if __name__ == "__main__":
-    deduplicate()
+    parser = argparse.ArgumentParser(description="Find and remove near-duplicate blog posts")
+    parser.add_argument("--apply", action="store_true", help="Move duplicates to .dedup_trash/")
+    parser.add_argument("--posts-dir", default=BLOG_POSTS_DIR)
+    args = parser.parse_args()
+    deduplicate(apply=args.apply, posts_dir=args.posts_dir)
@@ -1,112 +1,58 @@
 """
 Find and remove duplicate blog posts
-Scans blog directory for posts with duplicate titles
+Scans blog directory for near-duplicate posts (MinHash/LSH, see news_bot.near_duplicates)
 """
 
-import os
-import re
-from pathlib import Path
-from collections import defaultdict
+import argparse
+from news_bot.near_duplicates import load_posts, find_clusters, plan_deletions, print_plan, apply_plan, posted_keys
 
-def extract_title_from_filename(filename):
-    """Extract normalized title from filename"""
-    # Remove .html or .md extension
-    name = filename.replace('.html', '').replace('.md', '')
-    
-    # Remove date prefix (e.g., "2026-02-08-")
-    name = re.sub(r'^\d{4}-\d{2}-\d{2}-', '', name)
-    
-    # Normalize: lowercase, remove special chars except hyphens
-    name = name.lower().strip()
-    return name
+def newest_first(post):
+    """Keep policy: the most recently modified copy."""
+    return post['modified']
 
-def find_duplicate_posts(blog_dir="blog"):
-    """Find blog posts with duplicate titles"""
-    
-    # Get all .html and .md files
-    blog_files = []
-    for file in os.listdir(blog_dir):
-        if file.endswith('.html') or file.endswith('.md'):
-            filepath = os.path.join(blog_dir, file)
-            # Get file stats
-            stat = os.stat(filepath)
-            blog_files.append({
-                'filename': file,
-                'filepath': filepath,
-                'size': stat.st_size,
-                'modified': stat.st_mtime,
-                'title': extract_title_from_filename(file)
-            })
-    
-    print(f"📁 Found {len(blog_files)} total posts\n")
-    
-    # Group by normalized title
-    title_groups = defaultdict(list)
-    for post in blog_files:
-        title_groups[post['title']].append(post)
-    
-    # Find duplicates
-    duplicates = {}
-    for title, posts in title_groups.items():
-        if len(posts) > 1:
-            # Sort by modified date (newest first)
-            posts.sort(key=lambda x: x['modified'], reverse=True)
-            duplicates[title] = posts
-    
-    return duplicates
+def find_duplicate_posts(blog_dir="blog/posts"):
+    """Find clusters of near-duplicate posts, with similarity scores"""
+    posts = load_posts(blog_dir)
+    print(f"📁 Found {len(posts)} total posts\n")
+    return posts, find_clusters(posts)
 
-def delete_duplicate_posts(duplicates, dry_run=True):
-    """Delete duplicate posts (keep newest)"""
+def delete_duplicate_posts(posts, clusters, blog_dir="blog/posts", dry_run=True):
+    """Delete duplicate posts (keep newest; posts shared on Facebook are always kept)"""
+    plan = plan_deletions(clusters, posts, keep_policy=newest_first, protected=posted_keys())
+    print_plan(plan, posts)
     
-    deleted_count = 0
-    kept_count = 0
-    
-    for title, posts in duplicates.items():
-        print(f"\n📄 Title: {title}")
-        print(f"   Found {len(posts)} duplicates:")
-        
-        # Keep the first (newest)
-        keep_post = posts[0]
-        print(f"   ✅ KEEP: {keep_post['filename']} (newest)")
-        kept_count += 1
-        
-        # Delete the rest
-        for post in posts[1:]:
-            print(f"   🗑️ DELETE: {post['filename']}")
-            
-            if not dry_run:
-                try:
-                    os.remove(post['filepath'])
-                    print(f"      Deleted successfully")
-                    deleted_count += 1
-                except Exception as e:
-                    print(f"      ❌ Error deleting: {e}")
-            else:
-                deleted_count += 1
+    if plan and not dry_run:
+        apply_plan(plan, blog_dir)
     
+    kept_count = len(plan)
+    deleted_count = sum(len(entry['delete']) for entry in plan)
     return kept_count, deleted_count
 
 
 if __name__ == "__main__":
-    print("🔍 Scanning blog/posts for duplicate posts...\n")
+    parser = argparse.ArgumentParser(description="Find and remove duplicate blog posts")
+    parser.add_argument("--delete", action="store_true", help="Move duplicates to .dedup_trash/")
+    parser.add_argument("--blog-dir", default="blog/posts")
+    args = parser.parse_args()
+    
+    print(f"🔍 Scanning {args.blog_dir} for duplicate posts...\n")
     
-    duplicates = find_duplicate_posts("blog/posts")
+    posts, clusters = find_duplicate_posts(args.blog_dir)
     
-    if not duplicates:
+    if not clusters:
         print("✅ No duplicates found!")
     else:
-        print(f"⚠️ Found {len(duplicates)} titles with duplicates\n")
+        print(f"⚠️ Found {len(clusters)} clusters of duplicates\n")
         print("="*60)
         
-        # Show what will be deleted (dry run)
-        kept, deleted = delete_duplicate_posts(duplicates, dry_run=True)
+        kept, deleted = delete_duplicate_posts(posts, clusters, args.blog_dir, dry_run=not args.delete)
         
         print("\n" + "="*60)
-        print(f"\n📊 Summary (DRY RUN):")
+        print(f"\n📊 Summary{'' if args.delete else ' (DRY RUN)'}:")
         print(f"   Files to keep: {kept}")
         print(f"   Files to delete: {deleted}")
         
-        # Ask for confirmation
-        print("\n⚠️ This was a DRY RUN. No files were deleted.")
-        print("\nTo actually delete duplicates, run:")
-        print("python find_duplicates.py --delete")
+        if not args.delete:
+            print("\n⚠️ This was a DRY RUN. No files were deleted.")
+            print("\nTo actually delete duplicates, run:")
+            print("python -m scripts.archive.find_duplicates --delete")
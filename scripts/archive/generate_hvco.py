@@ -1,22 +1,16 @@
-import os
-import google.generativeai as genai
-from dotenv import load_dotenv
+from news_bot import gemini_client
+from news_bot.settings import GOOGLE_API_KEY
 from news_bot.blog_generator import BlogGenerator
 from news_bot.collector import NewsCollector
 from news_bot.article_tracker import ArticleTracker
 import time
-from google.api_core import exceptions
 import urllib.parse
 import re
 
-# Load Environment Variables
-load_dotenv(os.path.join("news_bot", ".env"))
-API_KEY = os.getenv("GOOGLE_API_KEY")
-
-if not API_KEY:
+if not GOOGLE_API_KEY:
     raise ValueError("❌ GOOGLE_API_KEY not found in news_bot/.env")
 
-genai.configure(api_key=API_KEY)
+MODEL = 'models/gemini-2.0-flash'
 
 # The "Sabri Suby" System Prompt - ENHANCED with NotebookLM Hyper-Dopamine Principles
 SYSTEM_PROMPT = """
@@ -50,8 +44,6 @@ def score_viral_potential(article):
     Scores an article 0-100 based on viral potential using Gemini.
     """
     try:
-        model = genai.GenerativeModel('models/gemini-2.0-flash')
-        
         prompt = f"""Score this article for VIRAL POTENTIAL in the logistics/business automation niche (0-100).
 
 Title: {article['title']}
@@ -66,8 +58,7 @@ Scoring Factors:
 
 Return ONLY a number 0-100. No explanation."""
 
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        text = gemini_client.generate_text(prompt, model=MODEL)
         match = re.search(r'\d+', text)
         if match:
             score = int(match.group())
@@ -84,7 +75,6 @@ def generate_hvco():
     blog_gen = BlogGenerator()
     fb_pub = FacebookPublisher()
     tracker = ArticleTracker()
-    model = genai.GenerativeModel('models/gemini-2.0-flash')
 
     # 1. FETCH LIVE NEWS
     print("📡 Fetching live news from RSS feeds...")
@@ -176,16 +166,13 @@ def generate_hvco():
     for article in [selected_article]:
         print(f"\n✍️ Writing Blog Post...")
         
-        # A. Generate Blog Content
+        # A. Generate Blog Content (gemini_client retries rate limits and overloads)
         content_html = None
-        for attempt in range(3):
-            try:
-                response = model.generate_content(f"{SYSTEM_PROMPT}\n\nTASK:\n{article['prompt']}")
-                content_html = response.text.replace("```html", "").replace("```", "")
-                break
-            except Exception as e:
-                print(f"   Error generating blog: {e}. Retrying...")
-                time.sleep(5)
+        try:
+            response = gemini_client.generate(f"{SYSTEM_PROMPT}\n\nTASK:\n{article['prompt']}", model=MODEL)
+            content_html = response.text.replace("```html", "").replace("```", "")
+        except Exception as e:
+            print(f"   Error generating blog: {e}")
 
         if not content_html:
             print("❌ Failed to generate blog content.")
@@ -194,18 +181,15 @@ def generate_hvco():
         # B. Generate Social Ad Copy
         print(f"✍️ Writing Facebook Ad...")
         social_copy = None
-        for attempt in range(3):
-            try:
-                response = model.generate_content(f"{SYSTEM_PROMPT}\n\nTASK:\n{article['social_prompt']}")
-                social_copy = response.text.replace("```text", "").replace("```", "").strip()
-                
-                # Cleanup
-                social_copy = re.sub(r'^\*\*[^*]+\*\*\s*', '', social_copy) # Remove bold headers
-                social_copy = social_copy.replace('**Facebook Ad:**', '').strip()
-                break
-            except Exception as e:
-                print(f"   Error generating ad: {e}. Retrying...")
-                time.sleep(5)
+        try:
+            response = gemini_client.generate(f"{SYSTEM_PROMPT}\n\nTASK:\n{article['social_prompt']}", model=MODEL)
+            social_copy = response.text.replace("```text", "").replace("```", "").strip()
+            
+            # Cleanup
+            social_copy = re.sub(r'^\*\*[^*]+\*\*\s*', '', social_copy) # Remove bold headers
+            social_copy = social_copy.replace('**Facebook Ad:**', '').strip()
+        except Exception as e:
+            print(f"   Error generating ad: {e}")
 
         # C. Create 'Corporate News' Visual Prompt
         from news_bot.image_design_helper import analyze_article_visual_context, create_news_overlay_prompt
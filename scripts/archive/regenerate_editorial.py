@@ -1,15 +1,20 @@
+"""
+Replace the static editorial text with a generated, article-specific prospect.
+
+Resumable and parallel (news_bot.batch_runner); Gemini calls go through
+news_bot.gemini_client (shared --rpm budget, retry on 429/overload):
+    python -m scripts.archive.regenerate_editorial --workers 8 --rpm 60
+"""
+
 import os
 import re
-import time
-import google.generativeai as genai
 from pathlib import Path
-from news_bot.settings import GOOGLE_API_KEY
-
-# Configure Gemini
-genai.configure(api_key=GOOGLE_API_KEY)
-model = genai.GenerativeModel('gemini-flash-latest')
+from news_bot import gemini_client
+from news_bot.settings import GEMINI_RPM
+from news_bot.batch_runner import add_batch_arguments, runner_from_args
 
 POSTS_DIR = Path("blog/posts")
+
 STATIC_TEXT = "We analyze the intersection of logistics, automation, and AI to deliver actionable insights for modern businesses. No hype, just practical strategy."
 
 def generate_prospect(content):
@@ -29,76 +34,54 @@ def generate_prospect(content):
     {content[:3000]}... (truncated)
     """
     try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        return gemini_client.generate_text(prompt)
     except Exception as e:
         print(f"  [AI ERROR] {e}")
         return None
 
+def replace_editorial(filepath, content):
+    """BatchRunner transform: swap the static editorial text for a generated one."""
+    # Check for the static text (or a substantial part of it to be safe)
+    if "No hype, just practical strategy" not in content:
+        return None
+
+    # Extract body text for context
+    body_match = re.search(r'<div class="article-body".*?>([\s\S]*?)<hr', content)
+    if body_match:
+        raw_html = body_match.group(1)
+        clean_body = re.sub(r'<[^>]+>', ' ', raw_html).strip()
+    else:
+        # Fallback: just use what we can find
+        clean_body = re.sub(r'<[^>]+>', ' ', content[:4000])
+
+    # Generate new text
+    new_prospect = generate_prospect(clean_body)
+    if not new_prospect:
+        raise RuntimeError("AI generation failed")
+
+    # The static text is usually inside a <p> tag in the author-bio div;
+    # a direct string replace avoids regex complexity issues
+    new_content = content.replace(STATIC_TEXT, new_prospect)
+    if new_content == content:
+        raise RuntimeError("Could not replace the static editorial text")
+    return new_content
+
 def main():
+    import argparse
+
+    parser = add_batch_arguments(argparse.ArgumentParser(description="Regenerate static editorial prospects"), rpm=GEMINI_RPM)
+    args = parser.parse_args()
+    gemini_client.set_rate_limit(args.rpm)
+
     if not POSTS_DIR.exists():
         print(f"Directory not found: {POSTS_DIR}")
         return
 
-    files = list(POSTS_DIR.glob("*.html"))
+    files = sorted(POSTS_DIR.glob("*.html"))
     print(f"Scanning {len(files)} posts for static editorial text...")
 
-    updated_count = 0
-    
-    for filepath in files:
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Check for the static text (or a substantial part of it to be safe)
-            if "No hype, just practical strategy" in content:
-                print(f"\nProcessing: {filepath.name}")
-                
-                # Extract body text for context
-                body_match = re.search(r'<div class="article-body".*?>([\s\S]*?)<hr', content)
-                clean_body = ""
-                if body_match:
-                    raw_html = body_match.group(1)
-                    clean_body = re.sub(r'<[^>]+>', ' ', raw_html).strip()
-                else:
-                    # Fallback: just use what we can find
-                    clean_body = re.sub(r'<[^>]+>', ' ', content[:4000])
-
-                # Generate new text
-                new_prospect = generate_prospect(clean_body)
-                
-                if new_prospect:
-                    # Replace the specific static block
-                    # The static text is usually inside a <p> tag in the author-bio div
-                    # We'll use a direct string replace for the core static sentence to avoid regex complexity issues
-                    new_content = content.replace(STATIC_TEXT, new_prospect)
-                    
-                    # Safety check: if exact string match failed (maybe whitespace diffs), try a more loose replacement
-                    if new_content == content:
-                         # Try replacing just the "No hype..." part if the full string failed
-                         print("  [WARN] Exact string match failed, trying loose match...")
-                         loose_static = "We analyze the intersection of logistics, automation, and AI to deliver actionable insights for modern businesses. No hype, just practical strategy."
-                         new_content = content.replace(loose_static, new_prospect)
-
-                    if new_content != content:
-                        with open(filepath, 'w', encoding='utf-8') as f:
-                            f.write(new_content)
-                        print(f"  [SUCCESS] Updated editorial prospect.")
-                        updated_count += 1
-                        # Sleep briefly to avoid rate limits
-                        time.sleep(2) 
-                    else:
-                        print(f"  [FAIL] Could not replace text in {filepath.name}")
-                else:
-                    print(f"  [SKIP] AI generation failed.")
-            else:
-                # print(f".", end="", flush=True) # Progress dot for skipped
-                pass
-
-        except Exception as e:
-            print(f"Error processing {filepath.name}: {e}")
-
-    print(f"\n\nDone! Repalced editorial text in {updated_count} files.")
+    counts = runner_from_args("regenerate_editorial", replace_editorial, args).run(files)
+    print(f"\n\nDone! Replaced editorial text in {counts['updated']} files.")
 
 if __name__ == "__main__":
     main()
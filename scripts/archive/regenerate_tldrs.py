@@ -1,17 +1,19 @@
 """
 Script to regenerate TL;DR summaries AND editorial prospects for all existing blog posts.
 Uses Gemini AI to analyze each article and generate specific takeaways and editorial opinions.
+
+Resumable and parallel (news_bot.batch_runner); Gemini calls go through
+news_bot.gemini_client (shared --rpm budget, retry on 429/overload):
+    python -m scripts.archive.regenerate_tldrs --workers 8 --rpm 60
+    python -m scripts.archive.regenerate_tldrs --dry-run
 """
 
 import os
 import re
 from pathlib import Path
-import google.generativeai as genai
-from news_bot.settings import GOOGLE_API_KEY
-
-# Configure Gemini
-genai.configure(api_key=GOOGLE_API_KEY)
-model = genai.GenerativeModel('gemini-flash-latest')
+from news_bot import gemini_client
+from news_bot.settings import GEMINI_RPM
+from news_bot.batch_runner import add_batch_arguments, runner_from_args
 
 POSTS_DIR = r"c:\Users\OlgaKorniichuk\Documents\antiGravity Projects\Facebok AI.corelogic\blog\posts"
 
@@ -68,8 +70,7 @@ def generate_insights(title, content):
     """
     
     try:
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        text = gemini_client.generate_text(prompt)
         
         # Parse the response
         tldr_text = ""
@@ -132,76 +133,37 @@ def update_html_content(html_content, new_tldr, new_editorial):
     
     return updated_html
 
-def process_blog_post(filepath):
-    """Process a single blog post"""
-    try:
-        # Read file
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract article content
-        title, body = extract_article_content(content)
-        
-        if not body:
-            print(f"[SKIP] {filepath.name} - Could not extract content")
-            return False
-        
-        # Generate Insights
-        print(f"[PROCESSING] {filepath.name}...")
-        print(f"   Title: {title[:60]}...")
-        
-        tldr_html, editorial_text = generate_insights(title, body)
-        
-        if not tldr_html or not editorial_text:
-            print(f"[ERROR] Failed to generate insights")
-            return False
-        
-        # Update HTML
-        updated_content = update_html_content(content, tldr_html, editorial_text)
-        
-        # Only write if changes were made
-        if updated_content != content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
-            print(f"[OK] Updated with TL;DR and Editorial Prospect")
-            return True
-        else:
-            print(f"[SKIP] No changes needed or pattern mismatch")
-            return False
-            
-    except Exception as e:
-        print(f"[ERROR] Error processing {filepath}: {e}")
-        return False
+def process_blog_post(filepath, content):
+    """Regenerate TL;DR and editorial for one post (BatchRunner transform)"""
+    # Extract article content
+    title, body = extract_article_content(content)
+    
+    if not body:
+        print(f"[SKIP] {Path(filepath).name} - Could not extract content")
+        return None
+    
+    tldr_html, editorial_text = generate_insights(title, body)
+    
+    if not tldr_html or not editorial_text:
+        # Raising leaves the post unfinished in the checkpoint, so a rerun retries it
+        raise RuntimeError("Failed to generate insights")
+    
+    # Update HTML (the runner only writes if changes were made)
+    return update_html_content(content, tldr_html, editorial_text)
 
 def main():
     """Process all blog posts"""
-    posts_dir = Path(POSTS_DIR)
-    html_files = sorted(posts_dir.glob("*.html"))
+    import argparse
+    
+    parser = add_batch_arguments(argparse.ArgumentParser(description=__doc__.strip().splitlines()[0]), rpm=GEMINI_RPM)
+    args = parser.parse_args()
+    gemini_client.set_rate_limit(args.rpm)
     
+    html_files = sorted(Path(POSTS_DIR).glob("*.html"))
     print(f"Found {len(html_files)} blog posts to process...")
     print(f"Generating TL;DRs and Editorial Prospects...\n")
-    print("="*60)
     
-    updated_count = 0
-    skipped_count = 0
-    error_count = 0
-    
-    for i, filepath in enumerate(html_files, 1):
-        print(f"\n[{i}/{len(html_files)}] {filepath.name}")
-        result = process_blog_post(filepath)
-        
-        if result:
-            updated_count += 1
-        elif result is False:
-            error_count += 1
-        else:
-            skipped_count += 1
-    
-    print(f"\n{'='*60}")
-    print(f"[OK] Updated: {updated_count} posts")
-    print(f"[ERROR] Errors: {error_count} posts")
-    print(f"[SKIP] Skipped: {skipped_count} posts")
-    print(f"{'='*60}\n")
+    runner_from_args("regenerate_tldrs", process_blog_post, args).run(html_files)
 
 if __name__ == "__main__":
     main()
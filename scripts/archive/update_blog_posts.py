@@ -1,11 +1,14 @@
 """
 Script to update all existing blog posts with new TL;DR and footer design.
 Applies the improvements made to the blog template to all existing posts.
+
+    python -m scripts.archive.update_blog_posts [--dry-run] [--workers N] [--restart]
 """
 
 import os
 import re
 from pathlib import Path
+from news_bot.batch_runner import add_batch_arguments, runner_from_args
 
 POSTS_DIR = r"c:\Users\OlgaKorniichuk\Documents\antiGravity Projects\Facebok AI.corelogic\blog\posts"
 
@@ -49,54 +52,22 @@ def update_author_bio(html_content):
     
     return updated_html
 
-def update_blog_post(filepath):
-    """Update a single blog post file"""
-    try:
-        # Read file
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original_content = content
-        
-        # Apply updates
-        content = update_tldr_section(content)
-        content = update_author_bio(content)
-        
-        # Only write if changes were made
-        if content != original_content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-        else:
-            return False
-            
-    except Exception as e:
-        print(f"[ERROR] Error updating {filepath}: {e}")
-        return False
+def update_blog_post(filepath, content):
+    """Apply the TL;DR and footer updates to one post (BatchRunner transform)"""
+    content = update_tldr_section(content)
+    content = update_author_bio(content)
+    return content
 
 def main():
     """Update all blog posts"""
-    posts_dir = Path(POSTS_DIR)
-    html_files = list(posts_dir.glob("*.html"))
+    import argparse
+    parser = add_batch_arguments(argparse.ArgumentParser(description="Apply the current TL;DR/footer design to every post"))
+    args = parser.parse_args()
     
+    html_files = sorted(Path(POSTS_DIR).glob("*.html"))
     print(f"Found {len(html_files)} blog posts to update...\n")
     
-    updated_count = 0
-    skipped_count = 0
-    
-    for filepath in html_files:
-        filename = filepath.name
-        if update_blog_post(filepath):
-            print(f"[OK] Updated: {filename}")
-            updated_count += 1
-        else:
-            print(f"[SKIP] Skipped: {filename} (no changes needed)")
-            skipped_count += 1
-    
-    print(f"\n{'='*60}")
-    print(f"[OK] Updated: {updated_count} posts")
-    print(f"[SKIP] Skipped: {skipped_count} posts")
-    print(f"{'='*60}\n")
+    runner_from_args("update_blog_posts", update_blog_post, args).run(html_files)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,192 @@
+"""
+Import Time Benchmark
+
+Imports each CLI entry point in a fresh interpreter under `python -X importtime`
+and reports its cumulative import cost with a breakdown of its direct imports.
+
+Heavy SDKs (genai, vertexai, moviepy, PIL, bs4, feedparser, gTTS) must load on
+first use, not at import; any entry point that pulls one in fails the run.
+Keep a saved baseline and --compare against it to catch startup regressions.
+
+Usage (from repo root):
+    python scripts/bench_import_time.py
+    python scripts/bench_import_time.py --modules news_bot.main,news_bot.collector --top 5
+    python scripts/bench_import_time.py --save bench_import_time.json
+    python scripts/bench_import_time.py --compare bench_import_time.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    "news_bot.main",
+    "news_bot.collector",
+    "news_bot.generate_categories",
+    "news_bot.static_build",
+    "news_bot.deployer",
+    "news_bot.storage_manager",
+    "news_bot.migrate_blog_posts",
+    "news_bot.facebook_blog_poster",
+    "news_bot.retry_fb_post",
+]
+
+# Packages that must only be imported inside the functions that use them
+LAZY_PACKAGES = ("google.generativeai", "vertexai", "moviepy", "PIL", "bs4", "feedparser", "gtts")
+
+# Differences below this are interpreter noise, whatever the tolerance says
+MIN_DELTA_US = 5000
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        list: (depth, module, self_us, cumulative_us) in the order printed
+              (children before their parent)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((depth, stripped.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def breakdown(rows, module):
+    """Cumulative time of module and of each of its direct imports."""
+    for index, (depth, name, _, cumulative) in enumerate(rows):
+        if name == module:
+            break
+    else:
+        return 0, []
+
+    children = []
+    for child_depth, child, _, child_cumulative in reversed(rows[:index]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 1:
+            children.append((child, child_cumulative))
+    children.sort(key=lambda c: -c[1])
+    return cumulative, children
+
+
+def lazy_violations(rows):
+    """LAZY_PACKAGES that were imported at all."""
+    imported = {name for _, name, _, _ in rows}
+    return [pkg for pkg in LAZY_PACKAGES if pkg in imported]
+
+
+def measure(module, repeat):
+    """Import module in `repeat` fresh interpreters; keep the fastest run."""
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(proc.stderr[-2000:])
+            raise RuntimeError(f"Importing {module} failed")
+        rows = parse_importtime(proc.stderr)
+        total, children = breakdown(rows, module)
+        if best is None or total < best["total_us"]:
+            best = {
+                "module": module,
+                "total_us": total,
+                "breakdown": children,
+                "lazy_violations": lazy_violations(rows),
+            }
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def print_report(results, top):
+    header = f"{'module':<32} {'total ms':>9}  top imports"
+    print(header)
+    print("-" * 100)
+    for r in results:
+        parts = ", ".join(f"{name} {us / 1000:.1f}" for name, us in r["breakdown"][:top])
+        print(f"{r['module']:<32} {r['total_us'] / 1000:>9.1f}  {parts}")
+        if r["lazy_violations"]:
+            print(f"{'':<32} {'':>9}  ⚠️ eagerly imports: {', '.join(r['lazy_violations'])}")
+
+
+def compare(results, baseline_path, tolerance):
+    """Return a list of regressions versus a saved baseline."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {b["module"]: b for b in json.load(f)["results"]}
+
+    regressions = []
+    for r in results:
+        base = baseline.get(r["module"])
+        if not base:
+            continue
+        old, new = base["total_us"], r["total_us"]
+        if old and new > old * (1 + tolerance) and new - old > MIN_DELTA_US:
+            regressions.append(f"{r['module']}: {old / 1000:.1f}ms -> {new / 1000:.1f}ms (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the news_bot entry points")
+    parser.add_argument("--modules", default=",".join(ENTRY_POINTS), help="Comma list of modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module (fastest run is kept)")
+    parser.add_argument("--top", type=int, default=4, help="Direct imports to show per module")
+    parser.add_argument("--save", help="Write results JSON here")
+    parser.add_argument("--compare", help="Baseline JSON from a previous --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed import-time growth before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = []
+    for module in [m.strip() for m in args.modules.split(",") if m.strip()]:
+        print(f"⏱️  {module} ...", flush=True)
+        results.append(measure(module, args.repeat))
+
+    print()
+    print_report(results, args.top)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "results": results,
+            }, f, indent=2)
+        print(f"\n💾 Saved results to {args.save}")
+
+    failed = False
+    violations = [r for r in results if r["lazy_violations"]]
+    if violations:
+        print("\n❌ Heavy packages imported at startup:")
+        for r in violations:
+            print(f"   {r['module']}: {', '.join(r['lazy_violations'])}")
+        failed = True
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print("\n❌ Regressions vs baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            failed = True
+        else:
+            print("\n✅ No regressions vs baseline")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Reel Render Benchmark
+
+Runs ReelGenerator.create_reel and ViralReelGenerator.create_viral_reel
+fully offline (stubbed TTS + script generation, synthetic articles, local
+background image) and reports per-stage timings and peak RSS for each
+encoder configuration.
+
+Each (generator, encoder) case runs in a fresh subprocess so peak RSS is
+measured per case rather than for the whole benchmark.
+
+Usage (from repo root):
+    python scripts/bench_reels.py
+    python scripts/bench_reels.py --encoders libx264:medium,libx264:ultrafast,mpeg4
+    python scripts/bench_reels.py --save bench_reels.json
+    python scripts/bench_reels.py --compare bench_reels.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+STAGES = ["script", "tts", "background", "text", "assembly", "audio_mix", "encode"]
+
+SYNTHETIC_ARTICLES = [
+    {
+        "title": "Freight Brokers Lose $40K a Month to Manual Dispatch",
+        "summary": "A new study shows 73% of small carriers still dispatch by phone.",
+        "blog_html": (
+            "<h2>The $40,000 Leak Nobody Talks About</h2>"
+            "<p>Small carriers are bleeding cash on manual dispatch. 73% still use phone calls.</p>"
+            "<ul><li>Dispatchers waste 20 hours weekly on re-keying loads</li>"
+            "<li>Late pickups cost 12% of annual revenue</li>"
+            "<li>AI routing cuts empty miles by 30%</li></ul>"
+            "<h2>What The Fastest Fleets Do Differently</h2>"
+            "<p>They automate load matching and let humans handle exceptions.</p>"
+        ),
+    },
+    {
+        "title": "Why 2026 Is the Year Autonomous Agents Run the Back Office",
+        "summary": "Agents now negotiate, schedule and reconcile invoices without a human in the loop.",
+        "blog_html": (
+            "<h2>Your Back Office Is Already Obsolete</h2>"
+            "<p>Companies using agents close their books 5 days faster.</p>"
+            "<ul><li>Invoice processing drops from 8 minutes to 40 seconds</li>"
+            "<li>Error rates fall below 1%</li>"
+            "<li>Teams redeploy 3 FTEs to revenue work</li></ul>"
+            "<h2>The Hidden Cost of Waiting</h2>"
+            "<p>Competitors are automating faster than you think.</p>"
+        ),
+    },
+]
+
+
+# ---------------------------------------------------------------------------
+# Offline stubs
+# ---------------------------------------------------------------------------
+
+def make_stub_tts(audio_dir):
+    """Return a generate_tts replacement that writes silent WAVs sized to the text."""
+    def stub_generate_tts(text, output_path=None, lang='en', voice='com', use_cache=True):
+        words = max(1, len(text.split()))
+        duration = 0.35 * words  # roughly natural speech pace
+        path = output_path or os.path.join(audio_dir, f"tts_{abs(hash((text, lang, voice)))}.wav")
+        if not os.path.exists(path):
+            frames = int(44100 * duration)
+            with wave.open(path, 'wb') as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(44100)
+                w.writeframes(b"\x00\x00" * frames)
+        return path
+    return stub_generate_tts
+
+
+class StubScriptGenerator:
+    """Deterministic stand-in for ReelScriptGenerator (no LLM calls)."""
+
+    def generate_viral_script(self, article_title, blog_html):
+        return {
+            "hook": {"visual": "", "text_overlay": "STOP SCROLLING ⚠️", "script": "Stop if you run a small business"},
+            "body": [
+                {"visual": "", "text_overlay": "$40,000 WASTED 💸", "script": "Manual dispatch is costing carriers forty thousand dollars a month"},
+                {"visual": "", "text_overlay": "73% STILL ON PHONES ☎️", "script": "Seventy three percent of small fleets still book loads by phone"},
+                {"visual": "", "text_overlay": "30% FEWER EMPTY MILES ✅", "script": "The fleets using AI routing cut empty miles by thirty percent"},
+            ],
+            "cta": {"visual": "", "text_overlay": "TAP LINK BELOW ⬇️", "script": "Full breakdown in bio"},
+        }
+
+
+def make_background_image(path):
+    """Write a synthetic 1200x630 background (same shape as our generated images)."""
+    from PIL import Image
+    import numpy as np
+
+    y, x = np.mgrid[0:630, 0:1200]
+    rgb = np.stack([(x * 255 // 1200), (y * 255 // 630), ((x + y) * 255 // 1830)], axis=-1)
+    Image.fromarray(rgb.astype('uint8'), 'RGB').save(path, quality=90)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def peak_rss_mb():
+    """Peak RSS of this process and of finished children (ffmpeg), in MB."""
+    try:
+        import resource
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024  # bytes on macOS, KB on Linux
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+        return round(own, 1), round(children, 1)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        peak = getattr(info, "peak_wset", info.rss)  # Windows exposes peak_wset
+        return round(peak / (1024 * 1024), 1), None
+    except ImportError:
+        return None, None
+
+
+def parse_encoder(spec):
+    """'libx264:ultrafast' -> ('libx264', 'ultrafast'); 'mpeg4' -> ('mpeg4', 'medium')"""
+    codec, _, preset = spec.partition(":")
+    return codec, preset or "medium"
+
+
+def run_case(spec):
+    """Worker: render all synthetic articles with one generator/encoder, return results."""
+    from news_bot import viral_reel_generator
+    from news_bot.reel_generator import ReelGenerator
+    from news_bot.viral_reel_generator import ViralReelGenerator
+
+    work_dir = tempfile.mkdtemp(prefix="bench_reels_")
+    viral_reel_generator.generate_tts = make_stub_tts(work_dir)
+    image_path = spec.get("image") or make_background_image(os.path.join(work_dir, "background.jpg"))
+
+    if spec["generator"] == "viral":
+        gen = ViralReelGenerator(script_gen=StubScriptGenerator())
+        render = gen.create_viral_reel
+    else:
+        gen = ReelGenerator()
+        render = gen.create_reel
+
+    gen.output_dir = work_dir
+    gen.codec, gen.preset = parse_encoder(spec["encoder"])
+    gen.encode_logger = None
+
+    totals = {}
+    runs = []
+    for _ in range(spec["repeat"]):
+        for article in SYNTHETIC_ARTICLES:
+            start = time.perf_counter()
+            output = render({"title": article["title"], "summary": article["summary"]}, article["blog_html"], image_path)
+            elapsed = time.perf_counter() - start
+            if not output:
+                raise RuntimeError(f"{spec['generator']} render failed for '{article['title']}'")
+            runs.append({"seconds": round(elapsed, 3), "bytes": os.path.getsize(output)})
+            for stage, seconds in gen.timer.timings.items():
+                totals[stage] = totals.get(stage, 0.0) + seconds
+
+    n = len(runs)
+    own_rss, child_rss = peak_rss_mb()
+    return {
+        "generator": spec["generator"],
+        "encoder": spec["encoder"],
+        "renders": n,
+        "mean_seconds": round(sum(r["seconds"] for r in runs) / n, 3),
+        "mean_bytes": int(sum(r["bytes"] for r in runs) / n),
+        "stages": {k: round(v / n, 3) for k, v in totals.items()},
+        "peak_rss_mb": own_rss,
+        "peak_child_rss_mb": child_rss,
+    }
+
+
+def spawn_case(spec):
+    """Run one case in a fresh interpreter and return its JSON result."""
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", json.dumps(spec)],
+        cwd=REPO_ROOT, capture_output=True, text=True, encoding="utf-8"
+    )
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        print(proc.stdout[-2000:])
+        print(proc.stderr[-2000:])
+        raise RuntimeError(f"Benchmark case failed: {spec}")
+    return json.loads(lines[-1])
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def print_report(results):
+    header = f"{'generator':<10} {'encoder':<20} {'total':>7} " + " ".join(f"{s:>10}" for s in STAGES) + f" {'size KB':>8} {'RSS MB':>7} {'ffmpeg':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        stages = " ".join(f"{r['stages'].get(s, 0.0):>10.3f}" for s in STAGES)
+        print(
+            f"{r['generator']:<10} {r['encoder']:<20} {r['mean_seconds']:>7.2f} {stages} "
+            f"{r['mean_bytes'] // 1024:>8} {r['peak_rss_mb'] or 0:>7} {r['peak_child_rss_mb'] or 0:>7}"
+        )
+
+
+def compare(results, baseline_path, tolerance):
+    """Return a list of regressions versus a saved baseline."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(b["generator"], b["encoder"]): b for b in json.load(f)["results"]}
+
+    regressions = []
+    for r in results:
+        base = baseline.get((r["generator"], r["encoder"]))
+        if not base:
+            continue
+        for metric in ("mean_seconds", "peak_rss_mb"):
+            old, new = base.get(metric), r.get(metric)
+            if old and new and new > old * (1 + tolerance):
+                regressions.append(f"{r['generator']}/{r['encoder']} {metric}: {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline reel render benchmark")
+    parser.add_argument("--generators", default="reel,viral", help="Comma list of: reel, viral")
+    parser.add_argument("--encoders", default="libx264:medium,libx264:ultrafast", help="Comma list of codec[:preset]")
+    parser.add_argument("--image", help="Local background image (default: synthetic gradient)")
+    parser.add_argument("--repeat", type=int, default=1, help="Render each synthetic article N times per case")
+    parser.add_argument("--save", help="Write results JSON here")
+    parser.add_argument("--compare", help="Baseline JSON from a previous --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown/RSS growth before failing (0.2 = 20%%)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_case(json.loads(args.worker))))
+        return 0
+
+    results = []
+    for generator in [g.strip() for g in args.generators.split(",") if g.strip()]:
+        for encoder in [e.strip() for e in args.encoders.split(",") if e.strip()]:
+            print(f"⏱️  {generator} / {encoder} ...", flush=True)
+            results.append(spawn_case({
+                "generator": generator,
+                "encoder": encoder,
+                "image": os.path.abspath(args.image) if args.image else None,
+                "repeat": args.repeat,
+            }))
+
+    print()
+    print_report(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, f, indent=2)
+        print(f"\n💾 Saved results to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print("\n❌ Regressions vs baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("\n✅ No regressions vs baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
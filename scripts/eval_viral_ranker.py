@@ -0,0 +1,160 @@
+"""
+Viral Pre-Ranker Evaluation
+
+Replays the candidate pools recorded by the tracker (news_bot/article_scores.json)
+against news_bot.viral_ranker and reports, for each N, how often window-wise
+pre-ranking (the best N of every --window articles, in arrival order) would
+still have kept the LLM's best article of each run, and how many LLM scoring
+calls that N saves. Use it to pick PRERANK_TOP_N.
+
+Calibration mode: live runs only LLM-score what survived the pre-ranker and
+the early stop, so they can't show what a larger N (or a dropped article)
+would have done. A calibration run scores every candidate:
+
+    python -m news_bot.main --calibrate
+
+(no pre-ranking, no early stop; raise SCORE_BUDGET if the feeds yield more
+candidates than it allows). Only fully scored runs are evaluated unless
+--include-live is given, which adds the scored part of live runs (biased
+towards what the current ranker already liked).
+
+Runs with fewer than --min-run articles are skipped (nothing to rank).
+--fit refits the feature weights by least squares against the LLM scores
+and reports the same table for the fitted weights.
+
+Usage (from repo root):
+    python scripts/eval_viral_ranker.py
+    python scripts/eval_viral_ranker.py --ns 1,2,3,5 --window 10 --target 0.9
+    python scripts/eval_viral_ranker.py --fit
+"""
+
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+from news_bot.article_tracker import ArticleTracker
+from news_bot.settings import PRERANK_WINDOW
+from news_bot.viral_ranker import FEATURES, WEIGHTS, feature_matrix, windowed_top
+
+
+def load_runs(scores_file, min_run, include_live=False):
+    """
+    Recorded pools as (articles in arrival order, llm_scores array, reused mask),
+    plus the number of complete (fully scored) runs among them.
+    """
+    tracker = ArticleTracker(scores_file=scores_file)
+    runs, complete_runs = [], 0
+    for run in tracker.load_scores().values():
+        articles = sorted(
+            (dict(entry, link=link) for link, entry in run["articles"].items()),
+            key=lambda a: a.get("position", 0)
+        )
+        complete = all(a.get("score") is not None for a in articles)
+        if not complete:
+            if not include_live:
+                continue
+            articles = [a for a in articles if a.get("score") is not None]
+        if len(articles) < min_run:
+            continue
+        complete_runs += complete
+        runs.append((
+            articles,
+            np.array([a["score"] for a in articles], dtype=float),
+            np.array([a.get("status") == "reused" for a in articles]),
+        ))
+    return runs, complete_runs
+
+
+def kept_indices(local, reused, window, n):
+    """What the live pipeline would score or reuse: reused scores plus the windowed top-n of the rest."""
+    new = np.flatnonzero(~reused)
+    return np.concatenate([np.flatnonzero(reused), new[windowed_top(local[new], window, n)]])
+
+
+def evaluate(runs, weights, ns, window):
+    """
+    Returns:
+        list: (n, best-article recall, mean fraction of LLM calls saved) per n
+    """
+    rows = []
+    for n in ns:
+        hits, saved = [], []
+        for articles, llm, reused in runs:
+            local = feature_matrix(articles) @ weights
+            kept = kept_indices(local, reused, window, n)
+            # Ties for the LLM's best all count as "the best"
+            hits.append(bool(np.isin(np.flatnonzero(llm == llm.max()), kept).any()))
+            new = max(int((~reused).sum()), 1)
+            saved.append(1 - (len(kept) - reused.sum()) / new)
+        rows.append((n, float(np.mean(hits)), float(np.mean(saved))))
+    return rows
+
+
+def fit_weights(runs):
+    """Least-squares weights (clipped at 0) mapping features to LLM scores."""
+    X = np.vstack([feature_matrix(articles) for articles, _, _ in runs])
+    y = np.concatenate([llm for _, llm, _ in runs])
+    X = np.hstack([X, np.ones((len(X), 1))])  # Intercept, dropped below
+    coef, *_ = np.linalg.lstsq(X, y, rcond=None)
+    weights = np.clip(coef[:-1], 0, None)
+    return weights if weights.sum() > 0 else WEIGHTS
+
+
+def correlation(runs, weights):
+    """Spearman rank correlation between local and LLM scores over all articles."""
+    local = np.concatenate([feature_matrix(articles) @ weights for articles, _, _ in runs])
+    llm = np.concatenate([scores for _, scores, _ in runs])
+    rank = lambda v: np.argsort(np.argsort(v, kind="stable"), kind="stable")
+    if local.std() == 0 or llm.std() == 0:
+        return 0.0
+    return float(np.corrcoef(rank(local), rank(llm))[0, 1])
+
+
+def print_report(label, runs, weights, ns, window, target):
+    print(f"\n{label}: weights " + ", ".join(f"{f}={w:.2f}" for f, w in zip(FEATURES, weights)))
+    print(f"Spearman(local, LLM) = {correlation(runs, weights):.3f}")
+    print(f"Best N of every {window} articles (reused scores take no slot)")
+    print(f"{'N':>4} {'best kept':>10} {'calls saved':>12}")
+    rows = evaluate(runs, weights, ns, window)
+    for n, recall, saved in rows:
+        print(f"{n:>4} {recall:>10.0%} {saved:>12.0%}")
+    good = [n for n, recall, _ in rows if recall >= target]
+    if good:
+        print(f"✅ Smallest N keeping the best article in {target:.0%} of runs: {good[0]}")
+    else:
+        print(f"⚠️ No N in {ns} keeps the best article in {target:.0%} of runs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the local viral pre-ranker against recorded LLM scores")
+    parser.add_argument("--scores", default=os.path.join(REPO_ROOT, "news_bot", "article_scores.json"))
+    parser.add_argument("--ns", default="1,2,3,4,5,7", help="Comma list of per-window N to evaluate")
+    parser.add_argument("--window", type=int, default=PRERANK_WINDOW, help="Pre-ranking window size")
+    parser.add_argument("--target", type=float, default=0.9, help="Required share of runs whose best article survives")
+    parser.add_argument("--min-run", type=int, default=5, help="Ignore runs with fewer scored articles")
+    parser.add_argument("--include-live", action="store_true", help="Also use the scored part of live (pre-ranked) runs")
+    parser.add_argument("--fit", action="store_true", help="Also report least-squares fitted weights")
+    args = parser.parse_args()
+
+    runs, complete_runs = load_runs(args.scores, args.min_run, args.include_live)
+    if not runs:
+        print(f"No fully scored runs with {args.min_run}+ articles in {args.scores}")
+        print("   Record some with: python -m news_bot.main --calibrate")
+        return 1
+    print(f"📊 {len(runs)} runs ({complete_runs} fully scored), {sum(len(a) for a, _, _ in runs)} scored articles")
+    if complete_runs < len(runs):
+        print("⚠️ Live runs only scored what the pre-ranker kept; results favour the current weights")
+
+    ns = [int(n) for n in args.ns.split(",") if n.strip()]
+    print_report("Current", runs, WEIGHTS, ns, args.window, args.target)
+    if args.fit:
+        print_report("Fitted", runs, fit_weights(runs), ns, args.window, args.target)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Test GitDeployer against a temporary bare repository (no network, no GitHub)"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from news_bot.deployer import GitDeployer, find_git
+
+GIT = find_git()
+
+
+def git(cwd, *args):
+    return subprocess.run([GIT, *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+class CountingDeployer(GitDeployer):
+    """GitDeployer that counts the pushes it runs."""
+
+    def __init__(self, *args, **kwargs):
+        self.pushes = 0
+        super().__init__(*args, **kwargs)
+
+    def _run(self, args, *rest, **kwargs):
+        if args[0] == "push":
+            self.pushes += 1
+        return super()._run(args, *rest, **kwargs)
+
+
+def test_single_push():
+    root = tempfile.mkdtemp(prefix="deployer_test_")
+    try:
+        remote = os.path.join(root, "remote.git")
+        work = os.path.join(root, "work")
+        git(root, "init", "-q", "--bare", remote)
+        git(root, "init", "-q", work)
+        git(work, "config", "user.email", "bot@example.com")
+        git(work, "config", "user.name", "Deployer Test")
+        git(work, "remote", "add", "origin", remote)
+
+        # Initial site: one post that the next publish deletes
+        os.makedirs(os.path.join(work, "blog", "posts"))
+        old_post = os.path.join(work, "blog", "posts", "old.html")
+        Path(old_post).write_text("<p>old</p>", encoding="utf-8")
+        git(work, "add", "-A")
+        git(work, "commit", "-q", "-m", "Initial site")
+        branch = git(work, "rev-parse", "--abbrev-ref", "HEAD")
+        git(work, "push", "-q", "origin", f"HEAD:{branch}")
+
+        # One publish: a new post plus the removed one; a stray file must stay out
+        new_post = os.path.join(work, "blog", "posts", "new.html")
+        Path(new_post).write_text("<p>new</p>", encoding="utf-8")
+        os.remove(old_post)
+        Path(work, "image_gen_errors.log").write_text("not for deploy", encoding="utf-8")
+
+        deployer = CountingDeployer(work)
+        deployer.queue([new_post])
+        deployer.queue([old_post])
+        assert deployer.publish(), "publish() failed"
+
+        assert deployer.pushes == 1, f"expected exactly one push, got {deployer.pushes}"
+        remote_files = git(remote, "ls-tree", "-r", "--name-only", branch).splitlines()
+        assert remote_files == ["blog/posts/new.html"], remote_files
+        assert git(remote, "rev-list", "--count", branch) == "2", "expected one new commit"
+        assert "image_gen_errors.log" in git(work, "status", "--porcelain"), "untracked file was committed"
+
+        # Nothing queued and nothing unpushed: no second push
+        assert deployer.publish()
+        assert deployer.pushes == 1, f"expected no extra push, got {deployer.pushes}"
+        print("✅ GitDeployer: added + deleted file in one commit, exactly one push")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_single_push()
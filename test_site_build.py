@@ -0,0 +1,77 @@
+"""Test the site rebuild (generate_categories) in a temporary blog directory"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from news_bot import generate_categories, search_index
+
+
+def use_blog_dir(blog_dir):
+    """Point the build (normally the live blog/ directory) at blog_dir."""
+    generate_categories.BLOG_DIR = blog_dir
+    generate_categories.POSTS_DIR = os.path.join(blog_dir, "posts")
+    generate_categories.ASSETS_DIR = os.path.join(blog_dir, "assets")
+    generate_categories.FEED_DIR = os.path.join(blog_dir, "feed")
+    search_index.SEARCH_CACHE_PATH = Path(blog_dir).parent / "search_cache.json"
+
+
+def write_post(posts_dir, filename, title, hero_image, og_image):
+    """A post in the inline-hero layout that sync_post_images keeps in line with og:image."""
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <title>{title} | AI Core Logic</title>
+    <meta property="og:image" content="{og_image}" />
+    <link rel="stylesheet" href="../css/style.css">
+</head>
+<body>
+    <header class="article-hero" style="background-image: url('{hero_image}');"></header>
+    <span class="date">2026-01-01</span>
+    <p class="article-snippet">Warehouse automation with AI agents.</p>
+</body>
+</html>"""
+    Path(posts_dir, filename).write_text(html, encoding="utf-8")
+
+
+def test_synced_posts_are_written():
+    root = tempfile.mkdtemp(prefix="site_build_test_")
+    try:
+        blog_dir = os.path.join(root, "blog")
+        for folder in ("posts", "assets", "css", "js"):
+            os.makedirs(os.path.join(blog_dir, folder))
+        use_blog_dir(blog_dir)
+        Path(blog_dir, "css", "style.css").write_text("body { color: black; }", encoding="utf-8")
+
+        # og:image decides the card image; the hero disagrees, so sync rewrites the post
+        write_post(os.path.join(blog_dir, "posts"), "2026-01-01-stale.html", "Stale Hero Post",
+                   "../assets/old-hero.jpg", "../assets/new-hero.jpg")
+        write_post(os.path.join(blog_dir, "posts"), "2026-01-01-clean.html", "Clean Post",
+                   "../assets/clean.jpg", "../assets/clean.jpg")
+
+        written = [os.path.abspath(p) for p in generate_categories.main()]
+        stale = os.path.abspath(os.path.join(blog_dir, "posts", "2026-01-01-stale.html"))
+        assert stale in written, "synced post missing from the written list (it would not be deployed)"
+        assert "url('../assets/new-hero.jpg" in Path(stale).read_text(encoding="utf-8"), "hero not synced to og:image"
+
+        # Second build: nothing changes, nothing to deploy
+        assert generate_categories.main() == [], "rebuild without changes wrote files"
+
+        # A stylesheet change re-versions every post; the search index must
+        # cache the rewritten mtimes, or the next build re-reads every post
+        Path(blog_dir, "css", "style.css").write_text("body { color: red; }", encoding="utf-8")
+        generate_categories.main()
+        cache = search_index._load_cache()
+        for filename, entry in cache.items():
+            assert entry["mtime"] == os.path.getmtime(os.path.join(blog_dir, "posts", filename)), f"stale search cache: {filename}"
+        print("✅ Site build: synced post is deployed, rebuild is a no-op, search cache stays current")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_synced_posts_are_written()